@@ -0,0 +1,27 @@
+"""
+API 공용 의존성
+
+여러 라우트가 같은 폼 필드를 같은 방식으로 해석하도록 한 곳에서 정의.
+"""
+from typing import Any, Dict, Optional
+
+from fastapi import Form
+from pydantic import TypeAdapter, ValidationError
+
+# 진단 답변: {"q1": "예", "q19": 120, ...} 형태의 JSON 객체
+_ANSWERS_ADAPTER = TypeAdapter(Dict[str, Any])
+
+
+async def chatbot_answers_form(chatbot_answers: Optional[str] = Form(None)) -> Dict[str, Any]:
+    """
+    진단 답변 폼 필드(JSON 문자열) → dict.
+
+    답변 수와 상관없이 폼 필드 하나를 pydantic-core JSON 파서로 한 번에 검증.
+    JSON 객체가 아니거나 형식이 잘못되면 빈 dict (답변 없이 검증 진행).
+    """
+    if not chatbot_answers:
+        return {}
+    try:
+        return _ANSWERS_ADAPTER.validate_json(chatbot_answers)
+    except ValidationError:
+        return {}
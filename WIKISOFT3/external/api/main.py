@@ -1,9 +1,13 @@
+import asyncio
+import contextlib
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
+from collections import OrderedDict, deque
+from typing import Deque, Tuple
 
 # .env 파일 로드
 env_path = Path(__file__).parent.parent.parent / ".env"
@@ -11,22 +15,80 @@ load_dotenv(env_path)
 
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
+from internal.queue.jobs import cleanup_expired_jobs
+
+from .responses import FastJSONResponse
 from .routes import agent, batch, diagnostic_questions, health, validate, react_agent
 
-app = FastAPI(title="WIKISOFT3 API", version="0.0.1")
+# 동기 블로킹 작업(파싱/엑셀 생성/파일 I/O) 스레드 수 상한.
+# asyncio 기본 executor(min(32, CPU+4))는 배치 요청이 몰리면 스레드가 과도하게 늘어남.
+IO_POOL_WORKERS = int(os.getenv("IO_POOL_WORKERS", str(min(8, (os.cpu_count() or 1) * 2))))
+
+# 만료된 인메모리 배치 작업 전체 정리 주기 (초). 요청 경로에서는 호출당 일부만 정리하므로
+# 요청이 뜸해도 만료 작업이 메모리에 남지 않도록 주기적으로 전부 정리
+JOB_CLEANUP_INTERVAL = float(os.getenv("JOB_CLEANUP_INTERVAL", "300"))
+
+
+async def _cleanup_jobs_periodically(interval: float) -> None:
+    """만료된 인메모리 작업 주기 정리 (작업 스토어를 쓰는 배치 라우트와 같은 이벤트 루프에서 실행)."""
+    while True:
+        await asyncio.sleep(interval)
+        cleanup_expired_jobs()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 전역 I/O 스레드 풀 생성/종료 + 만료 작업 정리 태스크 실행.
+
+    이벤트 루프 기본 executor로 등록하므로 라우트의 asyncio.to_thread 호출이
+    모두 이 풀(최대 IO_POOL_WORKERS개 스레드)에서 실행됨.
+    """
+    io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="io")
+    app.state.io_pool = io_pool
+    asyncio.get_running_loop().set_default_executor(io_pool)
+    cleanup_task = asyncio.create_task(_cleanup_jobs_periodically(JOB_CLEANUP_INTERVAL))
+    try:
+        yield
+    finally:
+        cleanup_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await cleanup_task
+        io_pool.shutdown(wait=True)
+
+
+# 모든 엔드포인트 응답을 orjson으로 직렬화
+app = FastAPI(
+    title="WIKISOFT3 API",
+    version="0.0.1",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
+)
 
 
 # ============================================================
 # Rate Limiting (간단한 인메모리 방식)
 # ============================================================
 class RateLimiter:
-    """IP 기반 Rate Limiting."""
+    """IP 기반 Rate Limiting (슬라이딩 윈도우)."""
     
-    def __init__(self, requests_per_minute: int = 30):
+    def __init__(self, requests_per_minute: int = 30, max_clients: int = 10_000):
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, list] = defaultdict(list)
+        self.max_clients = max_clients
+        self.window_seconds = 60.0
+        # IP → 요청별 만료 시각(요청 시각 + 윈도우, time.monotonic 초) 큐.
+        # 만료 시각을 저장 시 한 번만 계산해 두고 조회 시에는 now와 비교만 함.
+        # 최근 접근 순서 유지 (앞쪽이 가장 오래된 IP)
+        self.requests: "OrderedDict[str, Deque[float]]" = OrderedDict()
+    
+    def _evict_idle(self, now: float):
+        """1분 넘게 요청이 없는 IP 정리 (접근 순서상 앞쪽부터만 확인)."""
+        while self.requests:
+            expiries = next(iter(self.requests.values()))
+            if expiries and expiries[-1] > now:
+                break
+            self.requests.popitem(last=False)
     
     def is_allowed(self, client_ip: str) -> Tuple[bool, int]:
         """
@@ -35,21 +97,29 @@ class RateLimiter:
         Returns:
             (허용 여부, 남은 요청 수)
         """
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
+        # 단조 시계 float 비교 (datetime/timedelta 객체 생성 없음, 시스템 시각 변경에도 안전)
+        now = time.monotonic()
+        
+        self._evict_idle(now)
         
-        # 1분 이내 요청만 유지
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if req_time > minute_ago
-        ]
+        expiries = self.requests.get(client_ip)
+        if expiries is None:
+            expiries = self.requests[client_ip] = deque()
+            if len(self.requests) > self.max_clients:
+                self.requests.popitem(last=False)
+        else:
+            self.requests.move_to_end(client_ip)
         
-        remaining = self.requests_per_minute - len(self.requests[client_ip])
+        # 만료된 요청 제거 (오래된 것부터 앞에서 제거)
+        while expiries and expiries[0] <= now:
+            expiries.popleft()
+        
+        remaining = self.requests_per_minute - len(expiries)
         
         if remaining <= 0:
             return False, 0
         
-        self.requests[client_ip].append(now)
+        expiries.append(now + self.window_seconds)
         return True, remaining - 1
 
 
@@ -67,7 +137,7 @@ async def rate_limit_middleware(request: Request, call_next):
     is_allowed, remaining = rate_limiter.is_allowed(client_ip)
     
     if not is_allowed:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             content={"detail": "요청이 너무 많습니다. 잠시 후 다시 시도해주세요."}
         )
@@ -93,7 +163,8 @@ app.add_middleware(
     allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST"],  # 필요한 메서드만 허용
-    allow_headers=["Content-Type", "Authorization"],  # 필요한 헤더만 허용
+    allow_headers=["Content-Type", "Authorization", "If-None-Match"],  # 필요한 헤더만 허용
+    expose_headers=["ETag"],  # 검증 결과 ETag를 프론트엔드에서 읽을 수 있도록
     max_age=3600,  # preflight 캐시 1시간
 )
 
@@ -112,3 +183,18 @@ app.include_router(validate.router)
 app.include_router(batch.router)
 app.include_router(agent.router)
 app.include_router(react_agent.router)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    # uvloop(libuv 이벤트 루프) + httptools(C HTTP 파서)는 uvicorn[standard]에 포함
+    # 검증 결과/Rate Limit 상태가 프로세스 메모리에 있으므로 워커 수 기본값은 1
+    uvicorn.run(
+        "external.api.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8003")),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("UVICORN_WORKERS", "1")),
+    )
@@ -0,0 +1,18 @@
+"""
+API 응답 클래스
+
+FastAPI 기본 JSONResponse(표준 json) 대신 orjson으로 직렬화.
+orjson 미설치 시 json_utils가 표준 json으로 폴백.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from internal.utils.json_utils import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 기반 JSON 응답."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -100,7 +100,7 @@ async def ask_agent(req: AgentAskRequest) -> Dict[str, Any]:
         messages = _build_messages(req)
 
         # 1차 LLM 호출 (툴 사용 가능)
-        response = client.chat_with_tools(messages, AGENT_TOOLS)
+        response = await client.achat_with_tools(messages, AGENT_TOOLS)
 
         # 툴 호출이 있으면 실행 후 2차 호출
         tool_calls = response.get("tool_calls", [])
@@ -123,7 +123,7 @@ async def ask_agent(req: AgentAskRequest) -> Dict[str, Any]:
                 )
 
             # 2차 LLM 호출 (툴 결과 포함)
-            final_response = client.chat_with_tools(messages, AGENT_TOOLS)
+            final_response = await client.achat_with_tools(messages, AGENT_TOOLS)
             answer = final_response.get("content", "")
         else:
             answer = response.get("content", "")
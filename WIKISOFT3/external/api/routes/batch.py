@@ -1,43 +1,93 @@
-from typing import List
+import asyncio
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from pydantic import BaseModel
 
-from internal.queue.jobs import enqueue_jobs, get_job, update_job
+from internal.parsers.parser import parse_roster
+from internal.queue.jobs import JobStatus, enqueue_jobs, get_job, update_job
+from internal.utils.security import validate_upload_stream, verify_webhook_token
+
+from ..responses import FastJSONResponse
 
 router = APIRouter(prefix="/batch-validate", tags=["batch-validate"])
 
 
+class BatchWebhookPayload(BaseModel):
+    status: JobStatus = "running"
+    progress: int = 0
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+
+# 배치 업로드 동시 파싱 한도 (스레드 풀을 한 요청이 독점하지 않도록 제한)
+_BATCH_PARSE_CONCURRENCY = 4
+
+
+async def _parse_upload(file: UploadFile, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """업로드 파일 하나 검증 + 파싱 (파싱은 스레드에서 실행, 결과는 배치 작업에 그대로 전달)."""
+    async with semaphore:
+        source, filename, size = await validate_upload_stream(file)
+        try:
+            parsed = await asyncio.to_thread(parse_roster, source)
+        except Exception as e:  # noqa: BLE001
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"failed to parse {filename}: {e}")
+    return {"file": filename, "size": size, "row_count": len(parsed.get("rows", [])), "parsed": parsed}
+
+
 @router.post("")
-async def batch_validate(files: List[UploadFile] = File(...)) -> dict:
+async def batch_validate(files: List[UploadFile] = File(...)) -> FastJSONResponse:
     if not files:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="at least one file is required")
 
-    file_names = [f.filename or "unknown" for f in files]
-    job_id = enqueue_jobs(file_names)
+    # 파일별 검증/파싱을 동시에 실행 (순차 처리 시 파일 수만큼 대기 시간이 누적됨)
+    # 실패한 파일은 배치 전체를 거부하지 않고 파일별 오류로 기록, 성공한 파일의 파싱 결과만 작업에 전달
+    # (gather는 입력 순서대로 결과를 돌려주므로 파일명과 파싱 결과 순서가 어긋나지 않음)
+    semaphore = asyncio.Semaphore(_BATCH_PARSE_CONCURRENCY)
+    outcomes = await asyncio.gather(*(_parse_upload(f, semaphore) for f in files), return_exceptions=True)
+
+    parsed_files: List[Dict[str, Any]] = []
+    accepted: List[str] = []
+    accepted_parsed: List[Dict[str, Any]] = []
+    for file, outcome in zip(files, outcomes):
+        if isinstance(outcome, BaseException):
+            detail = outcome.detail if isinstance(outcome, HTTPException) else str(outcome)
+            parsed_files.append({"file": file.filename or "unknown", "status": "error", "error": detail})
+        else:
+            parsed = outcome.pop("parsed")
+            parsed_files.append({**outcome, "status": "ok"})
+            accepted.append(outcome["file"])
+            accepted_parsed.append(parsed)
+
+    if not accepted:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="no valid files in batch")
+
+    # 워커는 별도 프로세스라 여기서 파싱한 결과를 작업 인자로 넘겨서 다시 파싱하지 않음
+    job_id = enqueue_jobs(accepted, accepted_parsed)
 
     # TODO: 실제 큐(RQ/Celery 등)에 enqueue, 워커가 처리 후 webhook/status 업데이트
-    return {
+    # 응답 dict를 orjson으로 바로 직렬화 (jsonable_encoder의 필드별 순회 생략)
+    return FastJSONResponse(content={
         "status": "queued",
         "job_id": job_id,
         "files_received": len(files),
+        "files_accepted": len(accepted),
+        "files": parsed_files,
         "note": "stub: replace with real queue + worker",
-    }
+    })
 
 
 @router.get("/{job_id}")
-async def batch_status(job_id: str) -> dict:
+async def batch_status(job_id: str) -> FastJSONResponse:
     job = get_job(job_id)
     if not job:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="job not found")
-    return {"job_id": job_id, **job}
+    # 작업 결과(파일별 결과 목록)가 클 수 있으므로 jsonable_encoder 없이 바로 직렬화
+    return FastJSONResponse(content={"job_id": job_id, **job})
 
 
-@router.post("/{job_id}/webhook")
-async def batch_webhook(job_id: str, payload: dict) -> dict:
+@router.post("/{job_id}/webhook", dependencies=[Depends(verify_webhook_token)])
+async def batch_webhook(job_id: str, payload: BatchWebhookPayload) -> dict:
     """워커가 상태/진행률을 푸시하는 웹훅 스텁."""
-    status_val = payload.get("status", "running")
-    progress = payload.get("progress", 0)
-    result = payload.get("result")
-    error = payload.get("error")
-    update_job(job_id, status=status_val, progress=progress, result=result, error=error)
-    return {"job_id": job_id, "status": status_val, "progress": progress}
+    update_job(job_id, status=payload.status, progress=payload.progress, result=payload.result, error=payload.error)
+    return {"job_id": job_id, "status": payload.status, "progress": payload.progress}
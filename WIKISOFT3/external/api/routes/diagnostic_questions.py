@@ -1,6 +1,10 @@
+import asyncio
+
 from fastapi import APIRouter
 from typing import Optional
 
+from internal.ai import dynamic_questions
+
 router = APIRouter(prefix="/diagnostic-questions", tags=["diagnostic-questions"])
 
 
@@ -55,9 +59,9 @@ async def generate_dynamic_questions(
     
     이상치 감지 결과에 따라 추가 확인이 필요한 질문을 자동 생성합니다.
     """
-    from internal.ai.dynamic_questions import generate_dynamic_questions, format_questions_for_ui
-    
-    questions = generate_dynamic_questions(
+    # AI 질문 생성은 동기 LLM 호출이므로 스레드에서 실행 (이벤트 루프 블로킹 방지)
+    questions = await asyncio.to_thread(
+        dynamic_questions.generate_dynamic_questions,
         anomalies=anomalies or {},
         matches=matches or {},
         validation=validation or {},
@@ -66,6 +70,6 @@ async def generate_dynamic_questions(
     
     return {
         "total": len(questions),
-        "questions": format_questions_for_ui(questions),
+        "questions": dynamic_questions.format_questions_for_ui(questions),
         "note": "검증 결과 기반 동적 생성 질문"
     }
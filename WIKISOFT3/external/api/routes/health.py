@@ -1,8 +1,14 @@
 from fastapi import APIRouter
+from fastapi.responses import Response
+
+from internal.utils.json_utils import dumps
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# 헬스체크 응답은 고정값이므로 모듈 로드 시 한 번만 직렬화 (프로브 요청마다 직렬화 생략)
+_HEALTH_BODY = dumps({"status": "ok", "version": "v3-draft"})
+
 
 @router.get("")
-async def health() -> dict:
-    return {"status": "ok", "version": "v3-draft"}
+async def health() -> Response:
+    return Response(content=_HEALTH_BODY, media_type="application/json")
@@ -7,23 +7,35 @@ ReACT 에이전트 기반 검증 API.
 - 추론 과정 투명화
 """
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
-from typing import Optional
-import json
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+import asyncio
 
 from internal.agent.tool_registry import get_registry
 from internal.agent.react_agent import create_react_agent
 from internal.memory.case_store import get_case_store, save_successful_case
+from internal.utils.security import validate_upload_stream
+
+from ..dependencies import chatbot_answers_form
+from ..responses import FastJSONResponse
 
 router = APIRouter(prefix="/react-agent", tags=["react-agent"])
 
 
+class SaveCorrectionRequest(BaseModel):
+    headers: List[str]
+    original_matches: List[Dict[str, Any]]
+    human_corrections: Dict[str, Optional[str]]
+    metadata: Optional[Dict[str, Any]] = None
+
+
 @router.post("/validate")
 async def react_validate(
     file: UploadFile = File(...),
-    chatbot_answers: Optional[str] = Form(None),
+    diagnostic_answers: Dict[str, Any] = Depends(chatbot_answers_form),
     verbose: Optional[bool] = Form(False)
-) -> dict:
+) -> FastJSONResponse:
     """
     ReACT 에이전트 기반 파일 검증.
     
@@ -40,18 +52,9 @@ async def react_validate(
     Returns:
         검증 결과 + 에이전트 추론 히스토리
     """
-    if not file:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="file is required")
+    # 파일 검증 (한 번만 스트리밍으로 읽고 되감은 업로드 임시 파일을 그대로 파서에 전달)
+    file_bytes, _, _ = await validate_upload_stream(file)
     
-    # 진단 답변 파싱
-    diagnostic_answers = {}
-    if chatbot_answers:
-        try:
-            diagnostic_answers = json.loads(chatbot_answers)
-        except json.JSONDecodeError:
-            pass
-    
-    file_bytes = await file.read()
     registry = get_registry()
     
     # ReACT 에이전트 생성 및 실행
@@ -60,7 +63,9 @@ async def react_validate(
         verbose=verbose
     )
     
-    result = agent.run(
+    # 에이전트 루프(파싱/매칭/검증 + LLM 추론)는 동기 작업이므로 스레드에서 실행
+    result = await asyncio.to_thread(
+        agent.run,
         file_bytes=file_bytes,
         diagnostic_answers=diagnostic_answers,
         sheet_type="재직자"
@@ -84,7 +89,8 @@ async def react_validate(
         except Exception as e:
             print(f"케이스 저장 실패: {e}")
     
-    return result
+    # 응답 클래스로 바로 반환 (response_model 검증/jsonable_encoder 변환 생략, orjson 직렬화 한 번만)
+    return FastJSONResponse(content=result)
 
 
 @router.get("/stats")
@@ -111,45 +117,31 @@ async def get_agent_stats() -> dict:
 
 
 @router.post("/save-correction")
-async def save_manual_correction(
-    headers: str = Form(...),
-    original_matches: str = Form(...),
-    human_corrections: str = Form(...),
-    metadata: Optional[str] = Form(None)
-) -> dict:
+async def save_manual_correction(req: SaveCorrectionRequest) -> dict:
     """
     수동 수정 케이스 저장.
     
     사용자가 매칭을 수정한 경우, 그 수정 내역을 저장하여
     향후 Few-shot Learning에 활용.
     
+    JSON 본문 하나로 받아서 한 번에 파싱/검증 (폼 필드별 json.loads 불필요).
+    
     Args:
-        headers: 원본 헤더 (JSON 배열)
-        original_matches: 원래 AI 매칭 결과 (JSON 배열)
-        human_corrections: 사람이 수정한 매핑 (JSON 객체 {"원본헤더": "수정된_필드"})
-        metadata: 추가 메타데이터 (JSON 객체)
+        req.headers: 원본 헤더
+        req.original_matches: 원래 AI 매칭 결과
+        req.human_corrections: 사람이 수정한 매핑 {"원본헤더": "수정된_필드"}
+        req.metadata: 추가 메타데이터
     
     Returns:
         저장된 케이스 ID
     """
-    try:
-        headers_list = json.loads(headers)
-        matches_list = json.loads(original_matches)
-        corrections_dict = json.loads(human_corrections)
-        meta = json.loads(metadata) if metadata else {}
-    except json.JSONDecodeError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"JSON 파싱 오류: {e}"
-        )
-    
     case_id = save_successful_case(
-        headers=headers_list,
-        matches=matches_list,
+        headers=req.headers,
+        matches=req.original_matches,
         confidence=0.0,  # 사람이 수정했으므로 원래 신뢰도는 0
         was_auto_approved=False,
-        human_corrections=corrections_dict,
-        metadata={**meta, "correction_type": "manual"}
+        human_corrections=req.human_corrections,
+        metadata={**(req.metadata or {}), "correction_type": "manual"}
     )
     
     return {
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import StreamingResponse
-from io import BytesIO
-from typing import Optional
+from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile, status
+from fastapi.responses import Response
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import copy
+import hashlib
 import json
+import os
+import threading
+
+import pandas as pd
 
 from internal.agent.confidence import detect_anomalies, estimate_confidence
 from internal.agent.tool_registry import get_registry
@@ -10,47 +18,217 @@ from internal.agent.react_agent import create_react_agent
 from internal.agent.retry_strategies import (
     get_async_retry_strategy, RetryReason, StrategyType
 )
+from internal.ai.knowledge_base import get_error_check_rules
+from internal.ai import llm_client
 from internal.generators.report import generate_excel_report, generate_final_data_excel
 from internal.memory.case_store import save_successful_case
-from internal.utils.security import validate_upload_file, secure_logger
+from internal.memory.persistence import SessionMemory
+from internal.parsers.parser import FileSource
+from internal.utils.json_utils import parse_llm_json
+from internal.utils.logging import get_logger
+from internal.utils.security import validate_upload_stream_with_digest, secure_logger
+
+from ..dependencies import chatbot_answers_form
+from ..responses import FastJSONResponse
 
 router = APIRouter(prefix="/auto-validate", tags=["auto-validate"])
 
-# 임시 저장소 (실제 서비스에서는 Redis/DB 사용)
+logger = get_logger("validate")
+
+# 마지막 검증 결과 (Excel 다운로드용)
+# Redis(SessionMemory)가 있으면 워커 간 공유, 없으면 프로세스 메모리 폴백
+_LAST_RESULT_SESSION_ID = "last_validation"
+_LAST_RESULT_TTL = 3600  # 1시간
+
 _last_validation_result = {}
 _last_parsed_data = {}
 _last_diagnostic_answers = {}
+_last_etag: Optional[str] = None
+
+_session_memory: Optional[SessionMemory] = None
+
+# 파이프라인이 워커 스레드(asyncio.to_thread)에서 실행되므로 공유 상태 변경은 락으로 보호
+# (락 안에서는 참조 교체/dict 조작만 하고, Redis I/O와 LLM 호출은 락 밖에서 수행)
+# 성공 케이스 저장소(get_case_store)는 CaseStore 자체 락으로 보호
+_state_lock = threading.Lock()
+
+_pipeline_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_session_memory() -> SessionMemory:
+    """
+    Redis 세션 메모리 (첫 사용 시 연결).
+
+    생성자가 Redis 연결/ping을 하므로 락 밖에서 만들고, 락 안에서는 다시 확인 후 대입만 함
+    (Redis가 응답하지 않아도 연결 대기 동안 다른 공유 상태 접근이 막히지 않음).
+    동시에 처음 호출되면 여러 개가 만들어질 수 있지만 먼저 대입된 하나만 사용.
+    """
+    global _session_memory
+    memory = _session_memory
+    if memory is not None:
+        return memory
+    memory = SessionMemory(os.getenv("REDIS_URL") or "redis://localhost:6379/0")
+    with _state_lock:
+        if _session_memory is None:
+            _session_memory = memory
+        return _session_memory
+
+
+def _store_last_result(
+    result: Dict[str, Any],
+    parsed: Dict[str, Any],
+    answers: Dict[str, Any],
+    etag: Optional[str] = None,
+) -> None:
+    """마지막 검증 결과 저장 (Redis TTL 만료로 자동 정리)."""
+    global _last_validation_result, _last_parsed_data, _last_diagnostic_answers, _last_etag
+    with _state_lock:
+        _last_validation_result = result
+        _last_parsed_data = parsed
+        _last_diagnostic_answers = answers
+        _last_etag = etag
+
+    memory = _get_session_memory()
+    data = {"validation_result": result, "parsed_data": parsed, "diagnostic_answers": answers, "etag": etag}
+    if not memory.save_session(_LAST_RESULT_SESSION_ID, data, ttl=_LAST_RESULT_TTL):
+        # 저장 실패 시 이전 결과가 남지 않도록 제거 (Redis 없으면 no-op)
+        memory.delete_session(_LAST_RESULT_SESSION_ID)
+
+
+def _load_last_result() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """마지막 검증 결과 조회 → (검증 결과, 파싱 데이터)."""
+    data = _get_session_memory().get_session(_LAST_RESULT_SESSION_ID)
+    if data:
+        return data.get("validation_result") or {}, data.get("parsed_data") or {}
+    with _state_lock:
+        return _last_validation_result, _last_parsed_data
+
+
+def _load_last_etag() -> Optional[str]:
+    """마지막 검증 결과의 ETag 조회."""
+    data = _get_session_memory().get_session(_LAST_RESULT_SESSION_ID)
+    if data:
+        return data.get("etag")
+    with _state_lock:
+        return _last_etag
+
+
+# 파이프라인 결과 형식/규칙이 바뀌면 올려서 이전 ETag와 결과 캐시를 무효화
+_PIPELINE_VERSION = "1"
+
+
+def _result_etag(digest: str, answers: Dict[str, Any]) -> str:
+    """업로드 내용 해시 + 진단 답변 (+ 파이프라인 버전)으로 검증 결과 ETag 생성."""
+    key = _PIPELINE_VERSION + digest + json.dumps(answers, sort_keys=True, ensure_ascii=False, default=str)
+    return '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
+
+
+def _if_none_match_matches(header: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 헤더가 ETag와 일치하는지 (RFC 9110 약한 비교).
+
+    쉼표로 구분된 여러 태그, 약한 검증자(W/"..."), "*"를 모두 지원.
+    """
+    if not header:
+        return False
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+# 검증 결과 캐시 (ETag → 결과). 같은 파일/답변 재검증 시 매칭/검증/LLM 분석을 다시 하지 않음
+_RESULT_CACHE_SIZE = 16
+_result_cache: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def _get_cached_result(etag: str) -> Optional[dict]:
+    with _state_lock:
+        cached = _result_cache.get(etag)
+        if cached is not None:
+            _result_cache.move_to_end(etag)
+    return copy.deepcopy(cached) if cached is not None else None
+
+
+def _cache_result(etag: str, result: dict) -> None:
+    cached = copy.deepcopy(result)
+    with _state_lock:
+        _result_cache[etag] = cached
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
 
 
 @router.post("")
 async def auto_validate(
     file: UploadFile = File(...),
-    chatbot_answers: Optional[str] = Form(None)
-) -> dict:
+    diagnostic_answers: Dict[str, Any] = Depends(chatbot_answers_form),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """파일 업로드 → 파싱 → 매칭 → 검증 → 리포트 파이프라인.
     
     chatbot_answers: 진단 질문 답변 (JSON 문자열)
     - 예/아니오 답변을 기반으로 검증 규칙 조정
-    """
-    global _last_validation_result, _last_parsed_data, _last_diagnostic_answers
     
-    # 파일 검증 (타입, 크기, 매직바이트)
-    file_bytes, filename = await validate_upload_file(file)
-    secure_logger.info(f"파일 업로드: {filename}, 크기: {len(file_bytes)} bytes")
+    응답에 ETag(파일 내용 해시 + 답변)를 붙이고, 같은 파일/답변을 If-None-Match로 다시 보내면
+    마지막 검증 결과와 같을 때 파이프라인 없이 304 반환.
+    """
+    # 파일 검증 (타입, 크기, 매직바이트) - 업로드를 bytes로 복사하지 않고 파일 객체로 파싱
+    # 업로드 내용 해시도 검증과 같은 읽기에서 한 번만 계산해서 ETag와 파서 캐시 키에 같이 사용
+    source, filename, size, digest = await validate_upload_stream_with_digest(file)
+    secure_logger.info("파일 업로드: %s, 크기: %d bytes", filename, size)
 
-    # 진단 답변 파싱
-    diagnostic_answers = {}
-    if chatbot_answers:
-        try:
-            diagnostic_answers = json.loads(chatbot_answers)
-            _last_diagnostic_answers = diagnostic_answers
-        except json.JSONDecodeError:
-            pass
+    etag = _result_etag(digest, diagnostic_answers)
+    if _if_none_match_matches(if_none_match, etag) and await asyncio.to_thread(_load_last_etag) == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
+    # 파싱~리포트는 CPU 작업 + 동기 LLM 호출이므로 스레드에서 실행 (이벤트 루프 블로킹 방지)
+    result = await asyncio.to_thread(_run_pipeline, source, diagnostic_answers, file.filename, digest, etag)
+    # 큰 결과 dict는 응답 클래스로 바로 반환 (response_model 검증/jsonable_encoder 변환 없이 orjson 한 번만)
+    return FastJSONResponse(content=result, headers={"ETag": etag})
+
+
+def _get_pipeline_executor() -> ThreadPoolExecutor:
+    """
+    파이프라인 보조 작업용 스레드 풀 (첫 사용 시 생성).
+
+    파이프라인 자체가 앱 I/O 풀 스레드에서 실행되며 보조 작업 완료를 기다리므로,
+    같은 풀에 제출하면 풀이 가득 찼을 때 교착될 수 있어 별도 풀로 분리.
+    """
+    global _pipeline_executor
+    if _pipeline_executor is None:
+        with _state_lock:
+            if _pipeline_executor is None:
+                _pipeline_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="validate-aux")
+    return _pipeline_executor
+
+
+def _run_pipeline(
+    source: FileSource,
+    diagnostic_answers: Dict[str, Any],
+    filename: Optional[str],
+    digest: Optional[str] = None,
+    etag: Optional[str] = None,
+) -> dict:
+    """파싱 → 매칭 → 검증 → 리포트 파이프라인 (동기 실행)."""
     registry = get_registry()
 
     # 1. 파싱
-    parsed = registry.call_tool("parse_roster", file_bytes=file_bytes)
+    parsed = registry.call_tool("parse_roster", file_bytes=source, digest=digest)
+
+    # 같은 파일/답변의 이전 결과가 있으면 재사용 (다운로드용 마지막 결과만 갱신, 케이스는 이미 저장됨)
+    cached = _get_cached_result(etag) if etag else None
+    if cached is not None:
+        _store_last_result(cached, parsed, diagnostic_answers, etag)
+        return cached
+
+    # 진단 답변 일관성 검사(LLM 호출 포함)는 파싱 결과만 필요하므로
+    # 매칭/검증/중복 탐지와 동시에 실행해서 네트워크 대기 시간을 겹침
+    diagnostic_future = _get_pipeline_executor().submit(check_diagnostic_consistency, parsed, diagnostic_answers)
 
     # 2. 헤더 매칭
     matches = registry.call_tool("match_headers", parsed=parsed, sheet_type="재직자")
@@ -63,7 +241,6 @@ async def auto_validate(
     anomalies = detect_anomalies(parsed, matches, validation)
     
     # 5. 중복 탐지
-    import pandas as pd
     df = pd.DataFrame(parsed.get("rows", []), columns=parsed.get("headers", []))
     duplicates = registry.call_tool(
         "detect_duplicates",
@@ -88,8 +265,8 @@ async def auto_validate(
             })
         anomalies["detected"] = True
     
-    # 6. 진단 답변 기반 추가 검증/경고
-    diagnostic_warnings = check_diagnostic_consistency(parsed, diagnostic_answers)
+    # 6. 진단 답변 기반 추가 검증/경고 (위에서 병렬로 시작한 작업 결과)
+    diagnostic_warnings = diagnostic_future.result()
     if diagnostic_warnings:
         anomalies["anomalies"].extend(diagnostic_warnings)
 
@@ -114,8 +291,9 @@ async def auto_validate(
     }
     
     # 결과 저장 (Excel 다운로드용)
-    _last_validation_result = result
-    _last_parsed_data = parsed
+    _store_last_result(result, parsed, diagnostic_answers, etag)
+    if etag:
+        _cache_result(etag, result)
     
     # 성공 케이스 자동 저장 (Memory 시스템)
     if confidence.get("score", 0) >= 0.8:
@@ -125,19 +303,54 @@ async def auto_validate(
                 matches=matches.get("matches", []),
                 confidence=confidence.get("score", 0),
                 was_auto_approved=True,
-                metadata={"filename": file.filename}
+                metadata={"filename": filename}
             )
-        except Exception as e:
-            print(f"케이스 저장 실패: {e}")
+        except Exception as e:  # noqa: BLE001
+            # 검증 결과 응답은 계속 반환하되, 케이스 유실은 스택트레이스와 함께 기록
+            logger.exception("case_save_failed", filename=filename, error=str(e))
     
     return result
 
 
+def _persist_react_result(
+    result: Dict[str, Any],
+    diagnostic_answers: Dict[str, Any],
+    filename: Optional[str],
+    save_case: bool = True,
+) -> None:
+    """ReACT 결과 저장 + 신뢰도 높은 결과는 성공 케이스로 저장 (동기 I/O, 스레드에서 호출)"""
+    # 이전 결과 조회는 파싱 요약이 없을 때만 → 매번 Redis에서 이전 rows 전체를 읽지 않음
+    parsed_summary = result.get("steps", {}).get("parsed_summary")
+    if parsed_summary:
+        parsed_data = {
+            "headers": parsed_summary.get("headers", []),
+            "rows": []  # 원본 rows는 별도 저장 필요
+        }
+    else:
+        _, parsed_data = _load_last_result()
+    _store_last_result(result, parsed_data, diagnostic_answers)
+    
+    # 성공 케이스 자동 저장
+    confidence_score = result.get("confidence", {}).get("score", 0)
+    if save_case and confidence_score >= 0.8:
+        try:
+            save_successful_case(
+                headers=result.get("steps", {}).get("parsed_summary", {}).get("headers", []),
+                matches=result.get("steps", {}).get("matches", {}).get("matches", []),
+                confidence=confidence_score,
+                was_auto_approved=result.get("status") == "completed",
+                metadata={"filename": filename, "mode": "react"}
+            )
+        except Exception as e:  # noqa: BLE001
+            # 저장소 락은 CaseStore가 공유 (파이프라인 저장과 동시에 실행돼도 안전), 실패는 기록
+            logger.exception("case_save_failed", filename=filename, mode="react", error=str(e))
+
+
 @router.post("/react")
 async def auto_validate_with_react(
     file: UploadFile = File(...),
-    chatbot_answers: Optional[str] = Form(None)
-) -> dict:
+    diagnostic_answers: Dict[str, Any] = Depends(chatbot_answers_form)
+) -> FastJSONResponse:
     """
     ReACT Agent를 사용한 자율적 파일 검증
     
@@ -152,59 +365,41 @@ async def auto_validate_with_react(
     - 의사결정 투명성 (추론 과정 기록)
     - 사람 개입 에스컬레이션
     """
-    global _last_validation_result, _last_parsed_data, _last_diagnostic_answers
-    
-    if not file:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="file is required")
-    
-    # 진단 답변 파싱
-    diagnostic_answers = {}
-    if chatbot_answers:
-        try:
-            diagnostic_answers = json.loads(chatbot_answers)
-            _last_diagnostic_answers = diagnostic_answers
-        except json.JSONDecodeError:
-            pass
-    
-    file_bytes = await file.read()
+    # 파일 검증 + 내용 해시 (한 번만 스트리밍으로 읽고 되감은 업로드 임시 파일을 그대로 파서에 전달)
+    file_bytes, filename, size, digest = await validate_upload_stream_with_digest(file)
+    secure_logger.info("파일 업로드(ReACT): %s, 크기: %d bytes", filename, size)
+    
+    # 같은 파일/답변의 ReACT 결과가 있으면 에이전트 루프(파싱~LLM 추론)를 다시 돌리지 않음
+    cache_key = "react:" + _result_etag(digest, diagnostic_answers)
+    cached = _get_cached_result(cache_key)
+    if cached is not None:
+        # 다운로드용 마지막 결과만 갱신 (성공 케이스는 첫 실행 때 이미 저장됨)
+        await asyncio.to_thread(_persist_react_result, cached, diagnostic_answers, file.filename, False)
+        return FastJSONResponse(content=cached)
     
     # ReACT Agent 생성 및 실행
     registry = get_registry()
     agent = create_react_agent(registry, verbose=True)
     
     try:
-        result = agent.run(
+        # 에이전트 루프(파싱/매칭/검증 + LLM 추론)는 동기 작업이므로 스레드에서 실행
+        result = await asyncio.to_thread(
+            agent.run,
             file_bytes=file_bytes,
             diagnostic_answers=diagnostic_answers,
-            sheet_type="재직자"
+            sheet_type="재직자",
+            digest=digest
         )
         
         # 추론 과정 설명 추가
         result["agent_explanation"] = agent.explain_reasoning()
         
-        # 결과 저장
-        _last_validation_result = result
-        if result.get("steps", {}).get("parsed_summary"):
-            _last_parsed_data = {
-                "headers": result["steps"]["parsed_summary"].get("headers", []),
-                "rows": []  # 원본 rows는 별도 저장 필요
-            }
+        # 결과 저장 + 성공 케이스 저장 (Redis/파일 I/O)도 이벤트 루프를 막지 않도록 스레드에서 실행
+        await asyncio.to_thread(_persist_react_result, result, diagnostic_answers, file.filename)
+        if result.get("status") != "failed":  # 일시적 실패(LLM 오류 등)는 캐시하지 않고 다음 요청에서 재시도
+            _cache_result(cache_key, result)
         
-        # 성공 케이스 자동 저장
-        confidence_score = result.get("confidence", {}).get("score", 0)
-        if confidence_score >= 0.8:
-            try:
-                save_successful_case(
-                    headers=result.get("steps", {}).get("parsed_summary", {}).get("headers", []),
-                    matches=result.get("steps", {}).get("matches", {}).get("matches", []),
-                    confidence=confidence_score,
-                    was_auto_approved=result.get("status") == "completed",
-                    metadata={"filename": file.filename, "mode": "react"}
-                )
-            except Exception as e:
-                print(f"케이스 저장 실패: {e}")
-        
-        return result
+        return FastJSONResponse(content=result)
         
     except Exception as e:
         raise HTTPException(
@@ -213,6 +408,19 @@ async def auto_validate_with_react(
         )
 
 
+# 인원수 진단 질문 (정규직/임원/1년 미만/정년 초과/계약직)
+_HEADCOUNT_QUESTIONS = ("q19", "q20", "q21", "q22", "q23")
+
+
+def _parse_headcount(value: Any) -> int:
+    """인원수 답변을 정수로 변환 (JSON 숫자는 그대로, 숫자 문자열만 변환, 나머지는 0)."""
+    if type(value) is int:
+        return value if value >= 0 else 0
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return 0
+
+
 def check_diagnostic_consistency(parsed: dict, answers: dict) -> list:
     """진단 질문 답변과 실제 데이터 간 불일치 검사
     
@@ -232,12 +440,7 @@ def check_diagnostic_consistency(parsed: dict, answers: dict) -> list:
     # ========================================
     
     # 인원수 합계 vs 실제 행 수 비교
-    headcount_questions = ["q19", "q20", "q21", "q22", "q23"]
-    total_reported = sum(
-        int(answers.get(q, 0)) 
-        for q in headcount_questions 
-        if str(answers.get(q, "")).isdigit()
-    )
+    total_reported = sum(_parse_headcount(answers.get(q)) for q in _HEADCOUNT_QUESTIONS)
     
     if total_reported > 0 and abs(row_count - total_reported) > 0:
         warnings.append({
@@ -267,6 +470,11 @@ def check_diagnostic_consistency(parsed: dict, answers: dict) -> list:
     return warnings
 
 
+# AI 분석 결과 캐시 (프롬프트 해시 → 결과). 같은 파일/답변으로 재검증 시 OpenAI 재호출 방지
+_AI_ANALYSIS_CACHE_SIZE = 64
+_ai_analysis_cache: "OrderedDict[str, dict]" = OrderedDict()
+
+
 def _ai_agent_analyze(parsed: dict, answers: dict, row_count: int, headers: list, rows: list) -> dict:
     """
     AI Agent가 자유롭게 데이터를 분석하고 판단.
@@ -274,18 +482,6 @@ def _ai_agent_analyze(parsed: dict, answers: dict, row_count: int, headers: list
     - 자동 수정 가능하면 수정 제안
     - 확인 필요하면 고객에게 질문 생성
     """
-    from internal.ai.llm_client import chat
-    from internal.ai.knowledge_base import get_error_check_rules
-    
-    # 샘플 데이터 (처음 10행)
-    sample_rows = rows[:10] if rows else []
-    sample_data = []
-    for row in sample_rows:
-        if isinstance(row, dict):
-            sample_data.append({k: str(v)[:50] for k, v in list(row.items())[:8]})
-        elif isinstance(row, (list, tuple)):
-            sample_data.append([str(v)[:50] for v in row[:8]])
-    
     analysis_prompt = f"""당신은 퇴직급여채무 검증 AI 에이전트입니다.
 아래 데이터를 자유롭게 분석하고, 문제가 있으면 지적하세요.
 
@@ -298,7 +494,8 @@ def _ai_agent_analyze(parsed: dict, answers: dict, row_count: int, headers: list
 ## 명부 데이터:
 - 총 직원: {row_count}명
 - 컬럼: {headers}
-- 샘플 데이터 (처음 10행): {sample_data}
+- 샘플 데이터 (처음 10행, | 구분):
+{_format_sample_table(headers, rows)}
 
 ## 당신의 역할:
 1. **자유롭게 분석**: 위 규칙뿐 아니라, 데이터에서 이상한 점을 발견하면 지적
@@ -318,69 +515,105 @@ def _ai_agent_analyze(parsed: dict, answers: dict, row_count: int, headers: list
 
 JSON만 출력하세요."""
 
-    response = chat(analysis_prompt)
-    
-    import json
-    response_text = response.strip()
-    if response_text.startswith("```"):
-        response_text = response_text.split("```")[1]
-        if response_text.startswith("json"):
-            response_text = response_text[4:]
-    
-    result = json.loads(response_text)
-    return result if isinstance(result, dict) else {"issues": [], "questions_for_customer": []}
+    cache_key = hashlib.blake2b(analysis_prompt.encode(), digest_size=16).hexdigest()
+    with _state_lock:
+        cached = _ai_analysis_cache.get(cache_key)
+        if cached is not None:
+            _ai_analysis_cache.move_to_end(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    response = llm_client.chat(analysis_prompt, json_mode=True)
+    result = parse_llm_json(response)
+    if not isinstance(result, dict):
+        return {"issues": [], "questions_for_customer": []}
+
+    # 정상 응답만 캐시 (LLM 오류 시 chat()은 "[]" 반환)
+    cached = copy.deepcopy(result)
+    with _state_lock:
+        _ai_analysis_cache[cache_key] = cached
+        if len(_ai_analysis_cache) > _AI_ANALYSIS_CACHE_SIZE:
+            _ai_analysis_cache.popitem(last=False)
+    return result
+
+
+def _format_sample_table(headers: list, rows: list, max_rows: int = 10, max_cols: int = 8) -> str:
+    """
+    샘플 데이터를 AI 프롬프트용 '|' 구분 표로 변환.
+
+    행마다 키를 반복하는 dict repr보다 짧아서 토큰 수가 줄고, 만드는 비용도 작음.
+    """
+    sample_rows = rows[:max_rows] if rows else []
+    if sample_rows and isinstance(sample_rows[0], dict):
+        columns = list(sample_rows[0].keys())[:max_cols]
+    else:
+        columns = list(headers or [])[:max_cols]
+
+    lines = ["|".join(str(c) for c in columns)]
+    for row in sample_rows:
+        if isinstance(row, dict):
+            values = [row.get(c) for c in columns]
+        elif isinstance(row, (list, tuple)):
+            values = row[:max_cols]
+        else:
+            continue
+        lines.append("|".join("" if v is None else str(v)[:50] for v in values))
+    return "\n".join(lines)
+
+
+# AI 프롬프트용 진단 질문 라벨
+_QUESTION_LABELS = {
+    "q1": "사외적립자산 일치 여부",
+    "q2": "정년 (세)",
+    "q3": "임금피크제 적용",
+    "q4": "기타장기종업원급여",
+    "q5": "급여체계 (연봉제/호봉제)",
+    "q6": "해고 등급",
+    "q7": "1년 미만 재직자 포함",
+    "q8": "기준급여",
+    "q9": "퇴직지급율",
+    "q10": "월할계산",
+    "q11": "할인율",
+    "q12": "임금상승률",
+    "q13": "중간정산 여부",
+    "q19": "정규직 인원수",
+    "q20": "임원 인원수",
+    "q21": "1년 미만 재직자 수",
+    "q22": "정년 초과자 수",
+    "q23": "계약직 인원수",
+}
 
 
 def _format_answers_for_ai(answers: dict) -> str:
     """진단 답변을 AI가 이해하기 쉬운 형태로 포맷팅"""
-    question_labels = {
-        "q1": "사외적립자산 일치 여부",
-        "q2": "정년 (세)",
-        "q3": "임금피크제 적용",
-        "q4": "기타장기종업원급여",
-        "q5": "급여체계 (연봉제/호봉제)",
-        "q6": "해고 등급",
-        "q7": "1년 미만 재직자 포함",
-        "q8": "기준급여",
-        "q9": "퇴직지급율",
-        "q10": "월할계산",
-        "q11": "할인율",
-        "q12": "임금상승률",
-        "q13": "중간정산 여부",
-        "q19": "정규직 인원수",
-        "q20": "임원 인원수",
-        "q21": "1년 미만 재직자 수",
-        "q22": "정년 초과자 수",
-        "q23": "계약직 인원수",
-    }
-    
-    lines = []
-    for qid, value in answers.items():
-        label = question_labels.get(qid, qid)
-        lines.append(f"- {label}: {value}")
-    
-    return "\n".join(lines)
+    return "\n".join(
+        f"- {_QUESTION_LABELS.get(qid, qid)}: {value}"
+        for qid, value in answers.items()
+    )
 
 
 @router.get("/download-excel")
 async def download_excel():
     """마지막 검증 결과를 Excel 파일로 다운로드 (검증 리포트)"""
-    global _last_validation_result, _last_parsed_data
+    # 이전 결과는 Redis에서 rows 전체를 읽어 역직렬화하므로 스레드에서 조회
+    last_result, last_parsed = await asyncio.to_thread(_load_last_result)
     
-    if not _last_validation_result:
+    if not last_result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="검증 결과가 없습니다. 먼저 파일을 검증해주세요."
         )
     
     try:
-        excel_bytes = generate_excel_report(
-            validation_result=_last_validation_result,
-            original_data=_last_parsed_data
+        excel_bytes = await asyncio.to_thread(
+            generate_excel_report,
+            validation_result=last_result,
+            original_data=last_parsed
         )
         
-        return StreamingResponse(
-            BytesIO(excel_bytes),
+        # 이미 메모리에 있는 바이트를 그대로 전송 (BytesIO 재복사/줄 단위 순회 없음)
+        return Response(
+            content=excel_bytes,
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={
                 "Content-Disposition": "attachment; filename=validation_report.xlsx"
@@ -396,22 +629,25 @@ async def download_excel():
 @router.get("/download-final-data")
 async def download_final_data():
     """최종 수정본 다운로드 (매핑 완료된 깔끔한 데이터)"""
-    global _last_validation_result, _last_parsed_data
+    # 이전 결과는 Redis에서 rows 전체를 읽어 역직렬화하므로 스레드에서 조회
+    last_result, last_parsed = await asyncio.to_thread(_load_last_result)
     
-    if not _last_validation_result or not _last_parsed_data:
+    if not last_result or not last_parsed:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="검증 결과가 없습니다. 먼저 파일을 검증해주세요."
         )
     
     try:
-        excel_bytes = generate_final_data_excel(
-            original_data=_last_parsed_data,
-            validation_result=_last_validation_result
+        excel_bytes = await asyncio.to_thread(
+            generate_final_data_excel,
+            original_data=last_parsed,
+            validation_result=last_result
         )
         
-        return StreamingResponse(
-            BytesIO(excel_bytes),
+        # 이미 메모리에 있는 바이트를 그대로 전송 (BytesIO 재복사/줄 단위 순회 없음)
+        return Response(
+            content=excel_bytes,
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={
                 "Content-Disposition": "attachment; filename=final_data.xlsx"
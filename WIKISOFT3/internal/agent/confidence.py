@@ -54,8 +54,6 @@ def detect_anomalies(parsed: Dict[str, Any], matches: Dict[str, Any], validation
     - L1 에러 > 5%
     - 매칭 신뢰도 < 0.5
     """
-    import pandas as pd
-
     anomalies = []
 
     # matches가 리스트인 경우 처리
@@ -64,9 +62,16 @@ def detect_anomalies(parsed: Dict[str, Any], matches: Dict[str, Any], validation
     else:
         match_list = matches.get("matches", [])
 
-    # unmapped 헤더 비율
-    unmapped_count = sum(1 for m in match_list if m.get("unmapped"))
-    if match_list and unmapped_count / len(match_list) > 0.2:
+    # unmapped 개수와 신뢰도 합계를 한 번의 순회로 집계
+    unmapped_count = 0
+    total_conf = 0.0
+    for m in match_list:
+        if m.get("unmapped"):
+            unmapped_count += 1
+        total_conf += m.get("confidence", 0)
+
+    # unmapped 헤더 비율 > 20% (나눗셈 없이 정수 비교: count/total > 1/5 ⇔ count*5 > total)
+    if match_list and unmapped_count * 5 > len(match_list):
         anomalies.append({
             "type": "high_unmapped_headers",
             "severity": "warning",
@@ -77,8 +82,8 @@ def detect_anomalies(parsed: Dict[str, Any], matches: Dict[str, Any], validation
     errors = validation_l1.get("errors", [])
     if "rows" in parsed and len(parsed["rows"]) > 0:
         error_rows = {e.get("row") for e in errors if "row" in e}
-        error_rate = len(error_rows) / len(parsed["rows"])
-        if error_rate > 0.05:
+        # 에러 행 비율 > 5% (정수 비교: rows/total > 1/20 ⇔ rows*20 > total)
+        if len(error_rows) * 20 > len(parsed["rows"]):
             anomalies.append({
                 "type": "high_error_rate",
                 "severity": "error",
@@ -87,7 +92,7 @@ def detect_anomalies(parsed: Dict[str, Any], matches: Dict[str, Any], validation
 
     # 낮은 매칭 신뢰도
     if match_list:
-        avg_conf = sum(m.get("confidence", 0) for m in match_list) / len(match_list)
+        avg_conf = total_conf / len(match_list)
         if avg_conf < 0.5:
             anomalies.append({
                 "type": "low_match_confidence",
@@ -14,12 +14,20 @@ ReACT (Reasoning and Acting) 패턴:
 - LLM 기반 추론 (선택적)
 """
 
+import bisect
 import json
 import os
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Union
 from dataclasses import dataclass, field
 from enum import Enum
 
+from internal.ai.llm_client import get_openai_client
+from internal.utils.logging import get_logger
+
+
+# 단계별 추론 로그 (stdout print 대신 구조화 로그 → 동시 요청 시 줄이 섞이지 않고 필드로 조회 가능)
+logger = get_logger("react_agent")
+
 
 class AgentAction(Enum):
     """에이전트 액션 타입."""
@@ -32,7 +40,26 @@ class AgentAction(Enum):
     FAIL = "fail"
 
 
-@dataclass
+# 액션 → 문자열 값 (로그/히스토리 직렬화 때마다 Enum.value 디스크립터를 거치지 않도록 미리 계산)
+_ACTION_VALUES = {action: action.value for action in AgentAction}
+
+# 종료 액션 → 에이전트 상태
+_TERMINAL_STATUS = {
+    AgentAction.COMPLETE: "completed",
+    AgentAction.FAIL: "failed",
+    AgentAction.ASK_HUMAN: "needs_human",
+}
+
+# 추론 과정 설명용 액션 아이콘 (그 외 액션은 진행 중 ⏳)
+_ACTION_ICONS = {
+    AgentAction.COMPLETE: "✅",
+    AgentAction.FAIL: "❌",
+    AgentAction.ASK_HUMAN: "🙋",
+}
+
+
+# 단계마다 생성되는 기록 객체는 __slots__로 인스턴스 __dict__ 없이 보관
+@dataclass(slots=True)
 class Thought:
     """에이전트의 사고 과정."""
     step: int
@@ -42,7 +69,7 @@ class Thought:
     confidence: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Observation:
     """액션 실행 결과."""
     action: AgentAction
@@ -57,13 +84,16 @@ class AgentState:
     """에이전트 상태."""
     thoughts: List[Thought] = field(default_factory=list)
     observations: List[Observation] = field(default_factory=list)
-    current_step: int = 0
     status: str = "running"  # running, completed, failed, needs_human
     final_result: Optional[Dict[str, Any]] = None
     
+    @property
+    def current_step(self) -> int:
+        """현재 단계 (마지막 사고의 step에서 파생, 별도 필드로 동기화하지 않음)."""
+        return self.thoughts[-1].step if self.thoughts else 0
+    
     def add_thought(self, thought: Thought):
         self.thoughts.append(thought)
-        self.current_step = thought.step
     
     def add_observation(self, observation: Observation):
         self.observations.append(observation)
@@ -75,7 +105,7 @@ class AgentState:
             history.append({
                 "step": t.step,
                 "thought": t.reasoning,
-                "action": t.action.value,
+                "action": _ACTION_VALUES[t.action],
                 "result_success": o.success,
                 "confidence": o.confidence,
                 "error": o.error,
@@ -99,6 +129,20 @@ class ReactAgent:
     CONFIDENCE_AUTO_CORRECT = 0.80   # 이상이면 자동 수정 + 알림
     CONFIDENCE_NEEDS_REVIEW = 0.50   # 미만이면 사람 검토 필요
     
+    # 전체 신뢰도 가중치 (매칭 + 검증 = 1.0), unmapped 헤더당 매칭 신뢰도 패널티
+    MATCH_WEIGHT = 0.4
+    VALIDATION_WEIGHT = 0.6
+    UNMAPPED_PENALTY = 0.05
+    
+    # 신뢰도 구간별 (등급, 권장 조치): 오름차순 임계값을 bisect로 찾아 인덱스로 조회
+    _GRADE_THRESHOLDS = (CONFIDENCE_NEEDS_REVIEW, CONFIDENCE_AUTO_CORRECT, CONFIDENCE_AUTO_COMPLETE)
+    _GRADES = (
+        ("D", "full_manual_review"),
+        ("C", "manual_review"),
+        ("B", "auto_correct_with_review"),
+        ("A", "auto_complete"),
+    )
+    
     def __init__(
         self,
         tool_registry,
@@ -121,17 +165,19 @@ class ReactAgent:
     
     def run(
         self,
-        file_bytes: bytes,
+        file_bytes: Union[bytes, BinaryIO],
         diagnostic_answers: Optional[Dict[str, Any]] = None,
-        sheet_type: str = "재직자"
+        sheet_type: str = "재직자",
+        digest: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         에이전트 실행: 파일 → 검증 결과.
         
         Args:
-            file_bytes: 업로드된 파일
+            file_bytes: 업로드된 파일 (bytes 또는 바이너리 파일 객체)
             diagnostic_answers: 진단 질문 답변
             sheet_type: 시트 타입
+            digest: 호출자가 이미 계산한 파일 내용 해시 (파서 캐시 키 재계산 생략)
         
         Returns:
             최종 검증 결과 + 에이전트 추론 히스토리
@@ -139,11 +185,15 @@ class ReactAgent:
         self.state = AgentState()
         context = {
             "file_bytes": file_bytes,
+            "digest": digest,
             "diagnostic_answers": diagnostic_answers or {},
             "sheet_type": sheet_type,
             "parsed": None,
             "matches": None,
             "validation": None,
+            # 관찰 시점에 계산한 단계별 신뢰도 (이후 단계마다 매칭 목록을 다시 순회하지 않음)
+            "match_confidence": 0.0,
+            "validation_confidence": 0.0,
         }
         
         for i in range(self.max_iterations):
@@ -152,18 +202,17 @@ class ReactAgent:
             self.state.add_thought(thought)
             
             if self.verbose:
-                print(f"[Step {i+1}] Think: {thought.reasoning}")
-                print(f"         Action: {thought.action.value}")
+                logger.info(
+                    "react_think",
+                    step=i + 1,
+                    reasoning=thought.reasoning,
+                    action=_ACTION_VALUES[thought.action],
+                )
             
             # 2. 종료 조건 체크
-            if thought.action == AgentAction.COMPLETE:
-                self.state.status = "completed"
-                break
-            elif thought.action == AgentAction.FAIL:
-                self.state.status = "failed"
-                break
-            elif thought.action == AgentAction.ASK_HUMAN:
-                self.state.status = "needs_human"
+            terminal_status = _TERMINAL_STATUS.get(thought.action)
+            if terminal_status is not None:
+                self.state.status = terminal_status
                 break
             
             # 3. Act: 도구 실행
@@ -171,7 +220,14 @@ class ReactAgent:
             self.state.add_observation(observation)
             
             if self.verbose:
-                print(f"         Result: {'✅' if observation.success else '❌'} (conf: {observation.confidence:.2f})")
+                logger.info(
+                    "react_observe",
+                    step=i + 1,
+                    action=_ACTION_VALUES[observation.action],
+                    success=observation.success,
+                    confidence=round(observation.confidence, 2),
+                    error=observation.error,
+                )
             
             # 4. Observe: 결과 업데이트
             self._observe(observation, context, thought.action)
@@ -197,7 +253,7 @@ class ReactAgent:
                 step=step,
                 reasoning="파일이 파싱되지 않았습니다. 먼저 파싱을 수행합니다.",
                 action=AgentAction.PARSE,
-                action_params={"file_bytes": context["file_bytes"]},
+                action_params={"file_bytes": context["file_bytes"], "digest": context["digest"]},
             )
         
         if context["matches"] is None:
@@ -212,7 +268,7 @@ class ReactAgent:
             )
         
         # 매칭 신뢰도 체크 + LLM 추론
-        match_confidence = self._calculate_match_confidence(context["matches"])
+        match_confidence = context["match_confidence"]
         
         # 신뢰도가 낮고 재시도 가능하면 재시도
         if match_confidence < self.CONFIDENCE_AUTO_CORRECT and self.retry_count < 2:
@@ -270,13 +326,18 @@ class ReactAgent:
             return f"신뢰도: {confidence:.2f}"
         
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            client = get_openai_client(os.getenv("OPENAI_API_KEY"))
             
             # 현재 상황 요약
             matches = context.get("matches", {}).get("matches", [])
-            unmapped = [m["source"] for m in matches if m.get("unmapped")]
-            low_conf = [m["source"] for m in matches if m.get("confidence", 1) < 0.7 and not m.get("unmapped")]
+            # 미매핑/낮은 신뢰도 헤더를 한 번의 순회로 분류
+            unmapped: List[str] = []
+            low_conf: List[str] = []
+            for m in matches:
+                if m.get("unmapped"):
+                    unmapped.append(m["source"])
+                elif m.get("confidence", 1) < 0.7:
+                    low_conf.append(m["source"])
             
             prompt = f"""당신은 HR 데이터 검증 AI 에이전트입니다. 현재 상황을 분석하세요.
 
@@ -308,7 +369,7 @@ class ReactAgent:
     def _act(self, thought: Thought, context: Dict[str, Any]) -> Observation:
         """도구 실행."""
         try:
-            if thought.action == AgentAction.PARSE:
+            if thought.action is AgentAction.PARSE:
                 result = self.registry.call_tool("parse_roster", **thought.action_params)
                 return Observation(
                     action=thought.action,
@@ -317,7 +378,7 @@ class ReactAgent:
                     confidence=1.0 if result.get("headers") else 0.0,
                 )
             
-            elif thought.action == AgentAction.MATCH:
+            elif thought.action is AgentAction.MATCH:
                 result = self.registry.call_tool("match_headers", **thought.action_params)
                 confidence = self._calculate_match_confidence(result)
                 return Observation(
@@ -327,7 +388,7 @@ class ReactAgent:
                     confidence=confidence,
                 )
             
-            elif thought.action == AgentAction.VALIDATE:
+            elif thought.action is AgentAction.VALIDATE:
                 result = self.registry.call_tool("validate", **thought.action_params)
                 confidence = self._calculate_validation_confidence(result)
                 return Observation(
@@ -359,12 +420,14 @@ class ReactAgent:
         if not observation.success:
             return
         
-        if action == AgentAction.PARSE:
+        if action is AgentAction.PARSE:
             context["parsed"] = observation.result
-        elif action == AgentAction.MATCH:
+        elif action is AgentAction.MATCH:
             context["matches"] = observation.result
-        elif action == AgentAction.VALIDATE:
+            context["match_confidence"] = observation.confidence
+        elif action is AgentAction.VALIDATE:
             context["validation"] = observation.result
+            context["validation_confidence"] = observation.confidence
     
     def _calculate_match_confidence(self, matches: Dict[str, Any]) -> float:
         """매칭 신뢰도 계산."""
@@ -375,12 +438,17 @@ class ReactAgent:
         if not match_list:
             return 0.0
         
-        total_conf = sum(m.get("confidence", 0) for m in match_list)
+        # 신뢰도 합계와 unmapped 개수를 한 번의 순회로 집계
+        total_conf = 0.0
+        unmapped_count = 0
+        for m in match_list:
+            total_conf += m.get("confidence", 0)
+            if m.get("unmapped"):
+                unmapped_count += 1
         avg_conf = total_conf / len(match_list)
         
         # unmapped 패널티
-        unmapped_count = sum(1 for m in match_list if m.get("unmapped"))
-        unmapped_penalty = unmapped_count * 0.05
+        unmapped_penalty = unmapped_count * self.UNMAPPED_PENALTY
         
         return max(0.0, min(1.0, avg_conf - unmapped_penalty))
     
@@ -399,30 +467,19 @@ class ReactAgent:
         return max(0.0, min(1.0, confidence))
     
     def _calculate_overall_confidence(self, context: Dict[str, Any]) -> float:
-        """전체 신뢰도 계산."""
-        match_conf = self._calculate_match_confidence(context.get("matches", {}))
-        val_conf = self._calculate_validation_confidence(context.get("validation", {}))
+        """전체 신뢰도 계산 (관찰 시 저장해 둔 단계별 신뢰도 사용)."""
+        match_conf = context.get("match_confidence", 0.0)
+        val_conf = context.get("validation_confidence", 0.0)
         
-        # 가중 평균
-        return (match_conf * 0.4) + (val_conf * 0.6)
+        # 가중 평균 (각 신뢰도는 이미 0~1로 보정되어 있어 다시 자르지 않음)
+        return match_conf * self.MATCH_WEIGHT + val_conf * self.VALIDATION_WEIGHT
     
     def _build_final_result(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """최종 결과 구성."""
         overall_confidence = self._calculate_overall_confidence(context)
         
-        # 신뢰도 등급
-        if overall_confidence >= self.CONFIDENCE_AUTO_COMPLETE:
-            grade = "A"
-            recommendation = "auto_complete"
-        elif overall_confidence >= self.CONFIDENCE_AUTO_CORRECT:
-            grade = "B"
-            recommendation = "auto_correct_with_review"
-        elif overall_confidence >= self.CONFIDENCE_NEEDS_REVIEW:
-            grade = "C"
-            recommendation = "manual_review"
-        else:
-            grade = "D"
-            recommendation = "full_manual_review"
+        # 신뢰도 등급 (임계값 이상이면 해당 구간)
+        grade, recommendation = self._GRADES[bisect.bisect_right(self._GRADE_THRESHOLDS, overall_confidence)]
         
         return {
             "status": self.state.status,
@@ -449,14 +506,7 @@ class ReactAgent:
         lines = ["🤖 AI 에이전트 추론 과정:\n"]
         
         for thought in self.state.thoughts:
-            status = "⏳"
-            if thought.action == AgentAction.COMPLETE:
-                status = "✅"
-            elif thought.action == AgentAction.FAIL:
-                status = "❌"
-            elif thought.action == AgentAction.ASK_HUMAN:
-                status = "🙋"
-            
+            status = _ACTION_ICONS.get(thought.action, "⏳")
             lines.append(f"{status} Step {thought.step}: {thought.reasoning}")
         
         return "\n".join(lines)
@@ -9,6 +9,7 @@
 from enum import Enum
 from typing import Any, Dict, List, Optional, Callable
 from dataclasses import dataclass
+import asyncio
 import time
 import random
 
@@ -256,8 +257,6 @@ class AsyncRetryStrategy(RetryStrategy):
         on_strategy_change: Optional[Callable[[StrategyType], None]] = None
     ) -> RetryResult:
         """비동기 재시도 실행"""
-        import asyncio
-        
         attempted_strategies: List[StrategyType] = []
         total_delay = 0.0
         last_error = None
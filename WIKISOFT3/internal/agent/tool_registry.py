@@ -1,7 +1,7 @@
 """
 Tool Registry: 파서/매칭/검증/리포트 도구를 중앙에서 관리
 """
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from internal.ai.matcher import match_headers
 from internal.generators.report import generate_report
@@ -18,7 +18,7 @@ class ToolRegistry:
             "parse_roster": {
                 "func": parse_roster,
                 "description": "Excel/CSV 파일 파싱",
-                "params": ["file_bytes", "sheet_name", "max_rows"],
+                "params": ["file_bytes", "sheet_name", "max_rows", "digest"],
             },
             "match_headers": {
                 "func": match_headers,
@@ -42,19 +42,26 @@ class ToolRegistry:
             },
         }
 
+        # list_tools 결과 캐시 (도구 목록은 생성 시 고정, 도구 수가 바뀌면 다시 생성)
+        self._tool_list: Optional[List[Dict[str, Any]]] = None
+
     def list_tools(self) -> List[Dict[str, Any]]:
-        return [{"name": name, "description": info["description"], "params": info["params"]} for name, info in self.tools.items()]
+        """도구 목록 (이름/설명/파라미터). 호출마다 새로 만들지 않고 캐시된 목록 반환."""
+        if self._tool_list is None or len(self._tool_list) != len(self.tools):
+            self._tool_list = [
+                {"name": name, "description": info["description"], "params": info["params"]}
+                for name, info in self.tools.items()
+            ]
+        return self._tool_list
 
     def call_tool(self, tool_name: str, **kwargs) -> Any:
-        if tool_name not in self.tools:
-            raise ValueError(f"Tool not found: {tool_name}")
-        func = self.tools[tool_name]["func"]
-        return func(**kwargs)
+        return self.get_tool(tool_name)(**kwargs)
 
     def get_tool(self, tool_name: str) -> Callable:
-        if tool_name not in self.tools:
+        tool = self.tools.get(tool_name)
+        if tool is None:
             raise ValueError(f"Tool not found: {tool_name}")
-        return self.tools[tool_name]["func"]
+        return tool["func"]
 
 
 # 글로벌 레지스트리
@@ -1,4 +1,4 @@
-from .llm_client import chat, get_llm_client, LLMClient
+from .llm_client import chat, get_llm_client, get_openai_client, LLMClient
 from .knowledge_base import get_system_context, get_error_check_rules
 
-__all__ = ["chat", "get_llm_client", "LLMClient", "get_system_context", "get_error_check_rules"]
+__all__ = ["chat", "get_llm_client", "get_openai_client", "LLMClient", "get_system_context", "get_error_check_rules"]
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional
 import os
 
 from internal.ai.llm_client import chat
+from internal.utils.json_utils import parse_llm_json
 
 
 def generate_dynamic_questions(
@@ -197,16 +198,8 @@ def _generate_ai_questions(
 추가 질문이 필요 없으면 빈 배열을 반환하세요.
 JSON만 출력하세요."""
 
-        response = chat(prompt)
-        
-        import json
-        response_text = response.strip()
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        
-        result = json.loads(response_text)
+        response = chat(prompt, json_mode=True)
+        result = parse_llm_json(response)
         
         questions = []
         for q in result.get("questions", [])[:max_count]:
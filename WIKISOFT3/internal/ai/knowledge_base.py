@@ -1,11 +1,14 @@
 """
 Knowledge Base: 시스템 문서를 에이전트에 제공하는 간단한 RAG
 """
+import heapq
 import os
 import json
 from typing import Optional, List, Dict
 from datetime import datetime
 
+from internal.utils.json_utils import read_json_many
+
 # 시스템 문서 요약 (수동 큐레이션)
 SYSTEM_KNOWLEDGE = """
 === WIKISOFT3 시스템 개요 ===
@@ -156,18 +159,16 @@ def load_training_examples(category: Optional[str] = None) -> List[Dict]:
     if not os.path.exists(TRAINING_DATA_PATH):
         return []
     
-    examples = []
+    filepaths = []
     for filename in os.listdir(TRAINING_DATA_PATH):
         if not filename.endswith(".json"):
             continue
         if category and not filename.startswith(category):
             continue
         
-        filepath = os.path.join(TRAINING_DATA_PATH, filename)
-        with open(filepath, "r", encoding="utf-8") as f:
-            examples.append(json.load(f))
+        filepaths.append(os.path.join(TRAINING_DATA_PATH, filename))
     
-    return examples
+    return [example for example in read_json_many(filepaths) if example is not None]
 
 
 def get_few_shot_examples(category: str, limit: int = 3) -> str:
@@ -176,11 +177,13 @@ def get_few_shot_examples(category: str, limit: int = 3) -> str:
     올바른 응답 예시만 선택해서 프롬프트에 포함.
     """
     examples = load_training_examples(category)
-    correct_examples = [e for e in examples if e.get("is_correct", False)]
     
-    # 최신 예시 우선
-    correct_examples.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-    selected = correct_examples[:limit]
+    # 최신 예시 우선 (전체 정렬 없이 limit개만 힙으로 선택, 정렬 후 자르기와 결과 동일)
+    selected = heapq.nlargest(
+        limit,
+        (e for e in examples if e.get("is_correct", False)),
+        key=lambda x: x.get("timestamp", ""),
+    )
     
     if not selected:
         return ""
@@ -2,13 +2,17 @@ import os
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from openai import AzureOpenAI, OpenAI
-
 
 class LLMClient:
-    """LLM 클라이언트: Azure OpenAI 우선, 없으면 OpenAI 기본."""
+    """LLM 클라이언트: Azure OpenAI 우선, 없으면 OpenAI 기본.
+
+    async 엔드포인트에서는 achat/achat_with_tools를 사용 (이벤트 루프 블로킹 방지).
+    """
 
     def __init__(self):
+        # openai 패키지는 import 비용이 커서(~0.5초) 클라이언트를 처음 만들 때 로드 (서버/워커 기동 시간 단축)
+        from openai import AsyncAzureOpenAI, AsyncOpenAI, AzureOpenAI, OpenAI
+
         azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
         azure_key = os.getenv("AZURE_OPENAI_API_KEY")
         azure_deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
@@ -25,26 +29,53 @@ class LLMClient:
                 api_version=azure_version,
                 azure_endpoint=azure_endpoint,
             )
+            self.async_client = AsyncAzureOpenAI(
+                api_key=azure_key,
+                api_version=azure_version,
+                azure_endpoint=azure_endpoint,
+            )
         elif openai_key:
             self.provider = "openai"
             self.model = openai_model
             self.client = OpenAI(api_key=openai_key)
+            self.async_client = AsyncOpenAI(api_key=openai_key)
         else:
             raise ValueError("No OpenAI/Azure OpenAI credentials found in environment variables")
 
-    def chat(self, messages: List[Dict[str, Any]], temperature: float = 0.2, max_tokens: int = 600) -> str:
+    def _chat_kwargs(
+        self, messages: List[Dict[str, Any]], temperature: float, max_tokens: int, json_mode: bool
+    ) -> Dict[str, Any]:
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if json_mode:
+            # JSON 객체만 반환하도록 강제 (코드 블록 래핑/파싱 실패 방지, 프롬프트에 "JSON" 포함 필요)
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    def chat(
+        self, messages: List[Dict[str, Any]], temperature: float = 0.2, max_tokens: int = 600, json_mode: bool = False
+    ) -> str:
         response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens,
+            **self._chat_kwargs(messages, temperature, max_tokens, json_mode)
         )
         return response.choices[0].message.content or ""
 
-    def chat_with_tools(
-        self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, temperature: float = 0.2
+    async def achat(
+        self, messages: List[Dict[str, Any]], temperature: float = 0.2, max_tokens: int = 600, json_mode: bool = False
+    ) -> str:
+        """chat의 비동기 버전."""
+        response = await self.async_client.chat.completions.create(
+            **self._chat_kwargs(messages, temperature, max_tokens, json_mode)
+        )
+        return response.choices[0].message.content or ""
+
+    def _tool_kwargs(
+        self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]], temperature: float
     ) -> Dict[str, Any]:
-        """툴 호출 지원하는 채팅 (OpenAI function calling)"""
         kwargs = {
             "model": self.model,
             "messages": messages,
@@ -54,8 +85,10 @@ class LLMClient:
         if tools:
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
+        return kwargs
 
-        response = self.client.chat.completions.create(**kwargs)
+    @staticmethod
+    def _tool_result(response) -> Dict[str, Any]:
         choice = response.choices[0]
         message = choice.message
 
@@ -71,18 +104,40 @@ class LLMClient:
             ]
         return result
 
+    def chat_with_tools(
+        self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, temperature: float = 0.2
+    ) -> Dict[str, Any]:
+        """툴 호출 지원하는 채팅 (OpenAI function calling)"""
+        response = self.client.chat.completions.create(**self._tool_kwargs(messages, tools, temperature))
+        return self._tool_result(response)
+
+    async def achat_with_tools(
+        self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, temperature: float = 0.2
+    ) -> Dict[str, Any]:
+        """chat_with_tools의 비동기 버전."""
+        response = await self.async_client.chat.completions.create(**self._tool_kwargs(messages, tools, temperature))
+        return self._tool_result(response)
+
 
 @lru_cache(maxsize=1)
 def get_llm_client() -> LLMClient:
     return LLMClient()
 
 
-def chat(prompt: str, temperature: float = 0.2, max_tokens: int = 800) -> str:
-    """간단한 채팅 함수 (프롬프트 문자열만 받음)"""
+@lru_cache(maxsize=8)
+def get_openai_client(api_key: str):
+    """API 키별 OpenAI 클라이언트 재사용 (호출마다 import/클라이언트·커넥션 풀 생성 방지)."""
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
+
+
+def chat(prompt: str, temperature: float = 0.2, max_tokens: int = 800, json_mode: bool = False) -> str:
+    """간단한 채팅 함수 (프롬프트 문자열만 받음). json_mode=True면 JSON 객체 응답 강제."""
     try:
         client = get_llm_client()
         messages = [{"role": "user", "content": prompt}]
-        return client.chat(messages, temperature=temperature, max_tokens=max_tokens)
+        return client.chat(messages, temperature=temperature, max_tokens=max_tokens, json_mode=json_mode)
     except Exception as e:
         # API 키가 없거나 오류 시 빈 문자열 반환
         print(f"LLM chat error: {e}")
@@ -1,11 +1,18 @@
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import copy
+import hashlib
 import json
 import os
 import re
+import threading
 from difflib import SequenceMatcher
+from functools import lru_cache
 
+from internal.ai.llm_client import get_openai_client
 from internal.parsers.standard_schema import STANDARD_SCHEMA, get_required_fields
-from internal.memory.case_store import get_few_shot_examples, save_successful_case
+from internal.memory.case_store import CaseStore, get_few_shot_examples, save_successful_case
+from internal.utils.json_utils import loads
 
 
 def _normalize(header: str) -> str:
@@ -15,32 +22,92 @@ def _normalize(header: str) -> str:
     return h.lower().strip()
 
 
-def _rule_match(headers: List[str], sheet_type: str = "재직자") -> Dict[str, Any]:
-    schema = {
+@lru_cache(maxsize=None)
+def _schema_for(sheet_type: str) -> Dict[str, Any]:
+    """시트 유형별 표준 스키마 (스키마는 정적이므로 한 번만 필터링)."""
+    return {
         name: meta
         for name, meta in STANDARD_SCHEMA.items()
         if meta.get("sheet") == sheet_type or sheet_type == "all"
     }
 
-    matches = []
-    warnings = []
 
-    for h in headers:
-        h_norm = _normalize(h)
+@lru_cache(maxsize=None)
+def _schema_json(sheet_type: str) -> str:
+    """프롬프트용 표준 스키마 JSON 문자열."""
+    return json.dumps(_schema_for(sheet_type), ensure_ascii=False)
+
+
+@lru_cache(maxsize=None)
+def _match_candidates(sheet_type: str) -> Tuple[Tuple[str, str], ...]:
+    """(표준 필드명, 정규화된 필드명/별칭) 후보 목록. 필드명 → 별칭 순서 유지."""
+    candidates = []
+    for field_name, meta in _schema_for(sheet_type).items():
+        candidates.append((field_name, _normalize(field_name)))
+        for alias in meta.get("aliases", []):
+            candidates.append((field_name, _normalize(alias)))
+    return tuple(candidates)
+
+
+# 규칙 매칭 결과 캐시 ((시트 유형, 정규화 헤더) → (표준 필드, 점수))
+# 같은 양식의 명부는 헤더가 거의 같으므로 헤더별 후보 전체 비교를 반복하지 않음 (스키마가 정적이라 무효화 불필요)
+_RULE_MATCH_CACHE_SIZE = 4096
+_rule_match_cache: "OrderedDict[Tuple[str, str], Tuple[Optional[str], float]]" = OrderedDict()
+_rule_match_cache_lock = threading.Lock()
+
+
+def _best_candidates(header_norms: List[str], sheet_type: str) -> Dict[str, Tuple[Optional[str], float]]:
+    """정규화된 헤더별 가장 유사한 표준 필드와 점수 (캐시 미사용)."""
+    # 후보(seq2)별 SequenceMatcher를 호출당 한 번만 만들고 헤더(seq1)만 바꿔가며 재사용
+    # → 후보 문자열의 문자 인덱스(b2j)를 헤더 수만큼 다시 만들지 않음 (호출마다 새로 만들어 스레드 간 공유 없음)
+    candidate_matchers = [
+        (field_name, SequenceMatcher(None, "", candidate_norm))
+        for field_name, candidate_norm in _match_candidates(sheet_type)
+    ]
+
+    results: Dict[str, Tuple[Optional[str], float]] = {}
+    for h_norm in header_norms:
         best = None
         best_score = 0.0
-        for field_name, meta in schema.items():
-            field_norm = _normalize(field_name)
-            score = SequenceMatcher(None, h_norm, field_norm).ratio()
+        for field_name, matcher in candidate_matchers:
+            matcher.set_seq1(h_norm)
+            # ratio()의 상한값으로 현재 최고 점수를 넘을 수 없는 후보는 정밀 계산 생략 (difflib.get_close_matches와 같은 방식)
+            if matcher.real_quick_ratio() <= best_score or matcher.quick_ratio() <= best_score:
+                continue
+            score = matcher.ratio()
             if score > best_score:
                 best_score = score
                 best = field_name
-            for alias in meta.get("aliases", []):
-                alias_norm = _normalize(alias)
-                score = SequenceMatcher(None, h_norm, alias_norm).ratio()
-                if score > best_score:
-                    best_score = score
-                    best = field_name
+        results[h_norm] = (best, best_score)
+    return results
+
+
+def _rule_match(headers: List[str], sheet_type: str = "재직자") -> Dict[str, Any]:
+    header_norms = [_normalize(h) for h in headers]
+
+    # 캐시에 있는 헤더는 조회만, 없는 헤더만 모아서 한 번에 계산
+    best_by_norm: Dict[str, Tuple[Optional[str], float]] = {}
+    with _rule_match_cache_lock:
+        for h_norm in header_norms:
+            cached = _rule_match_cache.get((sheet_type, h_norm))
+            if cached is not None:
+                _rule_match_cache.move_to_end((sheet_type, h_norm))
+                best_by_norm[h_norm] = cached
+    misses = [h_norm for h_norm in dict.fromkeys(header_norms) if h_norm not in best_by_norm]
+    if misses:
+        computed = _best_candidates(misses, sheet_type)
+        best_by_norm.update(computed)
+        with _rule_match_cache_lock:
+            for h_norm, best in computed.items():
+                _rule_match_cache[(sheet_type, h_norm)] = best
+            while len(_rule_match_cache) > _RULE_MATCH_CACHE_SIZE:
+                _rule_match_cache.popitem(last=False)
+
+    matches = []
+    warnings = []
+
+    for h, h_norm in zip(headers, header_norms):
+        best, best_score = best_by_norm[h_norm]
         if best and best_score >= 0.65:
             matches.append({"source": h, "target": best, "confidence": round(best_score, 3), "fallback": True})
         else:
@@ -50,66 +117,101 @@ def _rule_match(headers: List[str], sheet_type: str = "재직자") -> Dict[str,
     return {"matches": matches, "warnings": warnings}
 
 
+# AI 매칭 프롬프트 고정 부분 (모듈 로드 시 1회 생성, 호출마다 가변 부분만 이어붙임)
+_MATCH_PROMPT_HEAD = """
+당신은 HR 데이터 스키마 매칭 전문가입니다. 고객 헤더를 표준 스키마에 매핑하세요.
+
+고객 헤더: """
+
+_MATCH_PROMPT_TAIL = """
+규칙:
+1) 가장 의미적으로 가까운 필드에 매칭, aliases 참고
+2) 확실치 않으면 unmapped
+3) confidence 0.0~1.0
+4) JSON만 반환
+응답 형식:
+{
+  "mappings": [{"customer_header": "사번", "standard_field": "사원번호", "confidence": 0.95}],
+  "unmapped": ["비고"]
+}
+"""
+
+
+# AI 매칭 응답 캐시 (프롬프트 해시 → 파싱된 응답). temperature=0이라 같은 프롬프트면 같은 응답
+# → 같은 양식 명부를 반복 업로드/배치 처리할 때 OpenAI 호출 자체를 생략
+_AI_MATCH_SYSTEM_PROMPT = "HR 데이터 스키마 매칭만 수행하고 JSON으로만 응답"
+_AI_MATCH_CACHE_SIZE = 512
+_ai_match_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_ai_match_cache_lock = threading.Lock()
+
+
+def _ai_match_cache_key(prompt: str) -> str:
+    """시스템/사용자 프롬프트 해시 (blake2b)."""
+    return hashlib.blake2b(
+        f"{_AI_MATCH_SYSTEM_PROMPT}\0{prompt}".encode(), digest_size=16
+    ).hexdigest()
+
+
 def ai_match_columns(headers: List[str], sheet_type: str = "재직자", api_key: Optional[str] = None) -> Dict[str, Any]:
     """AI 매칭 호출 (OpenAI) + Few-shot Learning. 키 없으면 폴백 사용."""
     api_key_to_use = api_key or os.getenv("OPENAI_API_KEY")
-    schema = {
-        name: meta
-        for name, meta in STANDARD_SCHEMA.items()
-        if meta.get("sheet") == sheet_type or sheet_type == "all"
-    }
 
     if not api_key_to_use:
         return {**_rule_match(headers, sheet_type), "used_ai": False, "warnings": ["OPENAI_API_KEY missing, fallback matcher used"]}
 
     # Few-shot 예제 가져오기 (과거 성공 케이스)
     few_shot_examples = get_few_shot_examples(headers, k=3)
-    few_shot_prompt = ""
+    few_shot_lines = []
     if few_shot_examples:
-        few_shot_prompt = "\n\n### 과거 성공 매칭 예제 (참고용):\n"
+        few_shot_lines.append("\n\n### 과거 성공 매칭 예제 (참고용):\n")
         for i, ex in enumerate(few_shot_examples, 1):
-            few_shot_prompt += f"예제 {i}:\n"
-            few_shot_prompt += f"  입력 헤더: {ex['input_headers'][:5]}\n"
-            few_shot_prompt += f"  매칭 결과: {ex['output_matches'][:5]}\n"
+            few_shot_lines.append(f"예제 {i}:\n")
+            few_shot_lines.append(f"  입력 헤더: {ex['input_headers'][:5]}\n")
+            few_shot_lines.append(f"  매칭 결과: {ex['output_matches'][:5]}\n")
             if ex.get("human_corrections"):
-                few_shot_prompt += f"  (사람 수정: {ex['human_corrections']})\n"
+                few_shot_lines.append(f"  (사람 수정: {ex['human_corrections']})\n")
 
-    prompt = f"""
-당신은 HR 데이터 스키마 매칭 전문가입니다. 고객 헤더를 표준 스키마에 매핑하세요.
+    prompt = "".join([
+        _MATCH_PROMPT_HEAD,
+        json.dumps(headers, ensure_ascii=False),
+        "\n표준 스키마: ",
+        _schema_json(sheet_type),
+        "\n",
+        *few_shot_lines,
+        _MATCH_PROMPT_TAIL,
+    ])
 
-고객 헤더: {json.dumps(headers, ensure_ascii=False)}
-표준 스키마: {json.dumps(schema, ensure_ascii=False)}
-{few_shot_prompt}
-규칙:
-1) 가장 의미적으로 가까운 필드에 매칭, aliases 참고
-2) 확실치 않으면 unmapped
-3) confidence 0.0~1.0
-4) JSON만 반환
-응답 형식:
-{{
-  "mappings": [{{"customer_header": "사번", "standard_field": "사원번호", "confidence": 0.95}}],
-  "unmapped": ["비고"]
-}}
-"""
+    cache_key = _ai_match_cache_key(prompt)
+    with _ai_match_cache_lock:
+        data = _ai_match_cache.get(cache_key)
+        if data is not None:
+            _ai_match_cache.move_to_end(cache_key)
+    if data is not None:
+        data = copy.deepcopy(data)
+    else:
+        try:
+            client = get_openai_client(api_key_to_use)
+            response = client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": _AI_MATCH_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0,
+                response_format={"type": "json_object"},
+                max_tokens=2000,
+            )
+            content = response.choices[0].message.content
+            data = loads(content)
+        except Exception as e:  # noqa: BLE001
+            return {**_rule_match(headers, sheet_type), "used_ai": False, "warnings": [f"AI 매칭 실패, fallback 사용: {e}"]}
 
-    try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=api_key_to_use)
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "HR 데이터 스키마 매칭만 수행하고 JSON으로만 응답"},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0,
-            response_format={"type": "json_object"},
-            max_tokens=2000,
-        )
-        content = response.choices[0].message.content
-        data = json.loads(content)
-    except Exception as e:  # noqa: BLE001
-        return {**_rule_match(headers, sheet_type), "used_ai": False, "warnings": [f"AI 매칭 실패, fallback 사용: {e}"]}
+        # 정상 파싱된 응답만 캐시 (실패 시에는 위에서 폴백 반환)
+        cached = copy.deepcopy(data)
+        with _ai_match_cache_lock:
+            _ai_match_cache[cache_key] = cached
+            if len(_ai_match_cache) > _AI_MATCH_CACHE_SIZE:
+                _ai_match_cache.popitem(last=False)
 
     mappings = []
     warnings = []
@@ -213,8 +315,6 @@ def _apply_few_shot_mappings(headers: List[str]) -> Dict[str, str]:
     
     저장된 케이스를 조회해서 동일 헤더가 있으면 그 매핑을 사용.
     """
-    from internal.memory.case_store import CaseStore
-    
     try:
         store = CaseStore()
         mappings = {}
@@ -36,6 +36,17 @@ BORDER_THIN = Border(
 ALIGN_CENTER = Alignment(horizontal='center', vertical='center')
 ALIGN_LEFT = Alignment(horizontal='left', vertical='center')
 
+# 이상 탐지 심각도 → 셀 배경색 (파이프라인의 error/warning과 이전 high/medium 표기 모두 지원)
+SEVERITY_FILLS = {
+    "error": STYLE_ERROR,
+    "high": STYLE_ERROR,
+    "warning": STYLE_WARNING,
+    "medium": STYLE_WARNING,
+}
+
+# 빈 값이면 "(누락)" 표시할 필수 필드
+REQUIRED_FIELDS = frozenset({"사원번호", "이름", "생년월일", "입사일자", "기준급여"})
+
 
 def generate_report(validation: Dict[str, Any]) -> Dict[str, Any]:
     """JSON 리포트 생성"""
@@ -225,12 +236,12 @@ def _create_anomalies_sheet(ws, validation_result: Dict):
     for row_idx, anomaly in enumerate(anomalies, 2):
         ws.cell(row=row_idx, column=1, value=anomaly.get("type", "")).border = BORDER_THIN
         
-        severity_cell = ws.cell(row=row_idx, column=2, value=anomaly.get("severity", ""))
+        severity = anomaly.get("severity", "")
+        severity_cell = ws.cell(row=row_idx, column=2, value=severity)
         severity_cell.border = BORDER_THIN
-        if anomaly.get("severity") == "high":
-            severity_cell.fill = STYLE_ERROR
-        elif anomaly.get("severity") == "medium":
-            severity_cell.fill = STYLE_WARNING
+        fill = SEVERITY_FILLS.get(severity)
+        if fill is not None:
+            severity_cell.fill = fill
         
         ws.cell(row=row_idx, column=3, value=anomaly.get("message", "")).border = BORDER_THIN
         ws.cell(row=row_idx, column=4, value=anomaly.get("field", "")).border = BORDER_THIN
@@ -259,15 +270,22 @@ def _create_data_sheet(ws, original_data: Dict, validation_result: Dict):
     error_cells = set()  # (row, col) 튜플
     warning_cells = set()
     
+    # 헤더 → 컬럼 위치 (중복 헤더는 첫 번째 위치)
+    col_pos: Dict[str, int] = {}
+    for idx, header in enumerate(headers):
+        col_pos.setdefault(header, idx)
+    required_cols = {idx + 1 for idx, header in enumerate(headers) if header in REQUIRED_FIELDS}
+    
     for anomaly in anomalies:
         field = anomaly.get("field", "")
         row_idx = anomaly.get("row", None)
         severity = anomaly.get("severity", "medium")
         
-        if field in headers:
-            col_idx = headers.index(field)
+        col_idx = col_pos.get(field)
+        if col_idx is not None:
             if row_idx is not None:
-                if severity == "high":
+                # 이상 목록 시트와 같은 심각도 표 사용 (error/high → 오류, 그 외 → 경고)
+                if SEVERITY_FILLS.get(severity) is STYLE_ERROR:
                     error_cells.add((row_idx + 2, col_idx + 1))  # +2: 헤더 행 오프셋
                 else:
                     warning_cells.add((row_idx + 2, col_idx + 1))
@@ -295,14 +313,10 @@ def _create_data_sheet(ws, original_data: Dict, validation_result: Dict):
                 cell.fill = STYLE_WARNING
                 cell.font = FONT_WARNING
             
-            # 빈 필수값 체크
-            if value is None or (isinstance(value, str) and value.strip() == ""):
-                # 필수 필드인 경우 빨간색
-                header = headers[col_idx - 1] if col_idx <= len(headers) else ""
-                required_fields = ["사원번호", "이름", "생년월일", "입사일자", "기준급여"]
-                if header in required_fields:
-                    cell.fill = STYLE_ERROR
-                    cell.value = "(누락)"
+            # 빈 필수값 체크 (필수 필드인 경우 빨간색)
+            if col_idx in required_cols and (value is None or (isinstance(value, str) and value.strip() == "")):
+                cell.fill = STYLE_ERROR
+                cell.value = "(누락)"
 
 
 def export_validation_to_excel(
@@ -394,6 +408,8 @@ def generate_final_data_excel(
         cell.alignment = ALIGN_CENTER
         ws.column_dimensions[get_column_letter(col_idx)].width = max(15, len(str(header)) + 2)
     
+    required_cols = {idx for idx, header in enumerate(new_headers, 1) if header in REQUIRED_FIELDS}
+    
     # 데이터 작성
     for row_idx, row_data in enumerate(rows, 2):
         for new_col_idx, orig_col_idx in enumerate(included_cols, 1):
@@ -402,12 +418,9 @@ def generate_final_data_excel(
             cell.border = BORDER_THIN
             
             # 빈 필수값 하이라이트
-            if value is None or (isinstance(value, str) and value.strip() == ""):
-                header = new_headers[new_col_idx - 1]
-                required_fields = ["사원번호", "이름", "생년월일", "입사일자", "기준급여"]
-                if header in required_fields:
-                    cell.fill = STYLE_ERROR
-                    cell.value = "(누락)"
+            if new_col_idx in required_cols and (value is None or (isinstance(value, str) and value.strip() == "")):
+                cell.fill = STYLE_ERROR
+                cell.value = "(누락)"
     
     # 저장
     output = BytesIO()
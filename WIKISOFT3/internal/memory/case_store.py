@@ -12,6 +12,10 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 import hashlib
+import heapq
+import threading
+
+from internal.utils.json_utils import read_json, read_json_many
 
 
 # 케이스 저장 경로
@@ -29,13 +33,15 @@ class CaseStore:
         self.store_path = store_path or CASE_STORE_PATH
         self.store_path.mkdir(parents=True, exist_ok=True)
         self.index_file = self.store_path / "index.json"
+        # API 파이프라인/ReACT 결과 저장이 여러 워커 스레드에서 같은 인스턴스(get_case_store)를 쓰므로
+        # 인덱스 변경과 index.json 기록은 이 락 안에서만 수행 (재진입 가능: save_case → _update_index/_save_index)
+        self._lock = threading.RLock()
         self._load_index()
     
     def _load_index(self):
         """인덱스 로드 (없으면 생성)."""
         if self.index_file.exists():
-            with open(self.index_file, "r", encoding="utf-8") as f:
-                self.index = json.load(f)
+            self.index = read_json(self.index_file)
         else:
             self.index = {
                 "cases": [],
@@ -47,11 +53,44 @@ class CaseStore:
                 }
             }
             self._save_index()
+        # 헤더 패턴별 케이스 ID는 메모리에서 삽입 순서 유지 dict(순서 있는 집합)로 보관
+        # → 포함 여부 확인/추가가 리스트 순회 없이 O(1). 파일에는 리스트로 저장.
+        self.index["header_patterns"] = {
+            pattern: dict.fromkeys(case_ids)
+            for pattern, case_ids in self.index["header_patterns"].items()
+        }
+        # 저장된 케이스 ID 집합 (중복 체크를 케이스 목록 순회 대신 해시 조회 한 번으로)
+        self._case_ids = {c["case_id"] for c in self.index["cases"]}
+    
+    def _index_snapshot(self) -> Dict[str, Any]:
+        """
+        파일 저장용 인덱스 사본 (락 안에서 리스트/dict로 복사).
+
+        json.dump가 다른 스레드에서 변경 중인 헤더 패턴 dict-set/케이스 목록을 직접 순회하지 않도록
+        저장 데이터는 항상 이 사본에서 직렬화.
+        """
+        with self._lock:
+            return {
+                **self.index,
+                "cases": [dict(c) for c in self.index["cases"]],
+                "header_patterns": {
+                    pattern: list(case_ids)
+                    for pattern, case_ids in self.index["header_patterns"].items()
+                },
+                "stats": dict(self.index["stats"]),
+            }
+    
+    def _pattern_case_ids(self, normalized: str) -> List[str]:
+        """헤더 패턴의 케이스 ID 목록 사본 (저장 중인 다른 스레드와 안전하게 조회)."""
+        with self._lock:
+            return list(self.index["header_patterns"].get(normalized, ()))
     
     def _save_index(self):
-        """인덱스 저장."""
-        with open(self.index_file, "w", encoding="utf-8") as f:
-            json.dump(self.index, f, ensure_ascii=False, indent=2)
+        """인덱스 저장 (기록 순서가 뒤바뀌지 않도록 파일 쓰기도 락 안에서)."""
+        with self._lock:
+            index = self._index_snapshot()
+            with open(self.index_file, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, indent=2)
     
     def _generate_case_id(self, headers: List[str]) -> str:
         """헤더 기반 케이스 ID 생성."""
@@ -85,6 +124,56 @@ class CaseStore:
         Returns:
             케이스 ID
         """
+        with self._lock:
+            case_id = self._write_case(
+                headers, matches, confidence, was_auto_approved, human_corrections, metadata
+            )
+            self._update_index(case_id, headers, was_auto_approved)
+            self._save_index()
+        return case_id
+    
+    def save_cases(self, cases: List[Dict[str, Any]]) -> List[str]:
+        """
+        여러 케이스 일괄 저장 (샘플 생성/대량 학습용).
+        
+        케이스마다 인덱스 파일 전체를 다시 쓰지 않고, 인덱스 갱신은 메모리에서만 한 뒤
+        마지막에 한 번만 저장.
+        
+        Args:
+            cases: save_case 인자 dict 리스트 [{"headers": [...], "matches": [...], "confidence": 0.9, ...}]
+        
+        Returns:
+            케이스 ID 리스트 (입력 순서)
+        """
+        case_ids = []
+        with self._lock:
+            for case in cases:
+                was_auto_approved = case.get("was_auto_approved", True)
+                case_id = self._write_case(
+                    case["headers"],
+                    case["matches"],
+                    case["confidence"],
+                    was_auto_approved,
+                    case.get("human_corrections"),
+                    case.get("metadata"),
+                )
+                self._update_index(case_id, case["headers"], was_auto_approved)
+                case_ids.append(case_id)
+            
+            if case_ids:
+                self._save_index()
+        return case_ids
+    
+    def _write_case(
+        self,
+        headers: List[str],
+        matches: List[Dict[str, Any]],
+        confidence: float,
+        was_auto_approved: bool,
+        human_corrections: Optional[Dict[str, str]],
+        metadata: Optional[Dict[str, Any]],
+    ) -> str:
+        """케이스 파일 저장 (인덱스는 갱신하지 않음)."""
         case_id = self._generate_case_id(headers)
         timestamp = datetime.utcnow().isoformat()
         
@@ -106,37 +195,34 @@ class CaseStore:
         with open(case_file, "w", encoding="utf-8") as f:
             json.dump(case_data, f, ensure_ascii=False, indent=2)
         
-        # 인덱스 업데이트
-        self._update_index(case_id, headers, was_auto_approved)
-        
         return case_id
     
     def _update_index(self, case_id: str, headers: List[str], was_auto_approved: bool):
-        """인덱스 업데이트."""
-        # 케이스 추가 (중복 체크)
-        existing_ids = {c["case_id"] for c in self.index["cases"]}
-        if case_id not in existing_ids:
-            self.index["cases"].append({
-                "case_id": case_id,
-                "header_count": len(headers),
-                "was_auto_approved": was_auto_approved,
-            })
-            self.index["stats"]["total_cases"] += 1
+        """메모리 인덱스 업데이트 (파일 저장은 호출자가 _save_index로)."""
+        with self._lock:
+            # 케이스 추가 (중복 체크)
+            if case_id not in self._case_ids:
+                self._case_ids.add(case_id)
+                self.index["cases"].append({
+                    "case_id": case_id,
+                    "header_count": len(headers),
+                    "was_auto_approved": was_auto_approved,
+                })
+                self.index["stats"]["total_cases"] += 1
             
-            if was_auto_approved:
-                self.index["stats"]["auto_approved"] += 1
-            else:
-                self.index["stats"]["manual_corrected"] += 1
+                if was_auto_approved:
+                    self.index["stats"]["auto_approved"] += 1
+                else:
+                    self.index["stats"]["manual_corrected"] += 1
         
-        # 헤더 패턴 매핑
-        for header in headers:
-            normalized = self._normalize_header(header)
-            if normalized not in self.index["header_patterns"]:
-                self.index["header_patterns"][normalized] = []
-            if case_id not in self.index["header_patterns"][normalized]:
-                self.index["header_patterns"][normalized].append(case_id)
-        
-        self._save_index()
+            # 헤더 패턴 매핑 (이미 있는 케이스 ID면 기존 순서 유지)
+            header_patterns = self.index["header_patterns"]
+            for header in headers:
+                normalized = self._normalize_header(header)
+                case_ids = header_patterns.get(normalized)
+                if case_ids is None:
+                    case_ids = header_patterns[normalized] = {}
+                case_ids[case_id] = None
     
     def find_similar_cases(
         self,
@@ -160,15 +246,14 @@ class CaseStore:
         
         # 각 케이스의 헤더 겹침 정도 계산
         for header in normalized_headers:
-            case_ids = self.index["header_patterns"].get(header, [])
-            for case_id in case_ids:
+            for case_id in self._pattern_case_ids(header):
                 case_scores[case_id] = case_scores.get(case_id, 0) + 1
         
         # 유사도 계산 및 정렬
         similar_cases = []
-        for case_id, overlap_count in case_scores.items():
+        loaded = self.get_cases(list(case_scores))
+        for (case_id, overlap_count), case_data in zip(case_scores.items(), loaded):
             # Jaccard-like 유사도
-            case_data = self.get_case(case_id)
             if not case_data:
                 continue
             
@@ -179,23 +264,29 @@ class CaseStore:
             if similarity >= min_overlap:
                 similar_cases.append({
                     "case_id": case_id,
-                    "similarity": round(similarity, 3),
+                    "similarity": similarity,
                     "overlap_count": overlap_count,
                     "case_data": case_data,
                 })
         
-        # 유사도 순 정렬
-        similar_cases.sort(key=lambda x: x["similarity"], reverse=True)
-        return similar_cases[:k]
+        # 유사도 상위 k개 (전체 정렬 없이 힙으로 선택, 정렬 후 자르기와 결과 동일)
+        # 원본 값으로 비교하고, 반올림은 반환하는 k개에만 한 번 적용
+        top_cases = heapq.nlargest(k, similar_cases, key=lambda x: x["similarity"])
+        for case in top_cases:
+            case["similarity"] = round(case["similarity"], 3)
+        return top_cases
     
     def get_case(self, case_id: str) -> Optional[Dict[str, Any]]:
         """케이스 조회."""
         case_file = self.store_path / f"{case_id}.json"
         if case_file.exists():
-            with open(case_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return read_json(case_file)
         return None
     
+    def get_cases(self, case_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """여러 케이스 병렬 조회 (입력 순서 유지, 없으면 None)."""
+        return read_json_many(self.store_path / f"{case_id}.json" for case_id in case_ids)
+    
     def find_by_header(self, header: str) -> List[Dict[str, Any]]:
         """
         특정 헤더를 포함하는 케이스 검색.
@@ -207,13 +298,9 @@ class CaseStore:
             해당 헤더가 있는 케이스 리스트
         """
         normalized = self._normalize_header(header)
-        case_ids = self.index["header_patterns"].get(normalized, [])
+        case_ids = self._pattern_case_ids(normalized)
         
-        cases = []
-        for case_id in case_ids:
-            case_data = self.get_case(case_id)
-            if case_data:
-                cases.append(case_data)
+        cases = [case_data for case_data in self.get_cases(case_ids) if case_data]
         
         # 최신 케이스 우선
         cases.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
@@ -282,11 +369,16 @@ class CaseStore:
 _case_store: Optional[CaseStore] = None
 
 
+_case_store_lock = threading.Lock()
+
+
 def get_case_store() -> CaseStore:
-    """글로벌 CaseStore 인스턴스."""
+    """글로벌 CaseStore 인스턴스 (여러 스레드가 동시에 처음 호출해도 하나만 생성)."""
     global _case_store
     if _case_store is None:
-        _case_store = CaseStore()
+        with _case_store_lock:
+            if _case_store is None:
+                _case_store = CaseStore()
     return _case_store
 
 
@@ -1,12 +1,13 @@
 """
 Memory & Persistence: Redis 세션 + 결정 로그 + Audit 스키마
 """
-import json
 from datetime import datetime
 from typing import Any, Dict, Optional
 
 from redis import Redis
 
+from internal.utils.json_utils import dumps, loads
+
 
 class SessionMemory:
     """Redis 기반 세션 메모리."""
@@ -22,7 +23,7 @@ class SessionMemory:
         if not self.redis:
             return False
         try:
-            self.redis.setex(f"session:{session_id}", ttl, json.dumps(data))
+            self.redis.setex(f"session:{session_id}", ttl, dumps(data))
             return True
         except Exception:
             return False
@@ -32,7 +33,7 @@ class SessionMemory:
             return None
         try:
             data = self.redis.get(f"session:{session_id}")
-            return json.loads(data) if data else None
+            return loads(data) if data else None
         except Exception:
             return None
 
@@ -64,7 +65,7 @@ class DecisionLog:
                 "session_id": session_id,
                 **decision,
             }
-            self.redis.lpush(f"decisions:{session_id}", json.dumps(entry))
+            self.redis.lpush(f"decisions:{session_id}", dumps(entry))
             return True
         except Exception:
             return False
@@ -74,7 +75,7 @@ class DecisionLog:
             return []
         try:
             raw = self.redis.lrange(f"decisions:{session_id}", 0, -1)
-            return [json.loads(r) for r in raw]
+            return [loads(r) for r in raw]
         except Exception:
             return []
 
@@ -1,15 +1,27 @@
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+import codecs
+import copy
 import csv
+import datetime
 import io
+import threading
 
 import chardet
 from openpyxl import load_workbook
 
+from internal.utils.hashing import content_hash
+
+# XLS 파싱 엔진: python-calamine(Rust 구현)이 설치되어 있으면 사용, 없으면 xlrd
+try:
+    import python_calamine  # noqa: F401
+    _XLS_ENGINE = "calamine"
+except ImportError:  # pragma: no cover - calamine 미설치 환경
+    _XLS_ENGINE = "xlrd"
+
 
 def _infer_types(rows: List[List[Any]], sample_rows: int = 200) -> Dict[int, str]:
     """간단한 컬럼 타입 추론(문자/숫자/날짜 후보)."""
-    import datetime as _dt
-
     col_types: Dict[int, str] = {}
     sample = rows[:sample_rows]
     for col_idx in range(max((len(r) for r in sample), default=0)):
@@ -19,7 +31,7 @@ def _infer_types(rows: List[List[Any]], sample_rows: int = 200) -> Dict[int, str
         for v in values:
             if isinstance(v, (int, float)):
                 num_cnt += 1
-            elif isinstance(v, _dt.date):
+            elif isinstance(v, datetime.date):
                 date_cnt += 1
             else:
                 # 숫자 문자열
@@ -37,9 +49,68 @@ def _infer_types(rows: List[List[Any]], sample_rows: int = 200) -> Dict[int, str
     return col_types
 
 
-def _parse_csv(text: str) -> Dict[str, Any]:
-    reader = csv.reader(io.StringIO(text))
-    rows: List[List[str]] = list(reader)
+# 파서 입력: 메모리 bytes 또는 바이너리 파일 객체 (예: UploadFile.file의 SpooledTemporaryFile)
+FileSource = Union[bytes, BinaryIO]
+
+
+def _as_stream(source: FileSource) -> BinaryIO:
+    """bytes는 BytesIO로 감싸고, 파일 객체는 처음으로 되감아서 그대로 사용."""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _read_signature(source: FileSource, size: int = 8) -> bytes:
+    """파일 시그니처(매직 바이트) 조회. 파일 객체는 위치를 되돌려 둠."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source[:size])
+    source.seek(0)
+    head = source.read(size)
+    source.seek(0)
+    return head
+
+
+# chardet 인코딩 감지에 사용할 최대 바이트 수 (chardet는 순수 파이썬이라 전체 파일 감지는 느림)
+_CHARDET_SAMPLE_BYTES = 64 * 1024
+
+
+def _read_csv_rows(stream: BinaryIO, encoding: str, errors: str = "strict") -> List[List[str]]:
+    """바이너리 스트림을 지정 인코딩으로 줄 단위 디코딩하며 CSV 행 읽기 (전체 텍스트 사본 없음)."""
+    stream.seek(0)
+    text_stream = io.TextIOWrapper(stream, encoding=encoding, errors=errors, newline="")
+    try:
+        return list(csv.reader(text_stream))
+    finally:
+        # 래퍼가 GC될 때 원본 스트림(업로드 임시 파일)을 닫지 않도록 분리
+        text_stream.detach()
+
+
+def _read_csv_stream(stream: BinaryIO) -> Tuple[List[List[str]], str]:
+    """CSV 스트림 디코딩+파싱. UTF-8(BOM 포함)을 먼저 시도하고, 실패하면 앞부분 샘플로 chardet 감지.
+
+    업로드 임시 파일을 bytes/str로 통째로 복사하지 않고 스트림에서 바로 읽음.
+
+    Returns:
+        (행 목록, 인코딩)
+    """
+    stream.seek(0)
+    sample = stream.read(_CHARDET_SAMPLE_BYTES)
+    if sample.startswith(codecs.BOM_UTF8):
+        return _read_csv_rows(stream, "utf-8-sig", errors="replace"), "UTF-8-SIG"
+    try:
+        return _read_csv_rows(stream, "utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    encoding = chardet.detect(sample).get("encoding") or "utf-8"
+    try:
+        return _read_csv_rows(stream, encoding, errors="replace"), encoding
+    except LookupError:
+        return _read_csv_rows(stream, "utf-8", errors="replace"), "utf-8"
+
+
+def _parse_csv(rows: List[List[str]]) -> Dict[str, Any]:
     headers = rows[0] if rows else []
     data_rows = rows[1:] if len(rows) > 1 else []
     return {
@@ -53,49 +124,57 @@ def _parse_csv(text: str) -> Dict[str, Any]:
     }
 
 
-def _parse_xlsx(file_bytes: bytes, sheet_name: Optional[str] = None, max_rows: int = 5000) -> Dict[str, Any]:
-    wb = load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
-    ws = wb[sheet_name] if sheet_name and sheet_name in wb.sheetnames else wb.active
+def _parse_xlsx(file_bytes: FileSource, sheet_name: Optional[str] = None, max_rows: int = 5000) -> Dict[str, Any]:
+    # read_only: 셀 객체 그래프를 만들지 않고 스트리밍, keep_links=False: 외부 링크 캐시 로드 생략
+    wb = load_workbook(_as_stream(file_bytes), read_only=True, data_only=True, keep_links=False)
     rows: List[List[Any]] = []
     headers: List[Any] = []
-    for idx, row in enumerate(ws.iter_rows(values_only=True)):
-        if idx == 0:
-            # 헤더 정리: 줄바꿈/공백 제거
-            headers = [
-                "" if c is None else str(c).replace('\n', ' ').replace('\r', '').strip()
-                for c in row
-            ]
-            continue
-        if max_rows and len(rows) >= max_rows:
-            break
-        rows.append(["" if c is None else c for c in row])
+    try:
+        ws = wb[sheet_name] if sheet_name and sheet_name in wb.sheetnames else wb.active
+        sheet_title = ws.title
+        for idx, row in enumerate(ws.iter_rows(values_only=True)):
+            if idx == 0:
+                # 헤더 정리: 줄바꿈/공백 제거
+                headers = [
+                    "" if c is None else str(c).replace('\n', ' ').replace('\r', '').strip()
+                    for c in row
+                ]
+                continue
+            if max_rows and len(rows) >= max_rows:
+                break
+            rows.append(["" if c is None else c for c in row])
+    finally:
+        # read_only 워크북은 닫을 때까지 아카이브 핸들을 잡고 있으므로 즉시 닫음
+        wb.close()
     return {
         "headers": headers,
         "rows": rows,
         "meta": {
             "parser": "xlsx",
             "total_rows_sampled": len(rows),
-            "sheet": ws.title,
+            "sheet": sheet_title,
             "column_types": _infer_types(rows),
             "note": f"capped at {max_rows} rows for streaming",
         },
     }
 
 
-def _parse_xls(file_bytes: bytes, sheet_name: Optional[str] = None, max_rows: int = 5000) -> Dict[str, Any]:
-    """XLS (구버전 Excel) 파싱 - pandas + xlrd 사용."""
+def _parse_xls(file_bytes: FileSource, sheet_name: Optional[str] = None, max_rows: int = 5000) -> Dict[str, Any]:
+    """XLS (구버전 Excel) 파싱 - pandas + calamine(설치 시) 또는 xlrd 사용."""
     import pandas as pd
 
-    xls = pd.ExcelFile(io.BytesIO(file_bytes), engine="xlrd")
-    target_sheet = sheet_name if sheet_name and sheet_name in xls.sheet_names else xls.sheet_names[0]
+    # 워크북을 한 번만 열어서 시트 목록 조회와 시트 파싱에 같이 사용하고, 끝나면 바로 닫음
+    with pd.ExcelFile(_as_stream(file_bytes), engine=_XLS_ENGINE) as xls:
+        sheet_names = xls.sheet_names
+        target_sheet = sheet_name if sheet_name and sheet_name in sheet_names else sheet_names[0]
 
-    # 재직자 명부 시트 자동 탐색
-    for name in xls.sheet_names:
-        if "재직자" in name and "명부" in name:
-            target_sheet = name
-            break
+        # 재직자 명부 시트 자동 탐색
+        for name in sheet_names:
+            if "재직자" in name and "명부" in name:
+                target_sheet = name
+                break
 
-    df = pd.read_excel(xls, sheet_name=target_sheet, header=0, nrows=max_rows)
+        df = xls.parse(sheet_name=target_sheet, header=0, nrows=max_rows)
     # 헤더 정리: 줄바꿈/공백 제거
     headers = [str(c).replace('\n', ' ').replace('\r', '').strip() for c in df.columns.tolist()]
     rows = df.values.tolist()
@@ -105,34 +184,79 @@ def _parse_xls(file_bytes: bytes, sheet_name: Optional[str] = None, max_rows: in
         "rows": rows,
         "meta": {
             "parser": "xls",
+            "engine": _XLS_ENGINE,
             "total_rows_sampled": len(rows),
             "sheet": target_sheet,
-            "available_sheets": xls.sheet_names,
+            "available_sheets": sheet_names,
             "column_types": _infer_types(rows),
             "note": f"capped at {max_rows} rows",
         },
     }
 
 
-def parse_roster(file_bytes: bytes, sheet_name: Optional[str] = None, max_rows: int = 5000) -> Dict[str, Any]:
+# 파싱 결과 캐시 (같은 파일 재업로드 시 재파싱 생략, 파이프라인이 스레드에서 돌므로 락으로 보호)
+_PARSE_CACHE_SIZE = 32
+_parse_cache: "OrderedDict[Tuple[str, Optional[str], int], Dict[str, Any]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def clear_parse_cache() -> None:
+    """파싱 결과 캐시 비우기."""
+    with _parse_cache_lock:
+        _parse_cache.clear()
+
+
+def parse_roster(
+    file_bytes: FileSource,
+    sheet_name: Optional[str] = None,
+    max_rows: int = 5000,
+    digest: Optional[str] = None,
+) -> Dict[str, Any]:
     """CSV/xlsx/xls 파서 (스트리밍 샘플 기반).
 
     - xlsx: read_only 모드로 최대 max_rows 샘플링, 시트 선택 지원.
-    - xls: pandas + xlrd로 구버전 Excel 지원.
+    - xls: pandas + calamine(설치 시, 없으면 xlrd)으로 구버전 Excel 지원.
     - csv: chardet로 인코딩 감지 후 파싱.
+
+    file_bytes에는 bytes 대신 바이너리 파일 객체도 전달 가능.
+    이 경우 Excel은 전체를 메모리로 읽지 않고 파일에서 직접 파싱.
+
+    같은 내용의 파일은 내용 해시 기준 LRU 캐시에서 결과 사본을 반환.
+    digest: 호출자가 이미 계산한 content_hash() 값 (있으면 해시 재계산 생략)
     """
+    cache_key = (digest or content_hash(file_bytes), sheet_name, max_rows)
+    with _parse_cache_lock:
+        cached = _parse_cache.get(cache_key)
+        if cached is not None:
+            _parse_cache.move_to_end(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    parsed = _parse_roster_uncached(file_bytes, sheet_name=sheet_name, max_rows=max_rows)
+
+    # 호출자가 결과를 수정해도 캐시가 오염되지 않도록 사본 저장
+    cached = copy.deepcopy(parsed)
+    with _parse_cache_lock:
+        _parse_cache[cache_key] = cached
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return parsed
+
+
+def _parse_roster_uncached(file_bytes: FileSource, sheet_name: Optional[str] = None, max_rows: int = 5000) -> Dict[str, Any]:
+    """형식 감지 후 실제 파싱 (캐시 미사용)."""
+    signature = _read_signature(file_bytes)
+
     # xlsx는 ZIP(0x50 0x4B) 시그니처
-    if file_bytes[:2] == b"PK":
+    if signature[:2] == b"PK":
         return _parse_xlsx(file_bytes, sheet_name=sheet_name, max_rows=max_rows)
 
     # xls는 OLE2 (0xD0 0xCF) 시그니처
-    if file_bytes[:2] == b"\xd0\xcf":
+    if signature[:2] == b"\xd0\xcf":
         return _parse_xls(file_bytes, sheet_name=sheet_name, max_rows=max_rows)
 
-    # 나머지는 CSV로 시도
-    detected = chardet.detect(file_bytes)
-    encoding = detected.get("encoding") or "utf-8"
-    text = file_bytes.decode(encoding, errors="replace")
-    parsed = _parse_csv(text)
+    # 나머지는 CSV로 시도 (파일 객체는 그대로 스트리밍 디코딩)
+    rows, encoding = _read_csv_stream(_as_stream(file_bytes))
+    parsed = _parse_csv(rows)
     parsed["meta"]["encoding"] = encoding
     return parsed
@@ -1,7 +1,8 @@
 """
 표준 데이터 스키마 정의 (v2에서 이식)
 """
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
 STANDARD_SCHEMA: Dict[str, Dict[str, Any]] = {
     "사원번호": {
@@ -167,12 +168,18 @@ STANDARD_SCHEMA: Dict[str, Dict[str, Any]] = {
 }
 
 
-def get_required_fields(sheet_type: str = "재직자") -> List[str]:
-    return [
+@lru_cache(maxsize=None)
+def _required_fields(sheet_type: str) -> Tuple[str, ...]:
+    """시트 유형별 필수 필드 (스키마는 정적이므로 한 번만 계산해서 튜플로 보관)."""
+    return tuple(
         name
         for name, schema in STANDARD_SCHEMA.items()
         if schema.get("required") and schema.get("sheet") == sheet_type
-    ]
+    )
+
+
+def get_required_fields(sheet_type: str = "재직자") -> List[str]:
+    return list(_required_fields(sheet_type))
 
 
 def get_all_aliases(field_name: str) -> List[str]:
@@ -182,12 +189,19 @@ def get_all_aliases(field_name: str) -> List[str]:
     return [field_name] + schema.get("aliases", [])
 
 
-def find_field_by_alias(alias: str) -> str:
-    alias_lower = alias.lower().strip()
+def _build_alias_index() -> Dict[str, str]:
+    """소문자 필드명/별칭 → 표준 필드명. 스키마 순서상 먼저 나온 필드가 우선."""
+    index: Dict[str, str] = {}
     for field_name, schema in STANDARD_SCHEMA.items():
-        if field_name.lower() == alias_lower:
-            return field_name
+        index.setdefault(field_name.lower(), field_name)
         for a in schema.get("aliases", []):
-            if a.lower() == alias_lower:
-                return field_name
-    return None
+            index.setdefault(a.lower(), field_name)
+    return index
+
+
+# 별칭 조회용 인덱스 (호출마다 스키마 전체를 순회하지 않도록 모듈 로드 시 한 번만 생성)
+_ALIAS_INDEX = _build_alias_index()
+
+
+def find_field_by_alias(alias: str) -> Optional[str]:
+    return _ALIAS_INDEX.get(alias.lower().strip())
@@ -1,43 +1,137 @@
 from __future__ import annotations
 
+import heapq
 import os
-import uuid
-from typing import Dict, List, Literal, Optional
+import secrets
+import time
+from collections import OrderedDict
+from typing import Dict, List, Literal, Optional, Tuple
 
 from redis import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 from rq import Queue, Retry
 from rq.job import Job
 
 JobStatus = Literal["queued", "running", "completed", "failed"]
 
 # 인메모리 백업 스토어 (Redis/RQ 미사용 시)
-_JOB_STORE: Dict[str, Dict] = {}
+# OrderedDict로 최근 사용 순서 유지 → 한도 초과 시 가장 오래된 작업을 O(1)로 제거
+_MAX_JOBS = 1000
+_JOB_STORE: "OrderedDict[str, Dict]" = OrderedDict()
+
+# 작업 보관 기간 (초). 만료 시각 최소 힙으로 실제 만료된 작업만 꺼내서 삭제 (전체 스캔 없음)
+_JOB_TTL_SECONDS = 24 * 60 * 60
+_JOB_EXPIRY: List[Tuple[float, str]] = []
+
+
+# 요청 경로에서 한 번에 정리할 최대 만료 항목 수 (Redis active expire처럼 호출당 작업량 제한)
+_EXPIRE_BATCH = 20
+
+
+def _evict_expired(now: Optional[float] = None, limit: Optional[int] = _EXPIRE_BATCH) -> int:
+    """
+    만료된 인메모리 작업 제거. 제거한 개수 반환.
+
+    한꺼번에 많은 작업이 만료돼도 한 요청이 전부 떠안지 않도록 limit개까지만 처리하고,
+    나머지는 다음 호출에서 이어서 정리. limit=None이면 만료된 항목을 모두 정리.
+    """
+    now = time.monotonic() if now is None else now
+    removed = 0
+    popped = 0
+    while _JOB_EXPIRY and _JOB_EXPIRY[0][0] <= now and (limit is None or popped < limit):
+        popped += 1
+        _, job_id = heapq.heappop(_JOB_EXPIRY)
+        # LRU로 이미 밀려난 작업은 힙에만 남아 있을 수 있음
+        if _JOB_STORE.pop(job_id, None) is not None:
+            removed += 1
+    return removed
+
+
+def _compact_expiry_heap() -> None:
+    """
+    LRU로 밀려난 작업의 만료 항목 정리.
+
+    밀려난 작업은 만료 시각까지 힙에 남으므로, 힙이 스토어의 2배를 넘을 때만
+    살아 있는 항목만 한 번에 걸러서 다시 힙으로 만듦 (분할 상환 O(1)).
+    """
+    if len(_JOB_EXPIRY) <= 2 * _MAX_JOBS:
+        return
+    _JOB_EXPIRY[:] = [entry for entry in _JOB_EXPIRY if entry[1] in _JOB_STORE]
+    heapq.heapify(_JOB_EXPIRY)
+
+
+def cleanup_expired_jobs() -> int:
+    """만료된 인메모리 작업 전체 정리 (주기 작업/관리용)."""
+    return _evict_expired(limit=None)
+
+
+# Redis 큐는 프로세스당 하나만 만들어서 재사용 (요청마다 연결 생성 + ping 왕복 없음)
+_queue: Optional[Queue] = None
+# 연결 실패 후 재시도까지 대기 시간 (초). 그동안은 바로 인메모리 폴백
+_QUEUE_RETRY_SECONDS = 30.0
+_queue_retry_at = 0.0
 
 
 def _get_queue() -> Optional[Queue]:
-    """Redis 큐 연결 시도. 실패하면 None 반환."""
+    """Redis 큐 연결 (첫 사용 시 연결 후 재사용). 실패하면 None 반환."""
+    global _queue, _queue_retry_at
+    if _queue is not None:
+        return _queue
+    now = time.monotonic()
+    if now < _queue_retry_at:
+        return None
     redis_url = os.getenv("REDIS_URL") or "redis://localhost:6379/0"
     try:
         conn = Redis.from_url(redis_url)
         # 실제 연결 테스트
         conn.ping()
-        return Queue("wikisoft3", connection=conn, default_timeout=600)
+        _queue = Queue("wikisoft3", connection=conn, default_timeout=600)
     except Exception:  # noqa: BLE001
+        _queue_retry_at = now + _QUEUE_RETRY_SECONDS
         return None
+    return _queue
+
+
+def _drop_queue() -> None:
+    """
+    캐시된 큐 연결 폐기 (Redis 연결이 끊긴 경우).
 
+    끊긴 큐를 계속 재사용하면 인메모리 폴백 작업이 조회되지 않으므로,
+    재시도 대기 시간 동안은 인메모리 스토어를 사용하고 이후 다시 연결 시도.
+    """
+    global _queue, _queue_retry_at
+    _queue = None
+    _queue_retry_at = time.monotonic() + _QUEUE_RETRY_SECONDS
 
-def enqueue_jobs(file_names: List[str]) -> str:
-    """작업 큐에 등록. Redis 없으면 인메모리 폴백."""
+
+def enqueue_jobs(file_names: List[str], parsed_files: Optional[List[Dict]] = None) -> str:
+    """
+    작업 큐에 등록. Redis 없으면 인메모리 폴백.
+
+    parsed_files: 업로드 시 파싱한 결과 (file_names와 같은 순서). 워커는 별도 프로세스라
+    파서 캐시를 공유하지 않으므로 파싱 결과를 작업 인자로 그대로 전달.
+    """
     q = _get_queue()
     if q:
         try:
-            job = q.enqueue("internal.queue.worker.process_batch", file_names, retry=Retry(max=1, interval=[10]))
+            job = q.enqueue(
+                "internal.queue.worker.process_batch",
+                file_names,
+                parsed_files=parsed_files,
+                retry=Retry(max=1, interval=[10]),
+            )
             return job.get_id()
+        except (RedisConnectionError, RedisTimeoutError):
+            _drop_queue()  # Redis 연결 실패 시 폴백
         except Exception:  # noqa: BLE001
-            pass  # Redis 연결 실패 시 폴백
+            pass
 
     # 인메모리 폴백
-    job_id = f"job-{uuid.uuid4()}"
+    now = time.monotonic()
+    _evict_expired(now)
+    # 외부에 노출되는 ID라 추측 불가능해야 함 (uuid4 객체 생성/포맷 없이 128비트 난수 hex)
+    job_id = f"job-{secrets.token_hex(16)}"
     _JOB_STORE[job_id] = {
         "status": "queued",
         "files": file_names,
@@ -45,6 +139,10 @@ def enqueue_jobs(file_names: List[str]) -> str:
         "result": None,
         "error": None,
     }
+    heapq.heappush(_JOB_EXPIRY, (now + _JOB_TTL_SECONDS, job_id))
+    if len(_JOB_STORE) > _MAX_JOBS:
+        _JOB_STORE.popitem(last=False)
+        _compact_expiry_heap()
     return job_id
 
 
@@ -60,9 +158,15 @@ def get_job(job_id: str) -> Dict | None:
                 "error": job.meta.get("error"),
                 "files": job.meta.get("files"),
             }
+        except (RedisConnectionError, RedisTimeoutError):
+            _drop_queue()
         except Exception:  # noqa: BLE001
-            return None
-    return _JOB_STORE.get(job_id)
+            pass  # Redis에 없는 작업 → Redis 장애 중 인메모리로 등록된 작업일 수 있음
+    _evict_expired()
+    job = _JOB_STORE.get(job_id)
+    if job is not None:
+        _JOB_STORE.move_to_end(job_id)
+    return job
 
 
 def update_job(job_id: str, status: JobStatus, progress: int = 0, result=None, error=None) -> None:
@@ -81,12 +185,15 @@ def update_job(job_id: str, status: JobStatus, progress: int = 0, result=None, e
                 if status == "failed" and error:
                     job._exc_info = str(error)  # noqa: SLF001
                 job.save()
+            return
+        except (RedisConnectionError, RedisTimeoutError):
+            _drop_queue()
         except Exception:  # noqa: BLE001
-            pass
-        return
+            pass  # Redis에 없는 작업 → 인메모리 스토어에서 갱신
 
     if job_id not in _JOB_STORE:
         return
+    _JOB_STORE.move_to_end(job_id)
     _JOB_STORE[job_id].update({
         "status": status,
         "progress": progress,
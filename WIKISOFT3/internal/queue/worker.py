@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import List
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
 from rq import get_current_job
 
@@ -8,14 +11,60 @@ from internal.agent.confidence import detect_anomalies, estimate_confidence
 from internal.agent.tool_registry import get_registry
 from internal.memory.persistence import DecisionLog, SessionMemory
 
+# 배치 내 동시 처리 파일 수 (파일별 매칭의 LLM 호출 대기 시간을 겹침)
+_FILE_CONCURRENCY = 4
 
-def process_batch(file_names: List[str], session_id: str = None) -> dict:
-    """RQ 워커: 파일 배치 처리 (파서→매칭→검증→리포트)."""
-    import uuid
 
+def _process_file(
+    registry, file_name: str, parsed: Optional[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """파일 하나 처리 (업로드 시 파싱된 결과 사용) → (결과, 결정 로그 항목). 워커 스레드에서 실행."""
+    try:
+        if parsed is None:
+            raise ValueError("parsed data missing for file")
+        matches = registry.call_tool("match_headers", parsed=parsed, sheet_type="재직자")
+        validation = registry.call_tool("validate", parsed=parsed, matches=matches)
+        confidence = estimate_confidence(parsed, matches, validation)
+        anomalies = detect_anomalies(parsed, matches, validation)
+        registry.call_tool("generate_report", validation=validation)
+
+        decision = {
+            "file": file_name,
+            "confidence": confidence["score"],
+            "anomalies": anomalies["detected"],
+            "recommendation": anomalies["recommendation"],
+        }
+        result = {
+            "file": file_name,
+            "status": "success",
+            "confidence": round(confidence["score"], 3),
+            "has_issues": anomalies["detected"],
+        }
+        return result, decision
+
+    except Exception as e:  # noqa: BLE001
+        decision = {
+            "file": file_name,
+            "status": "error",
+            "error": str(e),
+        }
+        result = {
+            "file": file_name,
+            "status": "error",
+            "error": str(e),
+        }
+        return result, decision
+
+
+def process_batch(
+    file_names: List[str],
+    session_id: str = None,
+    parsed_files: Optional[List[Dict[str, Any]]] = None,
+) -> dict:
+    """RQ 워커: 파일 배치 처리 (업로드 시 파싱된 결과 → 매칭→검증→리포트)."""
     job = get_current_job()
     if not session_id:
-        session_id = f"batch-{uuid.uuid4()}"
+        session_id = f"batch-{secrets.token_hex(16)}"
     if job:
         job.meta["files"] = file_names
         job.meta["session_id"] = session_id
@@ -26,47 +75,25 @@ def process_batch(file_names: List[str], session_id: str = None) -> dict:
     session_mem = SessionMemory()
     decision_log = DecisionLog()
     total = len(file_names)
-    results = []
-
-    for idx, file_name in enumerate(file_names, start=1):
-        try:
-            file_bytes = b""  # TODO: 파일 로드 (S3/로컬 등)
-            parsed = registry.call_tool("parse_roster", file_bytes=file_bytes)
-            matches = registry.call_tool("match_headers", parsed=parsed, sheet_type="재직자")
-            validation = registry.call_tool("validate", parsed=parsed, matches=matches)
-            confidence = estimate_confidence(parsed, matches, validation)
-            anomalies = detect_anomalies(parsed, matches, validation)
-            report = registry.call_tool("generate_report", validation=validation)
-
-            decision_log.log_decision(session_id, {
-                "file": file_name,
-                "confidence": confidence["score"],
-                "anomalies": anomalies["detected"],
-                "recommendation": anomalies["recommendation"],
-            })
-
-            results.append({
-                "file": file_name,
-                "status": "success",
-                "confidence": round(confidence["score"], 3),
-                "has_issues": anomalies["detected"],
-            })
+    results: List[Dict[str, Any]] = []
+    processed = 0  # 성공 건수 (루프 안에서 집계 → 요약 시 results 재순회 없음)
+    if parsed_files is None:
+        parsed_files = [None] * total
 
-        except Exception as e:  # noqa: BLE001
-            decision_log.log_decision(session_id, {
-                "file": file_name,
-                "status": "error",
-                "error": str(e),
-            })
-            results.append({
-                "file": file_name,
-                "status": "error",
-                "error": str(e),
-            })
+    # 파일끼리는 독립이므로 동시에 처리 (순차 처리 시 파일 수만큼 LLM 왕복 시간이 누적됨)
+    # map은 입력 순서대로 결과를 돌려주므로 결과 목록/결정 로그 순서 유지,
+    # 결정 로그/진행률 기록은 이 스레드에서만 수행 (케이스 저장소는 자체 락으로 보호)
+    with ThreadPoolExecutor(max_workers=max(1, min(_FILE_CONCURRENCY, total)), thread_name_prefix="batch-file") as executor:
+        outcomes = executor.map(partial(_process_file, registry), file_names, parsed_files)
+        for done, (result, decision) in enumerate(outcomes, start=1):
+            results.append(result)
+            if result["status"] == "success":
+                processed += 1
+            decision_log.log_decision(session_id, decision)
 
-        if job:
-            job.meta["progress"] = int(idx / total * 100)
-            job.save_meta()
+            if job:
+                job.meta["progress"] = int(done / total * 100)
+                job.save_meta()
 
     session_mem.save_session(session_id, {
         "files": file_names,
@@ -76,7 +103,7 @@ def process_batch(file_names: List[str], session_id: str = None) -> dict:
 
     return {
         "session_id": session_id,
-        "processed": len([r for r in results if r["status"] == "success"]),
-        "errors": len([r for r in results if r["status"] == "error"]),
+        "processed": processed,
+        "errors": len(results) - processed,
         "files": results,
     }
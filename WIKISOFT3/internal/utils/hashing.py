@@ -0,0 +1,30 @@
+"""
+파일 내용 해시 유틸리티
+
+- 파서 캐시 키, 업로드 검증 중 해시, 검증 결과 ETag가 모두 같은 해시 값을 쓰도록 한 곳에서 정의
+"""
+
+import hashlib
+from typing import BinaryIO, Union
+
+# 파일 객체 해시 계산 시 읽기 단위 (1MB)
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def new_content_hasher() -> hashlib.blake2b:
+    """content_hash()와 같은 해시 객체 (업로드를 읽으면서 청크를 직접 넣을 때 사용)."""
+    return hashlib.blake2b(digest_size=16)
+
+
+def content_hash(source: Union[bytes, BinaryIO]) -> str:
+    """파일 내용 해시 (blake2b). 파일 객체는 청크 단위로 읽고 처음으로 되감아 둠."""
+    if isinstance(source, (bytes, bytearray)):
+        h = new_content_hasher()
+        h.update(source)
+        return h.hexdigest()
+    h = new_content_hasher()
+    source.seek(0)
+    for chunk in iter(lambda: source.read(_HASH_CHUNK_SIZE), b""):
+        h.update(chunk)
+    source.seek(0)
+    return h.hexdigest()
@@ -0,0 +1,95 @@
+"""
+JSON 유틸리티 모듈
+
+- orjson이 설치되어 있으면 사용 (Rust 구현, 역직렬화 1.5~2배 빠름)
+- 없으면 표준 json으로 폴백
+- API 응답 직렬화 (bytes 반환)
+- 여러 JSON 파일 병렬 읽기 (파일 I/O 지연 겹치기)
+- LLM 응답(```json 코드 블록) 파싱 헬퍼
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Union
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+    _loads = json.loads
+
+
+def dumps(obj: Any) -> bytes:
+    """JSON 직렬화 (UTF-8 바이트, dict의 비문자열 키와 numpy 값 허용, 그 외 타입은 str)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """JSON 문자열/바이트 파싱."""
+    return _loads(data)
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """JSON 파일을 바이트로 읽어서 파싱 (텍스트 디코딩 단계 생략)."""
+    return _loads(Path(path).read_bytes())
+
+
+def _read_json_or_none(path: Union[str, Path]) -> Optional[Any]:
+    try:
+        return read_json(path)
+    except FileNotFoundError:
+        return None
+
+
+# 병렬 읽기용 스레드 풀 (첫 사용 시 생성 후 프로세스 전체에서 재사용 → 호출마다 스레드 생성/종료 없음)
+_READ_POOL_WORKERS = 16
+_read_pool: Optional[ThreadPoolExecutor] = None
+_read_pool_lock = threading.Lock()
+
+
+def _get_read_pool() -> ThreadPoolExecutor:
+    global _read_pool
+    if _read_pool is None:
+        with _read_pool_lock:
+            if _read_pool is None:
+                _read_pool = ThreadPoolExecutor(max_workers=_READ_POOL_WORKERS, thread_name_prefix="json-read")
+    return _read_pool
+
+
+def read_json_many(paths: Iterable[Union[str, Path]]) -> List[Optional[Any]]:
+    """
+    여러 JSON 파일을 공유 스레드 풀로 병렬 읽기.
+
+    파일 I/O와 orjson 파싱 중에는 GIL이 풀리므로 작은 파일 다수를 읽을 때 유리.
+
+    Returns:
+        입력 순서와 같은 결과 리스트 (없는 파일은 None)
+    """
+    paths = list(paths)
+    if len(paths) <= 1:
+        return [_read_json_or_none(p) for p in paths]
+
+    return list(_get_read_pool().map(_read_json_or_none, paths))
+
+
+def parse_llm_json(text: str) -> Any:
+    """
+    LLM 응답 텍스트에서 JSON 파싱.
+
+    ```json ... ``` 코드 블록으로 감싸진 응답도 처리.
+
+    Raises:
+        ValueError: JSON 형식이 아닌 경우 (json.JSONDecodeError 포함)
+    """
+    response_text = text.strip()
+    if response_text.startswith("```"):
+        response_text = response_text.split("```")[1]
+        if response_text.startswith("json"):
+            response_text = response_text[4:]
+
+    return _loads(response_text.encode())
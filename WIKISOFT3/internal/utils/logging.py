@@ -9,8 +9,9 @@
 import logging
 import json
 import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, Optional
 from functools import wraps
 from contextlib import contextmanager
 import traceback
@@ -105,35 +106,44 @@ class JsonFormatter(logging.Formatter):
 class MetricsCollector:
     """성능 메트릭 수집기"""
     
+    # 메트릭별 최근 기록 보관 개수
+    WINDOW_SIZE = 1000
+    
     def __init__(self):
-        self._metrics: Dict[str, list] = {}
+        self._metrics: Dict[str, Deque[Dict[str, Any]]] = {}
+        # 메트릭별 보관 중인 값의 합계 (평균 계산 시 전체 재순회 없음)
+        self._sums: Dict[str, float] = {}
     
     def record(self, metric_name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """메트릭 기록"""
-        if metric_name not in self._metrics:
-            self._metrics[metric_name] = []
+        series = self._metrics.get(metric_name)
+        if series is None:
+            # 최근 WINDOW_SIZE개만 유지 (가득 차면 가장 오래된 기록이 자동으로 빠짐)
+            series = self._metrics[metric_name] = deque(maxlen=self.WINDOW_SIZE)
+            self._sums[metric_name] = 0.0
         
-        self._metrics[metric_name].append({
+        if len(series) == series.maxlen:
+            self._sums[metric_name] -= series[0]["value"]
+        # 기록 시각은 epoch 초(float) 그대로 보관 (기록마다 ISO 문자열 포맷/할당 없음)
+        series.append({
             "value": value,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time(),
             "tags": tags or {}
         })
-        
-        # 최근 1000개만 유지
-        if len(self._metrics[metric_name]) > 1000:
-            self._metrics[metric_name] = self._metrics[metric_name][-1000:]
+        self._sums[metric_name] += value
     
     def get_summary(self, metric_name: str) -> Dict[str, Any]:
         """메트릭 요약"""
-        if metric_name not in self._metrics or not self._metrics[metric_name]:
+        series = self._metrics.get(metric_name)
+        if not series:
             return {"count": 0}
         
-        values = [m["value"] for m in self._metrics[metric_name]]
+        values = [m["value"] for m in series]
         return {
             "count": len(values),
             "min": min(values),
             "max": max(values),
-            "avg": sum(values) / len(values),
+            "avg": self._sums[metric_name] / len(values),
             "last": values[-1]
         }
     
@@ -6,9 +6,17 @@
 - Rate Limiting 헬퍼
 """
 
+import atexit
+import hmac
+import logging
+import os
+import queue
 import re
-from typing import Optional, Tuple
-from fastapi import UploadFile, HTTPException, status
+from logging.handlers import QueueHandler, QueueListener
+from typing import BinaryIO, Optional, Tuple
+from fastapi import Header, UploadFile, HTTPException, status
+
+from internal.utils.hashing import new_content_hasher
 
 
 # ============================================================
@@ -30,23 +38,51 @@ ALLOWED_MIME_TYPES = {
 # 최대 파일 크기 (10MB)
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
+# 업로드 읽기 단위 (1MB)
+READ_CHUNK_SIZE = 1024 * 1024
+
+# 시그니처 검사에 쓰는 앞부분 크기 (CSV는 앞 1000바이트를 텍스트로 디코딩해 확인)
+_SIGNATURE_SAMPLE_SIZE = 1000
+
 # 최대 행 수 (DoS 방지)
 MAX_ROW_COUNT = 100_000
 
 
-async def validate_upload_file(file: UploadFile) -> Tuple[bytes, str]:
+async def validate_upload_stream(file: UploadFile) -> Tuple[BinaryIO, str, int]:
     """
-    업로드된 파일 검증.
+    업로드된 파일 검증 (내용을 메모리에 모으지 않음).
+    
+    크기는 UploadFile.size(수신 시 기록된 값)로 확인하고, 없으면 청크 단위로 세면서
+    앞부분(시그니처 검사용)만 보관한 뒤, 처음으로 되감은 파일 객체(UploadFile.file)를 그대로 반환.
+    파서가 파일 객체를 직접 읽으므로 업로드 전체 bytes 복사본이 생기지 않음.
     
     Args:
         file: FastAPI UploadFile
     
     Returns:
-        (파일 바이트, 파일명)
+        (파일 객체, 파일명, 크기)
     
     Raises:
         HTTPException: 검증 실패 시
     """
+    source, filename, total, _ = await _validate_upload(file, hash_content=False)
+    return source, filename, total
+
+
+async def validate_upload_stream_with_digest(file: UploadFile) -> Tuple[BinaryIO, str, int, str]:
+    """
+    validate_upload_stream + 내용 해시 (hashing.content_hash와 같은 값).
+    
+    크기 확인/시그니처 검사와 해시 계산을 같은 청크 읽기 한 번으로 처리
+    (검증 후 해시를 위해 파일을 처음부터 다시 읽지 않음).
+    
+    Returns:
+        (파일 객체, 파일명, 크기, 내용 해시)
+    """
+    return await _validate_upload(file, hash_content=True)
+
+
+async def _validate_upload(file: UploadFile, hash_content: bool) -> Tuple[BinaryIO, str, int, Optional[str]]:
     if not file or not file.filename:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -69,28 +105,77 @@ async def validate_upload_file(file: UploadFile) -> Tuple[bytes, str]:
         pass
     
     # 3. 파일 크기 검증
-    file_bytes = await file.read()
-    
-    if len(file_bytes) > MAX_FILE_SIZE:
+    await file.seek(0)
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        # 업로드 수신 시 기록된 크기로 읽기 전에 거부
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"파일 크기가 너무 큽니다. 최대: {MAX_FILE_SIZE // (1024*1024)}MB"
         )
     
-    if len(file_bytes) == 0:
+    hasher = new_content_hasher() if hash_content else None
+    if file.size is not None and hasher is None:
+        # 업로드 수신 시 기록된 크기를 사용 (파일 전체를 다시 읽지 않고 앞부분만 읽음)
+        total = file.size
+        head = await file.read(_SIGNATURE_SAMPLE_SIZE)
+    else:
+        # 크기 정보가 없거나 해시가 필요하면 청크 단위로 읽다가 한도를 넘으면 즉시 중단, 앞부분만 보관
+        head = b""
+        total = 0
+        while True:
+            chunk = await file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            if len(head) < _SIGNATURE_SAMPLE_SIZE:
+                head += chunk[:_SIGNATURE_SAMPLE_SIZE - len(head)]
+            total += len(chunk)
+            if total > MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"파일 크기가 너무 큽니다. 최대: {MAX_FILE_SIZE // (1024*1024)}MB"
+                )
+            if hasher is not None:
+                hasher.update(chunk)
+    
+    if total == 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="빈 파일입니다."
         )
     
     # 4. 매직 바이트 검증 (파일 시그니처)
-    if not _validate_magic_bytes(file_bytes, ext):
+    if not _validate_magic_bytes(head, ext):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="파일 내용이 확장자와 일치하지 않습니다."
         )
     
-    return file_bytes, file.filename
+    await file.seek(0)
+    return file.file, file.filename, total, hasher.hexdigest() if hasher is not None else None
+
+
+async def validate_upload_file(file: UploadFile) -> Tuple[bytes, str]:
+    """
+    업로드된 파일 검증 후 전체 bytes 반환.
+    
+    Args:
+        file: FastAPI UploadFile
+    
+    Returns:
+        (파일 바이트, 파일명)
+    
+    Raises:
+        HTTPException: 검증 실패 시
+    """
+    _, filename, _ = await validate_upload_stream(file)
+    return await file.read(), filename
+
+
+# 확장자별 매직 바이트 (파일 시그니처)
+_MAGIC_BYTES = {
+    '.xlsx': b'PK\x03\x04',  # ZIP 기반
+    '.xls': b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',  # OLE2
+}
 
 
 def _validate_magic_bytes(data: bytes, ext: str) -> bool:
@@ -98,13 +183,10 @@ def _validate_magic_bytes(data: bytes, ext: str) -> bool:
     if len(data) < 4:
         return False
     
-    # XLSX (ZIP 기반)
-    if ext == '.xlsx':
-        return data[:4] == b'PK\x03\x04'
-    
-    # XLS (OLE2)
-    if ext == '.xls':
-        return data[:8] == b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+    # Excel: 시그니처 테이블 조회 한 번으로 검사
+    magic = _MAGIC_BYTES.get(ext)
+    if magic is not None:
+        return data.startswith(magic)
     
     # CSV (텍스트)
     if ext == '.csv':
@@ -122,6 +204,45 @@ def _validate_magic_bytes(data: bytes, ext: str) -> bool:
     return True
 
 
+# ============================================================
+# 워커 웹훅 인증
+# ============================================================
+
+# 배치 워커 → API 웹훅 토큰 (설정된 경우에만 검사). 모듈 로드 시 한 번만 인코딩
+_WEBHOOK_TOKEN_BYTES: Optional[bytes] = os.getenv("BATCH_WEBHOOK_TOKEN", "").encode() or None
+
+# Authorization 헤더 접두어 (대소문자 흔한 형태만 허용)
+_BEARER_PREFIXES = frozenset({"Bearer ", "bearer ", "BEARER "})
+
+
+def verify_webhook_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    웹훅 요청의 Bearer 토큰 검증 (FastAPI 의존성).
+    
+    BATCH_WEBHOOK_TOKEN이 설정되지 않았으면 검사하지 않음.
+    
+    Raises:
+        HTTPException: 토큰이 없거나 일치하지 않는 경우 (401)
+    """
+    if _WEBHOOK_TOKEN_BYTES is None:
+        return
+    
+    # 접두어 비교 + 슬라이스로 토큰 추출 (split 리스트 생성 없음)
+    if not authorization or authorization[:7] not in _BEARER_PREFIXES:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Bearer 토큰이 필요합니다."
+        )
+    token = authorization[7:].strip()
+    
+    # 상수 시간 비교 (타이밍 공격 방지)
+    if not hmac.compare_digest(token.encode(), _WEBHOOK_TOKEN_BYTES):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="유효하지 않은 토큰입니다."
+        )
+
+
 # ============================================================
 # 개인정보 마스킹
 # ============================================================
@@ -177,6 +298,13 @@ def mask_sensitive_data(text: str, mask_char: str = '*') -> str:
     return result
 
 
+# 기본 마스킹 필드 (소문자, 비교용)
+_DEFAULT_MASK_FIELDS = frozenset({
+    '이름', '성명', 'name', '전화번호', 'phone', '휴대폰',
+    '이메일', 'email', '주민등록번호', 'ssn', '주소', 'address'
+})
+
+
 def mask_dict_values(data: dict, fields_to_mask: set = None) -> dict:
     """
     딕셔너리의 특정 필드 값 마스킹.
@@ -191,25 +319,29 @@ def mask_dict_values(data: dict, fields_to_mask: set = None) -> dict:
     if not data:
         return data
     
-    # 기본 마스킹 필드
-    default_fields = {
-        '이름', '성명', 'name', '전화번호', 'phone', '휴대폰',
-        '이메일', 'email', '주민등록번호', 'ssn', '주소', 'address'
-    }
-    fields = fields_to_mask or default_fields
+    # 필드명 소문자 집합은 호출당 한 번만 만들고 중첩 dict 재귀에도 그대로 전달
+    fields = frozenset(f.lower() for f in fields_to_mask) if fields_to_mask else _DEFAULT_MASK_FIELDS
+    return _mask_dict_values(data, fields)
+
+
+def _mask_dict_values(data: dict, fields: frozenset) -> dict:
+    """mask_dict_values 본체 (fields는 소문자 필드명 집합)."""
+    if not data:
+        return data
     
     result = {}
     for key, value in data.items():
+        masked = key.lower() in fields
         if isinstance(value, dict):
-            result[key] = mask_dict_values(value, fields)
+            result[key] = _mask_dict_values(value, fields)
         elif isinstance(value, list):
             result[key] = [
-                mask_dict_values(item, fields) if isinstance(item, dict)
-                else mask_sensitive_data(str(item)) if key.lower() in {f.lower() for f in fields}
+                _mask_dict_values(item, fields) if isinstance(item, dict)
+                else mask_sensitive_data(str(item)) if masked
                 else item
                 for item in value
             ]
-        elif key.lower() in {f.lower() for f in fields}:
+        elif masked:
             result[key] = mask_sensitive_data(str(value)) if value else value
         else:
             result[key] = value
@@ -221,34 +353,59 @@ def mask_dict_values(data: dict, fields_to_mask: set = None) -> dict:
 # 보안 로거
 # ============================================================
 
+class _MaskingFilter(logging.Filter):
+    """
+    로그 레코드 메시지 마스킹 필터.
+
+    레벨이 켜진 레코드에만 실행되며, 인자까지 채운 메시지를 마스킹 (인자로 넘긴 개인정보도 가려지도록).
+    포맷팅에 실패하는 레코드(인자 불일치 등)는 그대로 두어 핸들러의 기본 오류 처리(handleError)에 맡김.
+    """
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        try:
+            message = record.getMessage()
+        except (TypeError, ValueError):
+            return True
+        record.msg = mask_sensitive_data(message)
+        record.args = ()
+        return True
+
+
 class SecureLogger:
     """개인정보 마스킹이 적용된 로거."""
     
     def __init__(self, name: str = "wikisoft"):
-        import logging
         self.logger = logging.getLogger(name)
         if not self.logger.handlers:
             handler = logging.StreamHandler()
             handler.setFormatter(logging.Formatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             ))
-            self.logger.addHandler(handler)
+            # 실제 출력(I/O)은 별도 스레드에서 처리 → async 핸들러에서 로그를 남겨도 이벤트 루프가 막히지 않음
+            log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            self._listener = QueueListener(log_queue, handler)
+            self._listener.start()
+            atexit.register(self._listener.stop)
+            self.logger.addHandler(QueueHandler(log_queue))
             self.logger.setLevel(logging.INFO)
+        if not any(isinstance(f, _MaskingFilter) for f in self.logger.filters):
+            self.logger.addFilter(_MaskingFilter())
     
-    def _mask(self, msg: str) -> str:
-        return mask_sensitive_data(str(msg))
+    def _log(self, level: int, msg: str, args: tuple):
+        # 포맷팅은 logging에 맡김 (레벨이 꺼져 있으면 레코드 생성/마스킹 자체를 생략)
+        self.logger.log(level, msg, *args)
     
     def info(self, msg: str, *args):
-        self.logger.info(self._mask(msg), *args)
+        self._log(logging.INFO, msg, args)
     
     def warning(self, msg: str, *args):
-        self.logger.warning(self._mask(msg), *args)
+        self._log(logging.WARNING, msg, args)
     
     def error(self, msg: str, *args):
-        self.logger.error(self._mask(msg), *args)
+        self._log(logging.ERROR, msg, args)
     
     def debug(self, msg: str, *args):
-        self.logger.debug(self._mask(msg), *args)
+        self._log(logging.DEBUG, msg, args)
 
 
 # 글로벌 보안 로거
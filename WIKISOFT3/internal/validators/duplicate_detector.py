@@ -100,8 +100,12 @@ def _find_exact_duplicates(df: pd.DataFrame, emp_col: str) -> List[Dict[str, Any
     """완전 중복 찾기 (사원번호 동일)"""
     duplicates = []
     
-    # 사원번호별 그룹화
-    emp_groups = df.groupby(emp_col)
+    # 사원번호별 그룹화 (중복 행만 남긴 뒤 그룹화 → 사원마다 그룹 DataFrame을 만들지 않음)
+    dup_mask = df[emp_col].duplicated(keep=False)
+    if not dup_mask.any():
+        return duplicates  # 중복 없는 명부(일반적인 경우)는 그룹화 생략
+    dup_rows = df[dup_mask]
+    emp_groups = dup_rows.groupby(emp_col)
     
     for emp_id, group in emp_groups:
         if len(group) > 1:
@@ -128,11 +132,13 @@ def _find_similar_duplicates(
     """유사 중복 찾기 (이름+생년월일 동일, 사원번호 다름)"""
     duplicates = []
     
-    # 이름+생년월일 조합으로 그룹화
-    df_copy = df.copy()
-    df_copy["_name_birth_key"] = df_copy[name_col].astype(str) + "_" + df_copy[birth_col].astype(str)
+    # 이름+생년월일 조합으로 그룹화 (키 Series로 직접 그룹화 → DataFrame 전체 복사 없음)
+    name_birth_key = df[name_col].astype(str) + "_" + df[birth_col].astype(str)
+    dup_mask = name_birth_key.duplicated(keep=False)
+    if not dup_mask.any():
+        return duplicates
     
-    name_birth_groups = df_copy.groupby("_name_birth_key")
+    name_birth_groups = df[dup_mask].groupby(name_birth_key[dup_mask])
     
     for key, group in name_birth_groups:
         if len(group) > 1:
@@ -143,8 +149,9 @@ def _find_similar_duplicates(
                     continue  # 같은 사원번호 → exact duplicate
             
             rows = group.index.tolist()
-            name_val = str(group[name_col].iloc[0])
-            birth_val = str(group[birth_col].iloc[0])
+            # 스칼라 접근은 .at 사용 (컬럼 Series를 만든 뒤 iloc으로 꺼내는 과정 생략)
+            name_val = str(group.at[rows[0], name_col])
+            birth_val = str(group.at[rows[0], birth_col])
             
             # 사원번호 목록
             emp_ids = []
@@ -176,8 +183,12 @@ def _find_suspicious_duplicates(
     
     def check_field(col: str, field_name: str):
         if col and col in df.columns:
+            # 원본 값에 중복이 없으면 빈 값을 제외해도 중복이 없으므로 문자열 변환/필터링 생략
+            if not df[col].duplicated().any():
+                return
             # 빈 값 제외
             df_filtered = df[df[col].notna() & (df[col].astype(str).str.strip() != "")]
+            df_filtered = df_filtered[df_filtered[col].duplicated(keep=False)]
             if df_filtered.empty:
                 return
             
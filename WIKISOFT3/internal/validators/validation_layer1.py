@@ -2,23 +2,73 @@
 Layer 1 검증 (코드 룰 기반) - v2에서 이식
 """
 import re
-from datetime import datetime
-from typing import Any, Dict, List
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from internal.parsers.standard_schema import get_all_aliases
 from internal.utils.date_utils import is_valid_yyyymmdd, normalize_date
 
 
+# 필드 존재/필수 값/도메인 값 규칙 (호출마다 리스트를 새로 만들지 않도록 모듈 로드 시 한 번만 구성)
+_BASE_REQUIRED = ("이름", "생년월일", "사원번호", "기준급여", "제도구분")
+_REQUIRED_VALUE_COLS = ("사원번호", "생년월일", "입사일", "입사일자", "기준급여", "제도구분")
+_PHONE_ALIASES = frozenset(get_all_aliases("전화번호"))
+_EMAIL_ALIASES = frozenset(get_all_aliases("이메일"))
+_GENDER_CODES = frozenset(("1", "2"))
+_PLAN_CODES = frozenset(("1", "2", "3"))
+_NON_DIGIT_RE = re.compile(r"\D")
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def _yyyymmdd_to_date(value: str) -> Optional[date]:
+    """정규화된 yyyymmdd 문자열 → date (행마다 pd.to_datetime 스칼라 호출 대신 정수 변환만)."""
+    try:
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    except ValueError:
+        return None
+
+
+def _normalized_date(value: Any) -> Optional[date]:
+    """날짜 값 정규화 → date. 해석할 수 없으면 None (NaN 등 예외 포함)."""
+    try:
+        norm = normalize_date(value)
+    except Exception:
+        return None
+    return _yyyymmdd_to_date(norm) if norm else None
+
+
+def _numeric_column(values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """컬럼 값을 한 번에 숫자로 변환.
+
+    pd.to_numeric이 변환하지 못한 값만 float()로 다시 시도해서 행별 float() 변환과 같은 결과 유지
+    (문자열 'nan'/'1_000'/전각 숫자 등은 float()로는 변환되므로 형식 오류가 아님).
+
+    Returns:
+        (형식 오류 마스크, 숫자 값 배열 - 결측은 0)
+    """
+    series = pd.Series(values, dtype=object)
+    missing = series.isna().to_numpy()
+    amounts = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, copy=True)
+    format_error = np.zeros(len(values), dtype=bool)
+    for pos in np.flatnonzero(np.isnan(amounts) & ~missing):
+        try:
+            amounts[pos] = float(values[pos])
+        except (ValueError, TypeError):
+            format_error[pos] = True
+    amounts[missing | format_error] = 0
+    return format_error, amounts
+
+
 def validate_layer1(df: pd.DataFrame, diagnostic_answers: Dict[str, str]) -> Dict[str, Any]:
     """Layer 1: 규칙/스키마 기반 유효성 검사."""
     errors: List[Dict[str, Any]] = []
     warnings: List[Dict[str, Any]] = []
 
     # 필수 필드 존재 확인
-    base_required = ["이름", "생년월일", "사원번호", "기준급여", "제도구분"]
-    for col in base_required:
+    for col in _BASE_REQUIRED:
         if col not in df.columns:
             errors.append({"column": col, "error": f"필수 필드 누락: {col}", "severity": "error"})
 
@@ -28,36 +78,64 @@ def validate_layer1(df: pd.DataFrame, diagnostic_answers: Dict[str, str]) -> Dic
     if errors:
         return {"errors": errors, "warnings": warnings}
 
+    # 필수 값 누락 여부는 컬럼 단위로 한 번에 계산 (행 루프에서는 조회만)
+    required_cols = [c for c in _REQUIRED_VALUE_COLS if c in df.columns]
+    missing_masks = {
+        c: (df[c].isna() | (df[c].astype(str).str.strip() == "")).to_numpy()
+        for c in required_cols
+    }
+    phone_cols = [col for col in df.columns if col in _PHONE_ALIASES]
+    email_cols = [col for col in df.columns if col in _EMAIL_ALIASES]
+    hire_col = "입사일" if "입사일" in df.columns else "입사일자"
+    retire_col = next((c for c in ["퇴직일", "전환일"] if c in df.columns), None)
+
+    # 행 루프에서 읽는 컬럼만 파이썬 리스트로 한 번 변환 (컬럼 단위 저장, iterrows의 행별 Series 생성 없음)
+    used_cols = {
+        *phone_cols, *email_cols, "생년월일", hire_col, retire_col,
+        "급여", "기준급여", "퇴직금", "전환금", "성별", "제도구분",
+    }
+    col_values: Dict[Any, List[Any]] = {}
+    for col_pos, col in enumerate(df.columns):
+        if col in used_cols and col not in col_values:
+            col_values[col] = df.iloc[:, col_pos].tolist()
+
+    # 행마다 df.columns를 다시 조회하지 않도록 존재 여부를 미리 계산
+    has_birth = "생년월일" in col_values
+    has_gender = "성별" in col_values
+    has_plan = "제도구분" in col_values
+
+    # 급여/금액 숫자 변환은 행마다 float() 대신 컬럼 단위로 한 번에 (행 루프에서는 조회만)
+    numeric_cols = {
+        col: _numeric_column(col_values[col])
+        for col in ["급여", "기준급여", "퇴직금", "전환금"]
+        if col in col_values
+    }
+
     # 행별 검사
-    for idx, row in df.iterrows():
+    # 행마다 dict(레코드)를 만들지 않고 컬럼 리스트에서 위치로 바로 조회
+    for pos, idx in enumerate(df.index):
         # 필수 값 누락
-        for req_col in ["사원번호", "생년월일", "입사일", "입사일자", "기준급여", "제도구분"]:
-            if req_col in df.columns:
-                val = row.get(req_col)
-                if pd.isna(val) or str(val).strip() == "":
-                    errors.append({"row": idx, "column": req_col, "error": "필수 값 누락", "severity": "error"})
+        for req_col in required_cols:
+            if missing_masks[req_col][pos]:
+                errors.append({"row": idx, "column": req_col, "error": "필수 값 누락", "severity": "error"})
 
         # 전화번호 형식
-        phone_aliases = get_all_aliases("전화번호")
-        for col in df.columns:
-            if col in phone_aliases:
-                phone = str(row[col]).strip()
-                if phone and not phone.startswith("PHONE_"):
-                    digits = re.sub(r"\D", "", phone)
-                    if not (digits.startswith("0") and len(digits) in (10, 11)):
-                        errors.append({"row": idx, "column": col, "error": "전화번호 형식 오류", "severity": "error"})
+        for col in phone_cols:
+            phone = str(col_values[col][pos]).strip()
+            if phone and not phone.startswith("PHONE_"):
+                digits = _NON_DIGIT_RE.sub("", phone)
+                if not (digits.startswith("0") and len(digits) in (10, 11)):
+                    errors.append({"row": idx, "column": col, "error": "전화번호 형식 오류", "severity": "error"})
 
         # 이메일 형식
-        email_aliases = get_all_aliases("이메일")
-        for col in df.columns:
-            if col in email_aliases:
-                email = str(row[col]).strip()
-                if email and not re.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+", email):
-                    warnings.append({"row": idx, "column": col, "warning": "이메일 형식 경고", "severity": "warning"})
+        for col in email_cols:
+            email = str(col_values[col][pos]).strip()
+            if email and not _EMAIL_RE.fullmatch(email):
+                warnings.append({"row": idx, "column": col, "warning": "이메일 형식 경고", "severity": "warning"})
 
         # 생년월일: yyyymmdd + 1945~2010
-        if "생년월일" in df.columns:
-            birth_raw = row["생년월일"]
+        if has_birth:
+            birth_raw = col_values["생년월일"][pos]
             birth_norm = normalize_date(birth_raw)
             if not birth_norm or not is_valid_yyyymmdd(birth_norm):
                 errors.append({"row": idx, "column": "생년월일", "error": "생년월일 형식 오류", "severity": "error"})
@@ -68,63 +146,43 @@ def validate_layer1(df: pd.DataFrame, diagnostic_answers: Dict[str, str]) -> Dic
 
         # 급여: 양수
         for sal_col in ["급여", "기준급여"]:
-            if sal_col in df.columns:
-                try:
-                    sal = float(row[sal_col]) if not pd.isna(row[sal_col]) else 0
-                    if sal <= 0:
-                        errors.append({"row": idx, "column": sal_col, "error": f"{sal_col} 음수 또는 0", "severity": "error"})
-                except (ValueError, TypeError):
+            if sal_col in numeric_cols:
+                format_error, amounts = numeric_cols[sal_col]
+                if format_error[pos]:
                     errors.append({"row": idx, "column": sal_col, "error": f"{sal_col} 형식 오류", "severity": "error"})
+                elif amounts[pos] <= 0:
+                    errors.append({"row": idx, "column": sal_col, "error": f"{sal_col} 음수 또는 0", "severity": "error"})
+
+        # 입사일/퇴직일 비교에 같이 쓰는 입사일은 행마다 한 번만 정규화
+        hire_date = _normalized_date(col_values[hire_col][pos])
 
         # 입사일 > 생년월일 (18세)
-        if "생년월일" in df.columns:
-            try:
-                birth_norm = normalize_date(row["생년월일"])
-                hire_col = "입사일" if "입사일" in df.columns else "입사일자"
-                hire_norm = normalize_date(row[hire_col])
-                if birth_norm and hire_norm:
-                    birth_date = pd.to_datetime(birth_norm, format="%Y%m%d", errors="coerce")
-                    hire_date = pd.to_datetime(hire_norm, format="%Y%m%d", errors="coerce")
-                    if pd.notnull(birth_date) and pd.notnull(hire_date):
-                        age_at_hire = (hire_date - birth_date).days / 365.25
-                        if age_at_hire < 18:
-                            errors.append({"row": idx, "column": hire_col, "error": "입사 나이 18세 미만", "severity": "error"})
-            except Exception:
-                pass
+        if has_birth and birth_norm and hire_date:
+            birth_date = _yyyymmdd_to_date(birth_norm)
+            if birth_date:
+                age_at_hire = (hire_date - birth_date).days / 365.25
+                if age_at_hire < 18:
+                    errors.append({"row": idx, "column": hire_col, "error": "입사 나이 18세 미만", "severity": "error"})
 
         # 퇴직일 > 입사일
-        retire_col = None
-        for c in ["퇴직일", "전환일"]:
-            if c in df.columns:
-                retire_col = c
-                break
-        if retire_col:
-            try:
-                retire_norm = normalize_date(row[retire_col])
-                hire_col = "입사일" if "입사일" in df.columns else "입사일자"
-                hire_norm = normalize_date(row[hire_col])
-                if retire_norm and hire_norm:
-                    retire_date = pd.to_datetime(retire_norm, format="%Y%m%d", errors="coerce")
-                    hire_date = pd.to_datetime(hire_norm, format="%Y%m%d", errors="coerce")
-                    if pd.notnull(retire_date) and pd.notnull(hire_date) and retire_date < hire_date:
-                        errors.append({"row": idx, "column": retire_col, "error": "퇴직일 < 입사일", "severity": "error"})
-            except Exception:
-                pass
+        if retire_col and hire_date:
+            retire_date = _normalized_date(col_values[retire_col][pos])
+            if retire_date and retire_date < hire_date:
+                errors.append({"row": idx, "column": retire_col, "error": "퇴직일 < 입사일", "severity": "error"})
 
         # 금액 음수 금지
         for amt_col in ["퇴직금", "전환금"]:
-            if amt_col in df.columns:
-                try:
-                    amt = float(row[amt_col]) if not pd.isna(row[amt_col]) else 0
-                    if amt < 0:
-                        errors.append({"row": idx, "column": amt_col, "error": f"{amt_col} 음수", "severity": "error"})
-                except (ValueError, TypeError):
+            if amt_col in numeric_cols:
+                format_error, amounts = numeric_cols[amt_col]
+                if format_error[pos]:
                     errors.append({"row": idx, "column": amt_col, "error": f"{amt_col} 형식 오류", "severity": "error"})
+                elif amounts[pos] < 0:
+                    errors.append({"row": idx, "column": amt_col, "error": f"{amt_col} 음수", "severity": "error"})
 
         # 도메인 값: 성별(1/2), 제도구분(1/2/3)
-        if "성별" in df.columns and str(row["성별"]) not in ["1", "2"]:
+        if has_gender and str(col_values["성별"][pos]) not in _GENDER_CODES:
             errors.append({"row": idx, "column": "성별", "error": "성별 값 오류", "severity": "error"})
-        if "제도구분" in df.columns and str(row["제도구분"]) not in ["1", "2", "3"]:
+        if has_plan and str(col_values["제도구분"][pos]) not in _PLAN_CODES:
             errors.append({"row": idx, "column": "제도구분", "error": "제도구분 값 오류", "severity": "error"})
 
     # 중복 검사
@@ -14,6 +14,7 @@ def validate_layer2(chatbot_answers: Dict[str, Any], calculated_aggregates: Dict
 
     validation_questions = get_validation_questions()
     results = {"status": "passed", "total_checks": 0, "passed": 0, "warnings": []}
+    has_high = False  # 심각도 high 경고 여부 (루프 안에서 집계 → 상태 결정 시 warnings 재순회 없음)
 
     for question in validation_questions:
         qid = question["id"]
@@ -51,11 +52,13 @@ def validate_layer2(chatbot_answers: Dict[str, Any], calculated_aggregates: Dict
             continue
 
         diff = user_value - calc_value
-        diff_percent = abs(diff / calc_value * 100) if calc_value != 0 else float("inf")
-
         if abs(diff) < 0.01:
             results["passed"] += 1
-        elif diff_percent <= tolerance_percent:
+            continue
+
+        # 차이 비율은 경고 메시지에 쓰이는 경우(정확히 일치하지 않을 때)에만 계산
+        diff_percent = abs(diff / calc_value * 100) if calc_value != 0 else float("inf")
+        if diff_percent <= tolerance_percent:
             results["passed"] += 1
             results["warnings"].append({
                 "question_id": qid,
@@ -67,6 +70,7 @@ def validate_layer2(chatbot_answers: Dict[str, Any], calculated_aggregates: Dict
                 "message": f"경미한 차이 ({diff_percent:.1f}%)",
             })
         else:
+            has_high = True
             results["warnings"].append({
                 "question_id": qid,
                 "question": question["question"],
@@ -77,8 +81,7 @@ def validate_layer2(chatbot_answers: Dict[str, Any], calculated_aggregates: Dict
                 "message": f"⭕ 명부: {calc_value}, 입력: {user_value} (차이: {diff_percent:.1f}%)",
             })
 
-    high_warnings = [w for w in results["warnings"] if w.get("severity") == "high"]
-    if high_warnings:
+    if has_high:
         results["status"] = "failed"
     elif results["warnings"]:
         results["status"] = "warnings"
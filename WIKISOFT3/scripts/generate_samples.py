@@ -245,7 +245,8 @@ def main():
     print("=" * 60)
     
     store = CaseStore()
-    created = 0
+    cases = []
+    mapped_counts = []
     
     for pattern in SAMPLE_PATTERNS:
         name = pattern["name"]
@@ -256,21 +257,25 @@ def main():
         mapped = sum(1 for m in matches if m.get("target"))
         confidence = mapped / len(headers) if headers else 0
         
-        case_id = store.save_case(
-            headers=headers,
-            matches=matches,
-            confidence=confidence,
-            was_auto_approved=True,
-            human_corrections=None,
-            metadata={
+        cases.append({
+            "headers": headers,
+            "matches": matches,
+            "confidence": confidence,
+            "was_auto_approved": True,
+            "human_corrections": None,
+            "metadata": {
                 "source": "synthetic",
                 "pattern_name": name,
                 "generated": True,
-            }
-        )
-        
-        print(f"✅ {name}: {len(headers)}개 헤더, {mapped}개 매핑, ID={case_id}")
-        created += 1
+            },
+        })
+        mapped_counts.append(mapped)
+    
+    # 인덱스 파일은 전체 케이스 저장 후 한 번만 기록
+    case_ids = store.save_cases(cases)
+    for pattern, mapped, case_id in zip(SAMPLE_PATTERNS, mapped_counts, case_ids):
+        print(f"✅ {pattern['name']}: {len(pattern['headers'])}개 헤더, {mapped}개 매핑, ID={case_id}")
+    created = len(case_ids)
     
     print()
     print("=" * 60)
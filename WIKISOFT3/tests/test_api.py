@@ -8,11 +8,21 @@ from openpyxl import Workbook
 import sys
 sys.path.insert(0, "/Users/kj/Desktop/wiki/WIKISOFT3")
 
-from external.api.main import app
+from external.api.main import app, IO_POOL_WORKERS, RateLimiter
+from internal.memory import case_store as case_store_module
+from internal.memory.case_store import CaseStore
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def isolated_case_store(tmp_path, monkeypatch):
+    """검증 API가 저장하는 성공 케이스는 임시 디렉터리에 (저장소의 training_data는 건드리지 않음)"""
+    store = CaseStore(store_path=tmp_path / "cases")
+    monkeypatch.setattr(case_store_module, "_case_store", store)
+    return store
+
+
 def create_test_excel() -> bytes:
     """테스트용 Excel 파일 생성"""
     wb = Workbook()
@@ -48,6 +58,42 @@ class TestHealthEndpoint:
         assert data["status"] in ["healthy", "ok"]  # 둘 다 허용
         assert "version" in data
 
+    def test_io_pool_lifecycle(self):
+        """앱 수명 동안 I/O 스레드 풀 유지, 종료 시 정리"""
+        import threading
+        import time
+
+        def thread_name():
+            time.sleep(0.01)
+            return threading.current_thread().name
+
+        with TestClient(app) as lifespan_client:
+            pool = app.state.io_pool
+            names = {f.result() for f in [pool.submit(thread_name) for _ in range(IO_POOL_WORKERS * 3)]}
+            assert all(name.startswith("io") for name in names)
+            assert len(names) <= IO_POOL_WORKERS
+            assert lifespan_client.get("/api/health").status_code == 200
+        with pytest.raises(RuntimeError):
+            pool.submit(lambda: None)
+
+    def test_expired_jobs_cleaned_periodically(self, monkeypatch):
+        """앱 실행 중 만료된 인메모리 배치 작업을 주기적으로 정리"""
+        import time
+
+        from external.api import main
+        from internal.queue import jobs
+
+        monkeypatch.setattr(main, "JOB_CLEANUP_INTERVAL", 0.01)
+        monkeypatch.setitem(jobs._JOB_STORE, "job-expired", {"status": "queued"})
+        monkeypatch.setattr(jobs, "_JOB_EXPIRY", [(0.0, "job-expired")])
+
+        with TestClient(app):
+            deadline = time.monotonic() + 2
+            while "job-expired" in jobs._JOB_STORE and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert "job-expired" not in jobs._JOB_STORE
+
 
 class TestDiagnosticQuestionsEndpoint:
     """진단 질문 엔드포인트 테스트"""
@@ -94,6 +140,104 @@ class TestValidateEndpoint:
             data = response.json()
             assert "status" in data or "success" in data
     
+    def test_download_excel_after_validate(self):
+        """검증 후 Excel 리포트 다운로드"""
+        excel_bytes = create_test_excel()
+        client.post(
+            "/api/auto-validate",
+            files={"file": ("test.xlsx", excel_bytes, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+        )
+        
+        response = client.get("/api/auto-validate/download-excel")
+        
+        assert response.status_code == 200
+        assert response.content[:2] == b"PK"  # xlsx (ZIP)
+        assert int(response.headers["content-length"]) == len(response.content)
+    
+    def test_download_final_data_after_validate(self):
+        """검증 후 최종 수정본 다운로드 (임시 파일 없이 메모리 바이트 그대로 응답)"""
+        excel_bytes = create_test_excel()
+        client.post(
+            "/api/auto-validate",
+            files={"file": ("test.xlsx", excel_bytes, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+        )
+        
+        response = client.get("/api/auto-validate/download-final-data")
+        
+        assert response.status_code == 200
+        assert response.content[:2] == b"PK"  # xlsx (ZIP)
+        assert "final_data.xlsx" in response.headers["content-disposition"]
+        assert int(response.headers["content-length"]) == len(response.content)
+    
+    def test_validate_etag_not_modified(self):
+        """같은 파일/답변을 If-None-Match로 다시 보내면 304"""
+        excel_bytes = create_test_excel()
+        files = {"file": ("test.xlsx", excel_bytes, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+        
+        response = client.post("/api/auto-validate", files=files)
+        etag = response.headers["etag"]
+        
+        response = client.post("/api/auto-validate", files=files, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        
+        # 답변이 다르면 다른 결과 → 다시 검증
+        response = client.post(
+            "/api/auto-validate",
+            files=files,
+            data={"chatbot_answers": '{"q19": 2}'},
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    
+    def test_validate_etag_list_weak_and_wildcard(self):
+        """If-None-Match의 여러 태그 목록, 약한 검증자(W/), *도 일치로 처리"""
+        excel_bytes = create_test_excel()
+        files = {"file": ("test.xlsx", excel_bytes, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+        
+        etag = client.post("/api/auto-validate", files=files).headers["etag"]
+        
+        for header in (f'"other", {etag}', f"W/{etag}", "*"):
+            response = client.post("/api/auto-validate", files=files, headers={"If-None-Match": header})
+            assert response.status_code == 304, header
+        
+        response = client.post("/api/auto-validate", files=files, headers={"If-None-Match": '"other", W/"x"'})
+        assert response.status_code == 200
+    
+    def test_validate_invalid_answers_ignored(self):
+        """진단 답변이 JSON 객체가 아니면 답변 없이 검증"""
+        excel_bytes = create_test_excel()
+        for answers in ("not json", '["q1"]'):
+            response = client.post(
+                "/api/auto-validate",
+                files={"file": ("test.xlsx", excel_bytes, "application/octet-stream")},
+                data={"chatbot_answers": answers},
+            )
+            assert response.status_code == 200
+            assert response.json()["diagnostic_applied"] is False
+    
+    def test_validate_oversized_file(self):
+        """크기 한도 초과 파일은 413"""
+        from internal.utils.security import MAX_FILE_SIZE
+        
+        oversized = b"PK\x03\x04" + b"\x00" * MAX_FILE_SIZE
+        response = client.post(
+            "/api/auto-validate",
+            files={"file": ("big.xlsx", oversized, "application/octet-stream")}
+        )
+        
+        assert response.status_code == 413
+    
+    def test_validate_signature_mismatch(self):
+        """확장자와 내용(매직 바이트)이 다르면 400"""
+        response = client.post(
+            "/api/auto-validate",
+            files={"file": ("fake.xlsx", "사원번호,이름\n".encode("utf-8"), "application/octet-stream")}
+        )
+        
+        assert response.status_code == 400
+    
     def test_validate_without_file(self):
         """파일 없이 검증 (에러)"""
         response = client.post("/api/auto-validate")
@@ -122,6 +266,318 @@ class TestBatchEndpoint:
         data = response.json()
         assert "job_id" in data
 
+    def test_batch_validate_parses_each_file(self):
+        """배치 파일별 파싱 결과 요약, 잘못된 파일은 파일별 오류 (전부 잘못되면 400)"""
+        excel_bytes = create_test_excel()
+        csv_bytes = "사원번호,이름\nEMP001,홍길동\n".encode("utf-8")
+        
+        response = client.post(
+            "/api/batch-validate",
+            files=[
+                ("files", ("a.xlsx", excel_bytes, "application/octet-stream")),
+                ("files", ("b.csv", csv_bytes, "text/csv")),
+            ]
+        )
+        assert response.status_code == 200
+        assert [(f["file"], f["row_count"]) for f in response.json()["files"]] == [("a.xlsx", 2), ("b.csv", 1)]
+        
+        response = client.post(
+            "/api/batch-validate",
+            files=[
+                ("files", ("a.xlsx", excel_bytes, "application/octet-stream")),
+                ("files", ("fake.xlsx", csv_bytes, "application/octet-stream")),
+            ]
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["files_accepted"] == 1
+        assert [f["status"] for f in data["files"]] == ["ok", "error"]
+        
+        response = client.post(
+            "/api/batch-validate",
+            files=[("files", ("fake.xlsx", csv_bytes, "application/octet-stream"))]
+        )
+        assert response.status_code == 400
+    
+    def test_batch_job_receives_parsed_files(self, monkeypatch):
+        """업로드 시 파싱한 결과를 작업 인자로 전달 (응답에는 요약만)"""
+        from external.api.routes import batch as batch_route
+
+        enqueued = []
+        monkeypatch.setattr(batch_route, "enqueue_jobs", lambda names, parsed: enqueued.append((names, parsed)) or "job-x")
+
+        response = client.post(
+            "/api/batch-validate",
+            files=[("files", ("a.xlsx", create_test_excel(), "application/octet-stream"))]
+        )
+
+        assert response.status_code == 200
+        assert "parsed" not in response.json()["files"][0]
+        [(names, parsed)] = enqueued
+        assert names == ["a.xlsx"]
+        assert parsed[0]["headers"][:2] == ["사원번호", "이름"]
+        assert len(parsed[0]["rows"]) == 2
+    
+    def test_batch_job_skips_failed_files(self, monkeypatch):
+        """일부 파일이 실패하면 성공한 파일명과 그 파싱 결과만 같은 순서로 작업에 전달"""
+        from external.api.routes import batch as batch_route
+
+        enqueued = []
+        monkeypatch.setattr(batch_route, "enqueue_jobs", lambda names, parsed: enqueued.append((names, parsed)) or "job-x")
+        csv_bytes = "사원번호,이름\nEMP001,홍길동\n".encode("utf-8")
+
+        response = client.post(
+            "/api/batch-validate",
+            files=[
+                ("files", ("a.xlsx", create_test_excel(), "application/octet-stream")),
+                ("files", ("fake.xlsx", csv_bytes, "application/octet-stream")),
+                ("files", ("b.csv", csv_bytes, "text/csv")),
+            ]
+        )
+
+        assert [f["status"] for f in response.json()["files"]] == ["ok", "error", "ok"]
+        [(names, parsed)] = enqueued
+        assert names == ["a.xlsx", "b.csv"]
+        assert [len(p["rows"]) for p in parsed] == [2, 1]
+    
+    def test_batch_webhook_body(self):
+        """웹훅은 JSON 본문을 모델로 검증"""
+        excel_bytes = create_test_excel()
+        job_id = client.post(
+            "/api/batch-validate",
+            files=[("files", ("test1.xlsx", excel_bytes, "application/octet-stream"))]
+        ).json()["job_id"]
+
+        response = client.post(f"/api/batch-validate/{job_id}/webhook", json={"status": "running", "progress": 50})
+        assert response.status_code == 200
+        assert response.json()["progress"] == 50
+
+        response = client.post(f"/api/batch-validate/{job_id}/webhook", json={"status": "unknown"})
+        assert response.status_code == 422
+
+    def test_batch_webhook_token(self, monkeypatch):
+        """웹훅 토큰 설정 시 Bearer 토큰 검사"""
+        from internal.utils import security
+
+        monkeypatch.setattr(security, "_WEBHOOK_TOKEN_BYTES", b"secret-token")
+        url = "/api/batch-validate/job-x/webhook"
+
+        assert client.post(url, json={"status": "running"}).status_code == 401
+        assert client.post(url, json={"status": "running"}, headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.post(url, json={"status": "running"}, headers={"Authorization": "Basic secret-token"}).status_code == 401
+        response = client.post(url, json={"status": "running"}, headers={"Authorization": "Bearer secret-token"})
+        assert response.status_code == 200
+
+
+class TestValidationResultCache:
+    """검증 결과 캐시 테스트"""
+
+    def test_same_file_and_answers_reuse_result(self, monkeypatch):
+        """같은 파일/답변 재검증 시 매칭 이후 단계를 다시 실행하지 않음"""
+        from external.api.routes import validate as validate_route
+
+        calls = []
+        original = validate_route.estimate_confidence
+
+        def counting_confidence(*args, **kwargs):
+            calls.append(1)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(validate_route, "estimate_confidence", counting_confidence)
+        validate_route._result_cache.clear()
+
+        files = {"file": ("test.xlsx", create_test_excel(), "application/octet-stream")}
+        first = client.post("/api/auto-validate", files=files)
+        second = client.post("/api/auto-validate", files=files)
+
+        assert first.json() == second.json()
+        assert first.headers["etag"] == second.headers["etag"]
+        assert len(calls) == 1
+
+        client.post("/api/auto-validate", files=files, data={"chatbot_answers": '{"q19": 2}'})
+        assert len(calls) == 2
+
+    def test_react_same_file_reuses_result(self, monkeypatch):
+        """ReACT 검증도 같은 파일/답변이면 에이전트를 다시 실행하지 않음"""
+        from external.api.routes import validate as validate_route
+
+        calls = []
+        original = validate_route.create_react_agent
+
+        def counting_agent(*args, **kwargs):
+            calls.append(1)
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(validate_route, "create_react_agent", counting_agent)
+        validate_route._result_cache.clear()
+
+        files = {"file": ("test.xlsx", create_test_excel(), "application/octet-stream")}
+        first = client.post("/api/auto-validate/react", files=files)
+        second = client.post("/api/auto-validate/react", files=files)
+
+        assert first.status_code == 200
+        assert first.json() == second.json()
+        assert len(calls) == 1
+
+    def test_react_case_saved_to_store(self, isolated_case_store):
+        """ReACT 성공 케이스는 케이스 저장소(여기서는 임시 디렉터리)에 저장"""
+        from external.api.routes import validate as validate_route
+
+        validate_route._result_cache.clear()
+        files = {"file": ("test.xlsx", create_test_excel(), "application/octet-stream")}
+        result = client.post("/api/auto-validate/react", files=files).json()
+
+        saved = isolated_case_store.get_stats()["total_cases"]
+        assert saved == (1 if result["confidence"]["score"] >= 0.8 else 0)
+
+    def test_react_case_save_failure_logged(self, monkeypatch, caplog):
+        """ReACT 케이스 저장 실패는 응답을 막지 않고 로그로 기록"""
+        from external.api.routes import validate as validate_route
+
+        def failing_save(**kwargs):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(validate_route, "save_successful_case", failing_save)
+        result = {
+            "status": "completed",
+            "confidence": {"score": 0.9},
+            "steps": {"parsed_summary": {"headers": ["사원번호"]}, "matches": {"matches": []}},
+        }
+
+        with caplog.at_level("ERROR", logger="validate"):
+            validate_route._persist_react_result(result, {}, "a.xlsx")
+
+        record = next(r for r in caplog.records if r.getMessage() == "case_save_failed")
+        assert record.structured["error"] == "disk full"
+        assert record.structured["mode"] == "react"
+
+    def test_session_memory_created_outside_state_lock(self, monkeypatch):
+        """Redis 연결(SessionMemory 생성)은 공유 상태 락 밖에서 수행"""
+        from external.api.routes import validate as validate_route
+
+        lock_held = []
+
+        class FakeSessionMemory:
+            def __init__(self, url):
+                lock_held.append(validate_route._state_lock.locked())
+
+        monkeypatch.setattr(validate_route, "_session_memory", None)
+        monkeypatch.setattr(validate_route, "SessionMemory", FakeSessionMemory)
+
+        memory = validate_route._get_session_memory()
+
+        assert isinstance(memory, FakeSessionMemory)
+        assert validate_route._get_session_memory() is memory
+        assert lock_held == [False]
+
+
+class TestRateLimiter:
+    """Rate Limiter 테스트"""
+    
+    def test_limit_per_client(self):
+        """IP별 분당 요청 수 제한"""
+        limiter = RateLimiter(requests_per_minute=2)
+        
+        assert limiter.is_allowed("1.1.1.1") == (True, 1)
+        assert limiter.is_allowed("1.1.1.1") == (True, 0)
+        assert limiter.is_allowed("1.1.1.1") == (False, 0)
+        assert limiter.is_allowed("2.2.2.2") == (True, 1)
+    
+    def test_max_clients_evicts_oldest(self):
+        """추적 IP 수 상한 초과 시 가장 오래된 IP 제거"""
+        limiter = RateLimiter(requests_per_minute=5, max_clients=2)
+        
+        limiter.is_allowed("1.1.1.1")
+        limiter.is_allowed("2.2.2.2")
+        limiter.is_allowed("1.1.1.1")  # 최근 접근으로 이동
+        limiter.is_allowed("3.3.3.3")
+        
+        assert list(limiter.requests) == ["1.1.1.1", "3.3.3.3"]
+    
+    def test_window_expires(self, monkeypatch):
+        """1분이 지나면 다시 허용 (단조 시계 기준)"""
+        import external.api.main as main_module
+        
+        now = [1000.0]
+        monkeypatch.setattr(main_module.time, "monotonic", lambda: now[0])
+        limiter = RateLimiter(requests_per_minute=1)
+        
+        assert limiter.is_allowed("1.1.1.1") == (True, 0)
+        assert limiter.is_allowed("1.1.1.1") == (False, 0)
+        now[0] += 61
+        assert limiter.is_allowed("1.1.1.1") == (True, 0)
+
+
+class TestAIAnalysisCache:
+    """AI 분석 결과 캐시 테스트"""
+    
+    def test_same_input_calls_llm_once(self, monkeypatch):
+        """같은 입력이면 LLM 한 번만 호출"""
+        from external.api.routes import validate as validate_route
+        
+        calls = []
+        
+        def fake_chat(prompt, **kwargs):
+            calls.append(prompt)
+            assert kwargs.get("json_mode") is True
+            return '{"issues": [{"severity": "info", "message": "확인 필요"}]}'
+        
+        monkeypatch.setattr("internal.ai.llm_client.chat", fake_chat)
+        validate_route._ai_analysis_cache.clear()
+        
+        args = ({}, {"q19": "2"}, 2, ["사원번호"], [["EMP001"], ["EMP002"]])
+        first = validate_route._ai_agent_analyze(*args)
+        second = validate_route._ai_agent_analyze(*args)
+        
+        assert first == second
+        assert len(calls) == 1
+    
+    def test_llm_failure_not_cached(self, monkeypatch):
+        """LLM 오류 응답은 캐시하지 않음"""
+        from external.api.routes import validate as validate_route
+        
+        calls = []
+        
+        def failing_chat(prompt, **kwargs):
+            calls.append(prompt)
+            return "[]"
+        
+        monkeypatch.setattr("internal.ai.llm_client.chat", failing_chat)
+        validate_route._ai_analysis_cache.clear()
+        
+        args = ({}, {"q19": "2"}, 2, ["사원번호"], [["EMP001"]])
+        validate_route._ai_agent_analyze(*args)
+        validate_route._ai_agent_analyze(*args)
+        
+        assert len(calls) == 2
+
+    def test_sample_table_format(self):
+        """샘플 데이터는 | 구분 표로 프롬프트에 포함"""
+        from external.api.routes import validate as validate_route
+
+        table = validate_route._format_sample_table(
+            ["사원번호", "이름"], [["EMP001", "홍길동"], ["EMP002", None]]
+        )
+
+        assert table == "사원번호|이름\nEMP001|홍길동\nEMP002|"
+
+
+class TestDiagnosticConsistency:
+    """진단 답변 vs 데이터 일관성 검사 테스트"""
+
+    def test_headcount_mismatch(self, monkeypatch):
+        """숫자/숫자 문자열 답변 모두 인원수 합계에 반영"""
+        from external.api.routes import validate as validate_route
+
+        monkeypatch.setattr("internal.ai.llm_client.chat", lambda prompt, **kwargs: "[]")
+        parsed = {"headers": ["사원번호"], "rows": [["EMP001"], ["EMP002"]]}
+
+        warnings = validate_route.check_diagnostic_consistency(parsed, {"q19": 2, "q20": "1", "q21": "없음"})
+
+        mismatch = [w for w in warnings if w.get("type") == "headcount_mismatch"]
+        assert len(mismatch) == 1
+        assert "합계 3명" in mismatch[0]["message"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,122 @@
+"""
+Case Store 테스트
+"""
+import pytest
+
+from internal.memory.case_store import CaseStore
+from internal.utils.json_utils import read_json
+
+
+@pytest.fixture
+def store(tmp_path):
+    """임시 디렉터리 케이스 저장소"""
+    return CaseStore(store_path=tmp_path)
+
+
+class TestCaseStore:
+    """케이스 저장/인덱스 테스트"""
+
+    def test_save_same_headers_once(self, store, tmp_path):
+        """같은 헤더 조합은 한 케이스로 저장 (재로드 후에도 중복 없음)"""
+        headers = ["사원번호", "이름"]
+        case_id = store.save_case(headers, [], 0.9)
+        store.save_case(headers, [], 0.95, was_auto_approved=False)
+
+        assert [c["case_id"] for c in store.index["cases"]] == [case_id]
+        assert store.index["stats"]["total_cases"] == 1
+
+        reloaded = CaseStore(store_path=tmp_path)
+        reloaded.save_case(list(reversed(headers)), [], 0.9)
+        assert reloaded.index["stats"]["total_cases"] == 1
+
+    def test_header_patterns_saved_as_lists(self, store, tmp_path):
+        """헤더 패턴 인덱스는 파일에 리스트로 저장, 재로드 후 검색 가능"""
+        first = store.save_case(["사원번호", "이름"], [], 0.9)
+        second = store.save_case(["사원번호", "입사일"], [], 0.9)
+        store.save_case(["사원번호", "이름"], [], 0.9)
+
+        saved = read_json(tmp_path / "index.json")
+        assert saved["header_patterns"]["사원번호"] == [first, second]
+
+        reloaded = CaseStore(store_path=tmp_path)
+        assert {c["case_id"] for c in reloaded.find_by_header(" 사원번호 ")} == {first, second}
+        assert list(reloaded.index["header_patterns"]["이름"]) == [first]
+
+    def test_find_similar_cases_top_k(self, store):
+        """유사도 높은 순으로 k개만 반환 (min_overlap 미만 제외)"""
+        exact = store.save_case(["사원번호", "이름", "입사일"], [], 0.9)
+        partial = store.save_case(["사원번호", "이름", "부서", "직급"], [], 0.9)
+        store.save_case(["사원번호", "a", "b", "c", "d"], [], 0.9)
+
+        result = store.find_similar_cases(["사원번호", "이름", "입사일"], k=2)
+
+        assert [c["case_id"] for c in result] == [exact, partial]
+        assert result[0]["similarity"] == 1.0
+        assert result[1]["similarity"] == round(2 / 5, 3)
+
+    def test_save_cases_writes_index_once(self, store, tmp_path, monkeypatch):
+        """일괄 저장은 인덱스 파일을 마지막에 한 번만 기록, 결과는 개별 저장과 동일"""
+        saves = []
+        original = store._save_index
+        monkeypatch.setattr(store, "_save_index", lambda: saves.append(1) or original())
+
+        case_ids = store.save_cases([
+            {"headers": ["사원번호", "이름"], "matches": [], "confidence": 0.9},
+            {"headers": ["사원번호", "입사일"], "matches": [], "confidence": 0.7, "was_auto_approved": False},
+            {"headers": ["이름", "사원번호"], "matches": [], "confidence": 0.9},
+        ])
+
+        assert len(saves) == 1
+        assert case_ids[0] == case_ids[2]
+        reloaded = CaseStore(store_path=tmp_path)
+        assert reloaded.get_stats()["total_cases"] == 2
+        assert reloaded.get_stats()["manual_corrected"] == 1
+        assert reloaded.get_case(case_ids[1])["confidence"] == 0.7
+
+    def test_concurrent_saves(self, store, tmp_path):
+        """여러 스레드가 같은 저장소에 동시에 저장해도 인덱스 손상/유실 없음"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        def save_many(worker):
+            return [store.save_case([f"헤더{worker}_{i}", "사원번호"], [], 0.9) for i in range(50)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            case_ids = [cid for ids in executor.map(save_many, range(4)) for cid in ids]
+
+        assert store.get_stats()["total_cases"] == 200
+        reloaded = CaseStore(store_path=tmp_path)
+        assert reloaded.get_stats()["total_cases"] == 200
+        assert set(reloaded.index["header_patterns"]["사원번호"]) == set(case_ids)
+
+    def test_reads_while_saving(self, store):
+        """저장 중인 다른 스레드가 있어도 헤더 검색/유사 케이스 조회가 실패하지 않음"""
+        import threading
+
+        errors = []
+        done = threading.Event()
+
+        def writer():
+            for i in range(200):
+                store.save_case([f"헤더{i}", "사원번호"], [], 0.9)
+            done.set()
+
+        def reader():
+            try:
+                while not done.is_set():
+                    store._pattern_case_ids("사원번호")
+                    store._index_snapshot()
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert len(store._pattern_case_ids("사원번호")) == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
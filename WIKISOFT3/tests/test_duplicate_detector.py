@@ -121,6 +121,24 @@ class TestDuplicateDetection:
         assert len(result['similar_duplicates']) == 1
         assert len(result['suspicious_duplicates']) == 1
     
+    def test_input_dataframe_unchanged(self):
+        """입력 DataFrame은 수정되지 않음 (임시 키 컬럼 없음)"""
+        data = [
+            ['EMP001', '홍길동', '19900101'],
+            ['EMP002', '홍길동', '19900101'],
+        ]
+        df = pd.DataFrame(data, columns=['사원번호', '이름', '생년월일'])
+        original = df.copy()
+        matches = [
+            {'source': '사원번호', 'target': '사원번호'},
+            {'source': '이름', 'target': '이름'},
+            {'source': '생년월일', 'target': '생년월일'},
+        ]
+        
+        detect_duplicates(df, df.columns.tolist(), matches)
+        
+        pd.testing.assert_frame_equal(df, original)
+    
     def test_empty_dataframe(self):
         """빈 데이터"""
         df = pd.DataFrame()
@@ -0,0 +1,198 @@
+"""
+배치 작업 스토어 테스트 (인메모리 폴백)
+"""
+import pytest
+
+from internal.queue import jobs
+
+# autouse 픽스처가 바꾸기 전의 실제 큐 연결 함수
+_real_get_queue = jobs._get_queue
+
+
+@pytest.fixture(autouse=True)
+def in_memory_store(monkeypatch):
+    """Redis 없이 인메모리 스토어만 사용"""
+    monkeypatch.setattr(jobs, "_get_queue", lambda: None)
+    jobs._JOB_STORE.clear()
+    jobs._JOB_EXPIRY.clear()
+    yield
+    jobs._JOB_STORE.clear()
+    jobs._JOB_EXPIRY.clear()
+
+
+class TestJobStore:
+    """인메모리 작업 스토어 테스트"""
+
+    def test_enqueue_and_update(self):
+        """등록 후 상태 업데이트"""
+        job_id = jobs.enqueue_jobs(["a.xlsx"])
+        jobs.update_job(job_id, status="running", progress=30)
+
+        job = jobs.get_job(job_id)
+        assert job["status"] == "running"
+        assert job["progress"] == 30
+        assert job["files"] == ["a.xlsx"]
+
+    def test_job_ids_unique_random_hex(self):
+        """작업 ID는 job- 접두사 + 128비트 난수 hex"""
+        ids = {jobs.enqueue_jobs(["a.xlsx"]) for _ in range(20)}
+
+        assert len(ids) == 20
+        assert all(job_id.startswith("job-") and len(job_id) == 4 + 32 for job_id in ids)
+        int(next(iter(ids))[4:], 16)
+
+    def test_evicts_least_recently_used(self, monkeypatch):
+        """한도 초과 시 가장 오래 사용되지 않은 작업 제거"""
+        monkeypatch.setattr(jobs, "_MAX_JOBS", 2)
+        first = jobs.enqueue_jobs(["1.xlsx"])
+        second = jobs.enqueue_jobs(["2.xlsx"])
+        jobs.get_job(first)  # first를 최근 사용으로 갱신
+        third = jobs.enqueue_jobs(["3.xlsx"])
+
+        assert jobs.get_job(second) is None
+        assert jobs.get_job(first) is not None
+        assert jobs.get_job(third) is not None
+
+    def test_expired_jobs_removed(self, monkeypatch):
+        """보관 기간이 지난 작업은 조회 시 제거"""
+        monkeypatch.setattr(jobs, "_JOB_TTL_SECONDS", 0)
+        job_id = jobs.enqueue_jobs(["old.xlsx"])
+
+        assert jobs.get_job(job_id) is None
+        assert not jobs._JOB_EXPIRY
+
+    def test_expiry_work_is_bounded_per_call(self):
+        """요청당 만료 정리는 배치 크기까지만, 나머지는 전체 정리에서 제거"""
+        for i in range(jobs._EXPIRE_BATCH + 5):
+            jobs._JOB_STORE[f"job-{i}"] = {"status": "queued"}
+            jobs._JOB_EXPIRY.append((0.0, f"job-{i}"))
+
+        assert jobs._evict_expired() == jobs._EXPIRE_BATCH
+        assert jobs.cleanup_expired_jobs() == 5
+        assert not jobs._JOB_STORE
+
+    def test_expiry_heap_stays_bounded(self, monkeypatch):
+        """LRU로 밀려난 작업의 만료 항목이 힙에 계속 쌓이지 않음"""
+        monkeypatch.setattr(jobs, "_MAX_JOBS", 3)
+        for i in range(50):
+            jobs.enqueue_jobs([f"{i}.xlsx"])
+
+        assert len(jobs._JOB_STORE) == 3
+        assert len(jobs._JOB_EXPIRY) <= 2 * 3 + 1
+
+
+class TestQueueConnection:
+    """Redis 큐 연결 재사용 테스트"""
+
+    def test_failed_connection_not_retried_immediately(self, monkeypatch):
+        """연결 실패 후 재시도 대기 시간 동안은 다시 연결하지 않음"""
+        attempts = []
+
+        def failing_from_url(url):
+            attempts.append(url)
+            raise ConnectionError("redis down")
+
+        monkeypatch.setattr(jobs.Redis, "from_url", failing_from_url)
+        monkeypatch.setattr(jobs, "_queue", None)
+        monkeypatch.setattr(jobs, "_queue_retry_at", 0.0)
+
+        assert _real_get_queue() is None
+        assert _real_get_queue() is None
+        assert len(attempts) == 1
+
+        monkeypatch.setattr(jobs, "_queue_retry_at", 0.0)  # 대기 시간 경과
+        assert _real_get_queue() is None
+        assert len(attempts) == 2
+
+    def test_lost_connection_falls_back_to_memory(self, monkeypatch):
+        """캐시된 큐의 Redis 연결이 끊기면 큐를 버리고 인메모리 스토어로 등록/조회/갱신"""
+        from redis.exceptions import ConnectionError as RedisConnectionError
+
+        class DeadQueue:
+            connection = None
+
+            def enqueue(self, *args, **kwargs):
+                raise RedisConnectionError("redis down")
+
+        def failing_fetch(job_id, connection=None):
+            raise RedisConnectionError("redis down")
+
+        monkeypatch.setattr(jobs, "_get_queue", _real_get_queue)
+        monkeypatch.setattr(jobs, "_queue", DeadQueue())
+        monkeypatch.setattr(jobs, "_queue_retry_at", 0.0)
+        monkeypatch.setattr(jobs.Job, "fetch", failing_fetch)
+
+        job_id = jobs.enqueue_jobs(["a.xlsx"])
+
+        assert jobs._queue is None
+        assert jobs._queue_retry_at > 0.0
+        assert job_id in jobs._JOB_STORE
+
+        # 재시도 대기 시간이 지나 큐가 다시 연결돼도 인메모리 작업은 조회/갱신 가능
+        monkeypatch.setattr(jobs, "_queue", DeadQueue())
+        assert jobs.get_job(job_id)["status"] == "queued"
+        assert jobs._queue is None
+
+        monkeypatch.setattr(jobs, "_queue", DeadQueue())
+        jobs.update_job(job_id, "completed", progress=100, result={"ok": True})
+        assert jobs._queue is None
+        assert jobs.get_job(job_id)["status"] == "completed"
+
+
+class TestProcessBatch:
+    """RQ 워커 배치 처리 테스트"""
+
+    def test_files_processed_concurrently_in_input_order(self, monkeypatch):
+        """파일별 처리는 워커 스레드에서 병렬, 결과 목록/결정 로그는 입력 순서 유지 + 실패 파일은 개별 오류"""
+        import threading
+        import time
+
+        from internal.queue import worker
+
+        logged = []
+        threads = set()
+
+        def fake_process(registry, file_name, parsed):
+            threads.add(threading.current_thread().name)
+            if file_name == "a.xlsx":
+                time.sleep(0.05)  # 먼저 시작한 파일이 늦게 끝나도 순서 유지
+            if file_name == "bad.xlsx":
+                return {"file": file_name, "status": "error", "error": "x"}, {"file": file_name}
+            return {"file": file_name, "status": "success"}, {"file": file_name}
+
+        monkeypatch.setattr(worker, "get_registry", lambda: object())
+        monkeypatch.setattr(worker, "_process_file", fake_process)
+        monkeypatch.setattr(worker, "SessionMemory", lambda: type("S", (), {"save_session": lambda *a: True})())
+        monkeypatch.setattr(worker, "DecisionLog", lambda: type("D", (), {"log_decision": lambda self, s, d: logged.append(d)})())
+
+        files = ["a.xlsx", "bad.xlsx", "c.xlsx"]
+        result = worker.process_batch(files, session_id="batch-test")
+
+        assert [f["file"] for f in result["files"]] == files
+        assert result["processed"] == 2
+        assert result["errors"] == 1
+        assert [d["file"] for d in logged] == files
+        assert threads and all(name.startswith("batch-file") for name in threads)
+
+    def test_parsed_files_passed_to_each_file(self, monkeypatch):
+        """업로드 시 파싱된 결과를 파일별 처리에 그대로 전달 (없으면 파일별 오류)"""
+        from internal.queue import worker
+
+        received = []
+        real_process = worker._process_file
+
+        def fake_process(registry, file_name, parsed):
+            received.append((file_name, parsed))
+            return {"file": file_name, "status": "success"}, {"file": file_name}
+
+        monkeypatch.setattr(worker, "get_registry", lambda: object())
+        monkeypatch.setattr(worker, "_process_file", fake_process)
+        monkeypatch.setattr(worker, "SessionMemory", lambda: type("S", (), {"save_session": lambda *a: True})())
+        monkeypatch.setattr(worker, "DecisionLog", lambda: type("D", (), {"log_decision": lambda self, s, d: None})())
+
+        parsed = [{"headers": ["사원번호"], "rows": [["1"]]}, {"headers": ["이름"], "rows": []}]
+        worker.process_batch(["a.xlsx", "b.xlsx"], session_id="batch-test", parsed_files=parsed)
+
+        assert received == [("a.xlsx", parsed[0]), ("b.xlsx", parsed[1])]
+        result, _ = real_process(object(), "c.xlsx", None)
+        assert result["status"] == "error"
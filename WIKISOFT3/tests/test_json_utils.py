@@ -0,0 +1,69 @@
+"""
+JSON 유틸리티 테스트
+"""
+import json
+from decimal import Decimal
+
+import pytest
+
+from internal.utils.json_utils import dumps, loads, read_json, read_json_many, parse_llm_json
+
+
+class TestJsonUtils:
+    """JSON 파싱 헬퍼 테스트"""
+
+    def test_loads_str_and_bytes(self):
+        """문자열/바이트 모두 파싱"""
+        assert loads('{"a": 1}') == {"a": 1}
+        assert loads('{"이름": "홍길동"}'.encode()) == {"이름": "홍길동"}
+
+    def test_dumps_unknown_type_as_str(self):
+        """JSON 기본 타입이 아닌 값은 문자열로 직렬화 (jsonable_encoder 없이 응답 가능)"""
+        assert loads(dumps({"금액": Decimal("1.5"), 1: "a"})) == {"금액": "1.5", "1": "a"}
+
+    def test_read_json(self, tmp_path):
+        """파일 읽기"""
+        path = tmp_path / "case.json"
+        path.write_text(json.dumps({"headers": ["사원번호"]}, ensure_ascii=False), encoding="utf-8")
+        assert read_json(path) == {"headers": ["사원번호"]}
+
+    def test_read_json_many(self, tmp_path):
+        """여러 파일 병렬 읽기 (순서 유지, 없는 파일은 None)"""
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"case_{i}.json"
+            path.write_text(json.dumps({"idx": i}), encoding="utf-8")
+            paths.append(path)
+        paths.insert(2, tmp_path / "missing.json")
+        
+        results = read_json_many(paths)
+        
+        assert results == [{"idx": 0}, {"idx": 1}, None, {"idx": 2}, {"idx": 3}, {"idx": 4}]
+
+    def test_read_json_many_reuses_pool(self, tmp_path):
+        """병렬 읽기 스레드 풀은 호출마다 새로 만들지 않고 재사용"""
+        from internal.utils import json_utils
+
+        paths = [tmp_path / "a.json", tmp_path / "b.json"]
+        for path in paths:
+            path.write_text("{}", encoding="utf-8")
+
+        read_json_many(paths)
+        pool = json_utils._get_read_pool()
+        read_json_many(paths)
+
+        assert json_utils._get_read_pool() is pool
+
+    def test_parse_llm_json_code_block(self):
+        """```json 코드 블록 응답"""
+        text = '```json\n{"issues": [], "summary": "이상 없음"}\n```'
+        assert parse_llm_json(text) == {"issues": [], "summary": "이상 없음"}
+
+    def test_parse_llm_json_plain(self):
+        """코드 블록 없는 응답"""
+        assert parse_llm_json('  {"questions": []}  ') == {"questions": []}
+
+    def test_parse_llm_json_invalid(self):
+        """JSON이 아니면 ValueError"""
+        with pytest.raises(ValueError):
+            parse_llm_json("JSON이 아닙니다")
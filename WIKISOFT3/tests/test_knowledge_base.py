@@ -0,0 +1,34 @@
+"""
+Knowledge Base 테스트
+"""
+import json
+
+import pytest
+
+from internal.ai import knowledge_base
+
+
+class TestFewShotExamples:
+    """학습 데이터 Few-shot 예시 선택 테스트"""
+
+    def test_latest_correct_examples_first(self, tmp_path, monkeypatch):
+        """올바른 예시 중 최신 limit개만 최신순으로 선택"""
+        monkeypatch.setattr(knowledge_base, "TRAINING_DATA_PATH", str(tmp_path))
+        for i, (timestamp, is_correct) in enumerate([
+            ("2024-01-01T00:00:00", True),
+            ("2024-03-01T00:00:00", False),
+            ("2024-02-01T00:00:00", True),
+            ("2024-01-15T00:00:00", True),
+        ]):
+            example = {"timestamp": timestamp, "is_correct": is_correct, "input": {"n": i}, "ai_response": {}}
+            (tmp_path / f"matching_{i}.json").write_text(json.dumps(example), encoding="utf-8")
+
+        result = knowledge_base.get_few_shot_examples("matching", limit=2)
+
+        assert '{"n": 2}' in result and '{"n": 3}' in result
+        assert result.index('{"n": 2}') < result.index('{"n": 3}')
+        assert '{"n": 1}' not in result and '{"n": 0}' not in result
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,44 @@
+"""
+로깅/메트릭 테스트
+"""
+import time
+
+import pytest
+
+from internal.utils.logging import MetricsCollector
+
+
+class TestMetricsCollector:
+    """메트릭 수집기 테스트"""
+
+    def test_summary(self):
+        """count/min/max/avg/last 요약"""
+        metrics = MetricsCollector()
+        for value in [3.0, 1.0, 2.0]:
+            metrics.record("parse_duration_ms", value)
+
+        assert metrics.get_summary("parse_duration_ms") == {
+            "count": 3, "min": 1.0, "max": 3.0, "avg": 2.0, "last": 2.0,
+        }
+        assert metrics.get_summary("unknown") == {"count": 0}
+
+    def test_record_timestamp_is_epoch_seconds(self):
+        """기록 시각은 epoch 초(float)"""
+        metrics = MetricsCollector()
+        before = time.time()
+        metrics.record("latency", 1.0)
+
+        assert before <= metrics._metrics["latency"][-1]["timestamp"] <= time.time()
+
+    def test_window_keeps_recent_values(self, monkeypatch):
+        """보관 개수를 넘으면 오래된 값이 빠지고 평균도 최근 값 기준"""
+        monkeypatch.setattr(MetricsCollector, "WINDOW_SIZE", 3)
+        metrics = MetricsCollector()
+        for value in [100.0, 1.0, 2.0, 3.0]:
+            metrics.record("latency", value)
+
+        summary = metrics.get_summary("latency")
+
+        assert summary["count"] == 3
+        assert summary["max"] == 3.0
+        assert summary["avg"] == pytest.approx(2.0)
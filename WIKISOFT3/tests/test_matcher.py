@@ -5,6 +5,7 @@ import pytest
 import sys
 sys.path.insert(0, "/Users/kj/Desktop/wiki/WIKISOFT3")
 
+from internal.ai import matcher as matcher_module
 from internal.ai.matcher import match_headers, _rule_match, _normalize
 
 
@@ -72,6 +73,54 @@ class TestRuleMatch:
         result = _rule_match(["사원번호"])
         assert result["matches"][0].get("fallback") == True
 
+    def test_cached_headers_not_recomputed(self, monkeypatch):
+        """이미 매칭한 헤더는 캐시에서 조회하고 새 헤더만 계산"""
+        matcher_module._rule_match_cache.clear()
+        computed = []
+        original = matcher_module._best_candidates
+
+        def counting_best(header_norms, sheet_type):
+            computed.extend(header_norms)
+            return original(header_norms, sheet_type)
+
+        monkeypatch.setattr(matcher_module, "_best_candidates", counting_best)
+
+        first = _rule_match(["사원번호", "성명", "사원번호"])
+        second = _rule_match(["성명", "사원번호", "입사일"])
+
+        assert computed == ["사원번호", "성명", "입사일"]
+        assert [m["target"] for m in second["matches"]][:2] == ["이름", "사원번호"]
+        assert first["matches"][0] == first["matches"][2]
+
+
+class TestAIMatchCache:
+    """AI 매칭 응답 캐시 테스트"""
+
+    def test_same_prompt_calls_openai_once(self, monkeypatch):
+        """같은 헤더(같은 프롬프트)는 OpenAI를 다시 호출하지 않음"""
+        from types import SimpleNamespace
+
+        matcher_module._ai_match_cache.clear()
+        calls = []
+        content = '{"mappings": [{"customer_header": "사번", "standard_field": "사원번호", "confidence": 0.9}], "unmapped": []}'
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(matcher_module, "get_openai_client", lambda api_key: client)
+        monkeypatch.setattr(matcher_module, "get_few_shot_examples", lambda headers, k=3: [])
+
+        first = matcher_module.ai_match_columns(["사번"], api_key="test-key")
+        first["matches"][0]["target"] = "변경됨"  # 호출자 수정이 캐시에 영향 없어야 함
+        second = matcher_module.ai_match_columns(["사번"], api_key="test-key")
+        matcher_module.ai_match_columns(["성명"], api_key="test-key")
+
+        assert len(calls) == 2
+        assert second["matches"][0]["target"] == "사원번호"
+        assert second["used_ai"] is True
+
 
 class TestMatchHeaders:
     """match_headers 함수 테스트"""
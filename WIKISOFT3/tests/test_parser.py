@@ -8,6 +8,7 @@ from openpyxl import Workbook
 import sys
 sys.path.insert(0, "/Users/kj/Desktop/wiki/WIKISOFT3")
 
+from internal.parsers import parser as parser_module
 from internal.parsers.parser import parse_roster
 
 
@@ -98,6 +99,76 @@ class TestParser:
         row_count = result.get("row_count", len(result.get("rows", [])))
         assert row_count >= 1
 
+    def test_parse_roster_file_object(self):
+        """파일 객체 입력 (UploadFile.file 등)"""
+        stream = io.BytesIO(create_test_excel())
+        stream.seek(10)  # 위치와 무관하게 처음부터 파싱
+        
+        result = parse_roster(stream)
+        
+        assert result["headers"] == parse_roster(create_test_excel())["headers"]
+        assert len(result["rows"]) == 3
+    
+    def test_parse_roster_csv_file_object(self):
+        """CSV 파일 객체 입력"""
+        stream = io.BytesIO("사원번호,이름\nEMP001,홍길동\n".encode("utf-8"))
+        
+        result = parse_roster(stream)
+        
+        assert result["headers"] == ["사원번호", "이름"]
+        assert result["rows"] == [["EMP001", "홍길동"]]
+        assert not stream.closed  # 업로드 임시 파일은 호출자가 닫음
+
+    def test_parse_roster_csv_cp949_file_object(self):
+        """UTF-8 디코딩이 중간에 실패하는 스트림도 처음부터 다시 감지 후 파싱"""
+        content = "사원번호,이름,부서\n" + "".join(f"EMP{i:03d},홍길동,인사팀\n" for i in range(50))
+        stream = io.BytesIO(content.encode("cp949"))
+
+        result = parse_roster(stream)
+
+        assert result["headers"] == ["사원번호", "이름", "부서"]
+        assert len(result["rows"]) == 50
+        assert not stream.closed
+
+    def test_parse_roster_csv_cp949(self):
+        """UTF-8이 아닌 CSV (cp949)는 인코딩 감지 후 파싱"""
+        content = "사원번호,이름,부서\n" + "".join(f"EMP{i:03d},홍길동,인사팀\n" for i in range(50))
+
+        result = parse_roster(content.encode("cp949"))
+
+        assert result["headers"] == ["사원번호", "이름", "부서"]
+        assert result["rows"][0] == ["EMP000", "홍길동", "인사팀"]
+        assert result["meta"]["encoding"].lower() != "utf-8"
+
+    def test_parse_roster_csv_utf8_bom(self):
+        """BOM이 있는 UTF-8 CSV는 BOM 제거"""
+        result = parse_roster("\ufeff사원번호,이름\nEMP001,홍길동\n".encode("utf-8"))
+
+        assert result["headers"] == ["사원번호", "이름"]
+
+    def test_parse_roster_cache_hit(self, monkeypatch):
+        """같은 내용은 재파싱하지 않고 캐시 사본 반환"""
+        parser_module.clear_parse_cache()
+        calls = []
+        original = parser_module._parse_xlsx
+        
+        def counting_parse(*args, **kwargs):
+            calls.append(1)
+            return original(*args, **kwargs)
+        
+        monkeypatch.setattr(parser_module, "_parse_xlsx", counting_parse)
+        
+        excel_bytes = create_test_excel()
+        first = parse_roster(excel_bytes)
+        first["rows"].clear()  # 호출자 수정이 캐시에 영향 없어야 함
+        second = parse_roster(io.BytesIO(excel_bytes))
+        
+        assert len(calls) == 1
+        assert len(second["rows"]) == 3
+        
+        parse_roster(excel_bytes, max_rows=1)  # 옵션이 다르면 별도 키
+        assert len(calls) == 2
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
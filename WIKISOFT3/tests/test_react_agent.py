@@ -40,7 +40,21 @@ class TestReactAgent:
         assert len(state.thoughts) == 0
         assert len(state.observations) == 0
         assert state.current_step == 0
+
+    def test_agent_state_current_step_follows_thoughts(self, agent):
+        """현재 단계와 반복 횟수는 마지막 사고의 step"""
+        result = agent.run(file_bytes="사원번호,이름\n001,홍길동".encode("utf-8"))
+
+        assert agent.state.current_step == agent.state.thoughts[-1].step
+        assert result["iterations"] == agent.state.current_step
     
+    def test_step_records_use_slots(self, agent):
+        """단계 기록(Thought/Observation)은 인스턴스 __dict__ 없음"""
+        agent.run(file_bytes="사원번호,이름\n001,홍길동".encode("utf-8"))
+
+        assert not hasattr(agent.state.thoughts[0], "__dict__")
+        assert not hasattr(agent.state.observations[0], "__dict__")
+
     def test_agent_run_with_valid_data(self, agent):
         """유효한 데이터로 에이전트 실행"""
         # 간단한 CSV 데이터
@@ -57,6 +71,19 @@ class TestReactAgent:
         assert "confidence" in result
         assert result["status"] in ["completed", "needs_human", "failed"]
     
+    def test_verbose_trace_is_structured(self, registry, capsys, caplog):
+        """verbose 추론 로그는 stdout이 아닌 구조화 로그로 기록"""
+        agent = create_react_agent(registry, verbose=True)
+        test_data = "사원번호,이름,입사일\n001,홍길동,2020-01-01".encode('utf-8')
+        
+        with caplog.at_level("INFO", logger="react_agent"):
+            agent.run(file_bytes=test_data, diagnostic_answers={}, sheet_type="재직자")
+        
+        assert capsys.readouterr().out == ""
+        first = next(r for r in caplog.records if r.getMessage() == "react_think")
+        assert first.structured["step"] == 1
+        assert first.structured["action"] == "parse_roster"
+    
     def test_agent_run_with_empty_data(self, agent):
         """빈 데이터로 에이전트 실행"""
         result = agent.run(
@@ -112,6 +139,31 @@ class TestReactAgent:
         assert agent.CONFIDENCE_AUTO_CORRECT == 0.80
         assert agent.CONFIDENCE_NEEDS_REVIEW == 0.50
 
+    def test_overall_confidence_from_observed_steps(self, agent):
+        """최종 신뢰도는 관찰 시 저장한 매칭/검증 신뢰도의 가중 평균과 일치"""
+        test_data = "사원번호,이름,생년월일,입사일,기준급여\n001,홍길동,19900101,20200101,3000000".encode("utf-8")
+
+        result = agent.run(file_bytes=test_data, diagnostic_answers={}, sheet_type="재직자")
+
+        steps = result["steps"]
+        expected = (
+            agent._calculate_match_confidence(steps["matches"]) * agent.MATCH_WEIGHT
+            + agent._calculate_validation_confidence(steps["validation"]) * agent.VALIDATION_WEIGHT
+        )
+        assert result["confidence"]["score"] == pytest.approx(expected)
+
+    @pytest.mark.parametrize("score, grade", [
+        (1.0, "A"), (0.95, "A"), (0.94, "B"), (0.80, "B"),
+        (0.79, "C"), (0.50, "C"), (0.49, "D"), (0.0, "D"),
+    ])
+    def test_confidence_grade_boundaries(self, agent, monkeypatch, score, grade):
+        """임계값과 같으면 상위 등급"""
+        monkeypatch.setattr(agent, "_calculate_overall_confidence", lambda context: score)
+
+        result = agent._build_final_result({})
+
+        assert result["confidence"]["grade"] == grade
+
 
 class TestRetryStrategies:
     """재시도 전략 테스트"""
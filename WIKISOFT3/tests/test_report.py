@@ -0,0 +1,33 @@
+"""
+Excel 리포트 생성 테스트
+"""
+import pytest
+from openpyxl import Workbook
+
+from internal.generators import report
+
+
+class TestDataSheet:
+    """원본 데이터 시트 하이라이팅 테스트"""
+
+    def test_severity_highlight_matches_anomaly_sheet(self):
+        """error/high는 오류색, warning/medium은 경고색 (이상 목록 시트와 동일 기준)"""
+        ws = Workbook().active
+        original = {"headers": ["사원번호", "나이"], "rows": [["1", 30], ["2", 40], ["3", 50], ["4", 60]]}
+        anomalies = [
+            {"field": "나이", "row": 0, "severity": "error"},
+            {"field": "나이", "row": 1, "severity": "high"},
+            {"field": "나이", "row": 2, "severity": "warning"},
+            {"field": "나이", "row": 3, "severity": "medium"},
+        ]
+
+        report._create_data_sheet(ws, original, {"anomalies": {"anomalies": anomalies}})
+
+        fills = [ws.cell(row=r, column=2).fill.fgColor.rgb for r in range(2, 6)]
+        error_rgb = report.STYLE_ERROR.fgColor.rgb
+        warning_rgb = report.STYLE_WARNING.fgColor.rgb
+        assert fills == [error_rgb, error_rgb, warning_rgb, warning_rgb]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
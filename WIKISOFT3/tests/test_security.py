@@ -0,0 +1,119 @@
+"""
+보안 유틸리티 테스트
+"""
+import asyncio
+import io
+import logging
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from internal.utils import security
+from internal.utils.hashing import content_hash
+from internal.utils.security import (
+    SecureLogger, _MaskingFilter, mask_dict_values, mask_sensitive_data, validate_upload_stream, validate_upload_stream_with_digest
+)
+
+
+class TestSecureLogger:
+    """마스킹 로거 테스트"""
+
+    def test_masks_formatted_args(self, caplog):
+        """%-포맷 인자로 전달된 개인정보도 마스킹"""
+        logger = SecureLogger("wikisoft.test")
+        with caplog.at_level(logging.INFO, logger="wikisoft.test"):
+            logger.info("연락처: %s", "010-1234-5678")
+
+        assert "010-1234-5678" not in caplog.text
+        assert mask_sensitive_data("010-1234-5678") in caplog.text
+
+    def test_disabled_level_skips_formatting(self, monkeypatch):
+        """비활성 레벨이면 포맷팅/마스킹 생략"""
+        logger = SecureLogger("wikisoft.test")
+        logger.logger.setLevel(logging.WARNING)
+        calls = []
+        monkeypatch.setattr("internal.utils.security.mask_sensitive_data", lambda text: calls.append(text) or text)
+
+        logger.info("파일 업로드: %s", "a.xlsx")
+
+        assert calls == []
+
+    def test_literal_percent_without_args(self, caplog):
+        """인자 없는 메시지의 리터럴 %는 포맷팅하지 않고 그대로 기록"""
+        logger = SecureLogger("wikisoft.test")
+        with caplog.at_level(logging.INFO, logger="wikisoft.test"):
+            logger.info("진행률 100% 완료")
+
+        assert "진행률 100% 완료" in caplog.text
+
+    def test_mismatched_args_left_to_handler(self):
+        """인자 불일치 레코드는 마스킹 필터에서 예외 없이 통과 (핸들러의 오류 처리에 맡김)"""
+        record = logging.LogRecord("wikisoft.test", logging.INFO, __file__, 0, "파일: %s, %s", ("a.xlsx",), None)
+
+        assert _MaskingFilter().filter(record) is True
+        assert record.args == ("a.xlsx",)
+
+
+class TestMaskDictValues:
+    """딕셔너리 필드 마스킹 테스트"""
+
+    def test_masks_fields_case_insensitively_in_nested_values(self):
+        """필드명 대소문자 무관, 중첩 dict/리스트까지 마스킹"""
+        data = {
+            "Phone": "010-1234-5678",
+            "부서": "인사팀",
+            "직원": [{"EMAIL": "hong@example.com", "사번": "E1"}],
+            "phone": ["010-1111-2222"],
+        }
+
+        result = mask_dict_values(data)
+
+        assert result["Phone"] == mask_sensitive_data("010-1234-5678")
+        assert result["부서"] == "인사팀"
+        assert result["직원"][0] == {"EMAIL": mask_sensitive_data("hong@example.com"), "사번": "E1"}
+        assert result["phone"] == [mask_sensitive_data("010-1111-2222")]
+
+    def test_custom_fields(self):
+        """지정한 필드만 마스킹"""
+        result = mask_dict_values({"Memo": "010-1234-5678", "name": "홍길동"}, {"memo"})
+
+        assert result == {"Memo": mask_sensitive_data("010-1234-5678"), "name": "홍길동"}
+
+
+class TestValidateUploadStream:
+    """업로드 스트림 검증 테스트"""
+
+    def test_uses_recorded_size(self, monkeypatch):
+        """UploadFile.size가 있으면 그 값으로 크기 확인 (전체를 다시 읽지 않음)"""
+        monkeypatch.setattr(security, "MAX_FILE_SIZE", 100)
+        upload = UploadFile(io.BytesIO(b"PK\x03\x04" + b"0" * 200), filename="a.xlsx", size=204)
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(validate_upload_stream(upload))
+
+        assert exc.value.status_code == 413
+        assert upload.file.tell() == 0  # 한도 초과는 읽기 전에 거부
+
+    def test_counts_size_without_recorded_size(self):
+        """크기 정보가 없으면 청크 단위로 세어서 반환"""
+        content = "사원번호,이름\nEMP001,홍길동\n".encode("utf-8")
+        upload = UploadFile(io.BytesIO(content), filename="a.csv")
+
+        source, filename, size = asyncio.run(validate_upload_stream(upload))
+
+        assert size == len(content)
+        assert filename == "a.csv"
+        assert source.read() == content
+
+    @pytest.mark.parametrize("recorded_size", [True, False])
+    def test_digest_matches_content_hash(self, recorded_size):
+        """검증하면서 계산한 해시는 hashing.content_hash와 같고, 파일은 처음으로 되감김"""
+        content = "사원번호,이름\nEMP001,홍길동\n".encode("utf-8")
+        size = len(content) if recorded_size else None
+        upload = UploadFile(io.BytesIO(content), filename="a.csv", size=size)
+
+        source, _, total, digest = asyncio.run(validate_upload_stream_with_digest(upload))
+
+        assert total == len(content)
+        assert digest == content_hash(content)
+        assert source.tell() == 0
@@ -61,6 +61,57 @@ class TestValidationLayer1:
         # 에러 또는 경고 발생
         assert len(result.get("errors", [])) > 0 or len(result.get("warnings", [])) > 0
 
+    def test_amount_checks(self):
+        """급여/금액: 형식 오류, 0 이하 급여, 음수 금액 구분"""
+        df = self.create_valid_df()
+        df["기준급여"] = [5000000, "abc", 0]
+        df["퇴직금"] = [-1, None, "1000"]
+        result = validate_layer1(df, {})
+
+        amount_errors = {
+            (e["row"], e["column"], e["error"])
+            for e in result["errors"]
+            if e["column"] in ("기준급여", "퇴직금")
+        }
+        assert amount_errors == {
+            (1, "기준급여", "기준급여 형식 오류"),
+            (2, "기준급여", "기준급여 음수 또는 0"),
+            (0, "퇴직금", "퇴직금 음수"),
+        }
+
+    def test_amount_values_accepted_by_float(self):
+        """float()로 변환되는 문자열('nan', '1_000', 전각 숫자)은 형식 오류가 아님"""
+        df = self.create_valid_df()
+        df["기준급여"] = ["nan", "1_000", "５０００"]
+        df["퇴직금"] = ["-1_000", "nan", "abc"]
+        result = validate_layer1(df, {})
+
+        amount_errors = {
+            (e["row"], e["column"], e["error"])
+            for e in result["errors"]
+            if e["column"] in ("기준급여", "퇴직금")
+        }
+        assert amount_errors == {
+            (0, "퇴직금", "퇴직금 음수"),
+            (2, "퇴직금", "퇴직금 형식 오류"),
+        }
+
+    def test_date_order_checks(self):
+        """입사 나이 18세 미만, 퇴직일 < 입사일 (해석 불가 날짜는 건너뜀)"""
+        df = self.create_valid_df()
+        df["입사일"] = ["20050101", "20180715", float("nan")]
+        df["퇴직일"] = ["20240101", "20170101", "20240101"]
+        result = validate_layer1(df, {})
+
+        date_errors = {
+            (e["row"], e["column"], e["error"])
+            for e in result["errors"]
+            if e["column"] in ("입사일", "퇴직일")
+        }
+        assert (0, "입사일", "입사 나이 18세 미만") in date_errors
+        assert (1, "퇴직일", "퇴직일 < 입사일") in date_errors
+        assert not any(row == 2 and error != "필수 값 누락" for row, _, error in date_errors)
+
 
 class TestValidationLayer2:
     """Layer 2 검증 테스트 (챗봇 답변 vs 계산값)"""